@@ -0,0 +1,116 @@
+"""
+    Benchmark + exactness check: process-pool map-reduce vs serial analytics
+
+    Writes a synthetic sales file, aggregates it serially
+    (AggregationEngine over parse_transactions(read_sales_data(...))) and with
+    aggregate_parallel, and checks that every analytics view is exactly
+    equal. Partitions are deliberately small in the check so many partials
+    are merged. Also checks that ExactSum merges fractional amounts to the
+    correctly rounded total (math.fsum) whatever the partitioning.
+
+    Exits with status 1 when a result differs.
+
+    Usage (from the repository root):
+        python -m benchmarks.bench_parallel_analytics [rows] [workers]
+"""
+
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+import utils.data_processor
+import utils.file_handler
+from benchmarks.bench_transaction_memory import make_lines
+from utils.parallel_analytics import aggregate_parallel
+from utils.summation import ExactSum
+
+ROWS = 1_000_000
+CHECK_CHUNK_LINES = 5_000
+
+VIEWS = [
+    ("calculate_total_revenue", ()),
+    ("region_wise_sales", ()),
+    ("top_selling_products", (5,)),
+    ("customer_analysis", ()),
+    ("daily_sales_trend", ()),
+    ("unique_customers_rollup", ("week",)),
+    ("sales_rollup", ("month",)),
+    ("find_peak_sales_day", ()),
+    ("low_performing_products", (10,)),
+]
+
+
+def write_sales_file(rows):
+    handle, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(handle, "w", encoding="utf-8") as f:
+        f.write("TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region\n")
+        for line in make_lines(rows):
+            f.write(line + "\n")
+        f.write("T9|2024-12-01|P101|Laptop|-1|100|C001|North\n")     # invalid row
+    return path
+
+
+def check_views(serial, parallel):
+    mismatches = []
+    for name, args in VIEWS:
+        func = getattr(utils.data_processor, name)
+        if func(serial, *args) != func(parallel, *args):
+            mismatches.append(name)
+    if (serial.valid_count, serial.invalid_count) != (parallel.valid_count, parallel.invalid_count):
+        mismatches.append("valid/invalid counts")
+    return mismatches
+
+
+def check_exact_sum(values=200_000, parts=37, seed=3):
+    rng = random.Random(seed)
+    amounts = [rng.randint(1, 10) * rng.uniform(10, 90000) for _ in range(values)]
+
+    merged = ExactSum()
+    step = len(amounts) // parts + 1
+    for start in range(0, len(amounts), step):
+        part = ExactSum()
+        for amount in amounts[start:start + step]:
+            part.add(amount)
+        merged.merge(part)
+    return merged.value() == math.fsum(amounts)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    path = write_sales_file(rows)
+
+    try:
+        start = time.perf_counter()
+        serial = utils.data_processor.AggregationEngine(
+            utils.file_handler.parse_transactions(utils.file_handler.read_sales_data(path))
+        )
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = aggregate_parallel(path, workers=workers)
+        parallel_time = time.perf_counter() - start
+
+        mismatches = check_views(serial, parallel)
+        mismatches += check_views(serial, aggregate_parallel(path, workers=workers,
+                                                             chunk_size=CHECK_CHUNK_LINES))
+        if not check_exact_sum():
+            mismatches.append("ExactSum fractional merge")
+    finally:
+        os.remove(path)
+
+    print(f"Rows: {rows:,}   Workers: {workers}")
+    print(f"{'serial':<12}{serial_time:>10.2f} s")
+    print(f"{'map-reduce':<12}{parallel_time:>10.2f} s   ({serial_time / parallel_time:.1f}x)")
+
+    if mismatches:
+        print("MISMATCH: " + ", ".join(mismatches))
+        sys.exit(1)
+    print("All views identical to the serial results")
+
+
+if __name__ == "__main__":
+    main()
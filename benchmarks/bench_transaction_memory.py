@@ -0,0 +1,63 @@
+"""
+    Memory benchmark: parse_transactions output representations
+
+    Compares the memory held by the parsed transactions for
+    - list of dicts             parse_transactions(lines)
+    - list of Transaction       parse_transactions(lines, compact=True)
+    - TransactionTable          parse_transactions(lines, columnar=True)
+
+    Usage (from the repository root):
+        python -m benchmarks.bench_transaction_memory [rows]
+"""
+
+import random
+import sys
+import tracemalloc
+
+import utils.file_handler
+
+ROWS = 1_000_000
+
+
+def make_lines(rows, seed=42):
+    # Synthetic lines shaped like data/sales_data.txt (low-cardinality categoricals)
+    rng = random.Random(seed)
+    products = [("P101", "Laptop"), ("P102", "Mouse"), ("P103", "Keyboard"),
+                ("P104", "Monitor"), ("P105", "Webcam"), ("P106", "Headphones")]
+    regions = ["North", "South", "East", "West"]
+    lines = []
+    for i in range(rows):
+        pid, name = rng.choice(products)
+        lines.append(
+            f"T{i:08d}|2024-12-{rng.randint(1, 31):02d}|{pid}|{name}|"
+            f"{rng.randint(1, 10)}|{rng.randint(100, 90000)}|"
+            f"C{rng.randint(1, 5000):05d}|{rng.choice(regions)}"
+        )
+    return lines
+
+
+def measure(lines, **kwargs):
+    tracemalloc.start()
+    result = utils.file_handler.parse_transactions(lines, **kwargs)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    lines = make_lines(rows)
+    scale = 1_000_000 / rows
+
+    print(f"Rows: {rows:,}")
+    print(f"{'Representation':<22}{'MB held':>10}{'MB / 1M rows':>15}")
+    for label, kwargs in [("list of dicts", {}),
+                          ("list of Transaction", {"compact": True}),
+                          ("TransactionTable", {"columnar": True})]:
+        held = measure(lines, **kwargs) / (1024 * 1024)
+        print(f"{label:<22}{held:>10.1f}{held * scale:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
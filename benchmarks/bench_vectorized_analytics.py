@@ -0,0 +1,107 @@
+"""
+    Benchmark + parity check: NumPy backend vs pure-Python analytics
+
+    Builds a synthetic TransactionTable directly from NumPy columns, checks
+    that VectorizedEngine returns exactly what AggregationEngine returns for
+    every analytics view, then times both.
+
+    Usage (from the repository root):
+        python -m benchmarks.bench_vectorized_analytics [rows ...]
+        (default: 1000000 10000000 50000000; the pure-Python timing is
+        skipped above PYTHON_MAX_ROWS)
+"""
+
+import sys
+import time
+from array import array
+
+import numpy as np
+
+import utils.data_processor
+import utils.vectorized
+from utils.transaction_table import TransactionTable, CategoryDictionary
+
+SIZES = [1_000_000, 10_000_000, 50_000_000]
+PYTHON_MAX_ROWS = 10_000_000
+PARITY_ROWS = 200_000
+
+VIEWS = [
+    ("region_wise_sales", ()),
+    ("top_selling_products", (5,)),
+    ("customer_analysis", ()),
+    ("daily_sales_trend", ()),
+    ("find_peak_sales_day", ()),
+    ("low_performing_products", (10,)),
+]
+
+
+def make_table(rows, seed=7):
+    rng = np.random.default_rng(seed)
+    table = TransactionTable()
+
+    dictionaries = {
+        'Date': [f"2024-12-{d:02d}" for d in range(1, 32)],
+        'ProductID': [f"P{101 + i}" for i in range(10)],
+        'ProductName': ["Laptop", "Mouse", "Keyboard", "Monitor", "Webcam",
+                        "Headphones", "USB Cable", "External Hard Drive",
+                        "Wireless Mouse", "Laptop Charger"],
+        'CustomerID': [f"C{i:05d}" for i in range(20000)] + ["X00000"],
+        'Region': ["North", "South", "East", "West"],
+    }
+    for field, values in dictionaries.items():
+        table.dictionaries[field] = CategoryDictionary(values)
+
+    product = rng.integers(0, 10, rows, dtype=np.uint32)
+    codes = {
+        'Date': rng.integers(0, 31, rows, dtype=np.uint32),
+        'ProductID': product,
+        'ProductName': product,
+        'CustomerID': rng.integers(0, 20001, rows, dtype=np.uint32),
+        'Region': rng.integers(0, 4, rows, dtype=np.uint32),
+    }
+    for field, column in codes.items():
+        table._codes[field] = array('I', column.tobytes())
+
+    # a few non-positive quantities / prices so validation has work to do
+    table.quantity = array('q', rng.integers(-1, 11, rows, dtype=np.int64).tobytes())
+    prices = np.round(rng.uniform(-50, 90000, rows), 2)
+    table.unit_price = array('d', prices.tobytes())
+    table.transaction_ids = [f"T{i}" for i in range(rows)]
+    return table
+
+
+def check_parity(rows):
+    table = make_table(rows)
+    python_engine = utils.data_processor.AggregationEngine(table)
+    numpy_engine = utils.vectorized.VectorizedEngine(table)
+    assert python_engine.total_revenue == numpy_engine.total_revenue
+    for view, args in VIEWS:
+        assert getattr(python_engine, view)(*args) == getattr(numpy_engine, view)(*args), view
+    print(f"Parity OK on {rows:,} rows ({len(VIEWS)} views + total revenue)")
+
+
+def timed(engine_class, table):
+    start = time.perf_counter()
+    engine = engine_class(table)
+    for view, args in VIEWS:
+        getattr(engine, view)(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    check_parity(min(PARITY_ROWS, min(sizes)))
+
+    print(f"{'Rows':>12}{'Python':>12}{'NumPy':>10}{'Speedup':>10}")
+    for rows in sizes:
+        table = make_table(rows)
+        numpy_time = timed(utils.vectorized.VectorizedEngine, table)
+        if rows <= PYTHON_MAX_ROWS:
+            python_time = timed(utils.data_processor.AggregationEngine, table)
+            print(f"{rows:>12,}{python_time:>11.2f}s{numpy_time:>9.2f}s{python_time / numpy_time:>9.1f}x")
+        else:
+            print(f"{rows:>12,}{'-':>12}{numpy_time:>9.2f}s{'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
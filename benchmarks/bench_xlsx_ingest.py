@@ -0,0 +1,133 @@
+"""
+    Benchmark: streaming .xlsx ingest vs the pipe-delimited text path
+
+    Writes the same synthetic rows as a text extract and as a workbook, then
+    times read + parse for both and reports the peak traced memory.
+
+    Usage (from the repository root):
+        python -m benchmarks.bench_xlsx_ingest [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+import utils.file_handler
+import utils.xlsx_reader
+from benchmarks.bench_transaction_memory import make_lines
+from utils.transaction_table import TRANSACTION_FIELDS
+
+ROWS = 200_000
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_workbook(filename, lines):
+    # Minimal workbook: text cells via shared strings, Quantity/UnitPrice numeric
+    strings = {}
+
+    def shared(text):
+        return strings.setdefault(text, len(strings))
+
+    with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            rows = [TRANSACTION_FIELDS] + [line.split("|") for line in lines]
+            for r, fields in enumerate(rows, 1):
+                cells = []
+                for c, value in enumerate(fields):
+                    ref = f"{chr(65 + c)}{r}"
+                    if r > 1 and c in (4, 5):
+                        cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+                    else:
+                        cells.append(f'<c r="{ref}" t="s"><v>{shared(value)}</v></c>')
+                sheet.write(f'<row r="{r}">{"".join(cells)}</row>'.encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            + "".join(f"<si><t>{escape(text)}</t></si>" for text in strings)
+            + "</sst>"
+        )
+
+
+def _consume(chunks):
+    rows = 0
+    for chunk in chunks:
+        rows += len(utils.file_handler.parse_transactions(chunk))
+    return rows
+
+
+def run(label, reader, filename):
+    # timed pass without tracing, then a traced pass for peak memory
+    start = time.perf_counter()
+    rows = _consume(reader(filename))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    _consume(reader(filename))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10}{rows:>10,}{elapsed:>10.2f}s{peak / (1024 * 1024):>12.1f} MB")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    lines = make_lines(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_file = os.path.join(tmp, "sales.txt")
+        xlsx_file = os.path.join(tmp, "sales.xlsx")
+        with open(text_file, "w", encoding="utf-8") as f:
+            f.write("|".join(TRANSACTION_FIELDS) + "\n")
+            f.write("\n".join(lines) + "\n")
+        write_workbook(xlsx_file, lines)
+        del lines
+
+        print(f"{'Source':<10}{'Rows':>10}{'Time':>11}{'Peak mem':>15}")
+        run("text", utils.file_handler.iter_sales_data, text_file)
+        run("xlsx", utils.xlsx_reader.iter_xlsx_sales_data, xlsx_file)
+
+
+if __name__ == "__main__":
+    main()
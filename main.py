@@ -2,10 +2,16 @@ import pandas as pd
 from datetime import datetime
 import utils.file_handler
 import utils.api_handler
+import utils.catalog_cache
 import utils.data_processor
+import utils.filter_index
 
 log_file = open('output/application.log', "a")
 
+# look up only the products referenced by the transactions instead of
+# loading the whole catalog
+LAZY_PRODUCT_LOOKUP = True
+
 def main():
     """
     Main execution function
@@ -25,18 +31,24 @@ def main():
         # 2. Parse and clean
         print("[2/10] Parsing and cleaning data...")
         #transactions = parse_and_clean_transactions(raw_data)
-        trxs = utils.file_handler.parse_transactions(raw_data)
-        #print(trxs)
-        validTs = utils.data_processor.filterValidTransactions (trxs)
-        print(f"✓ Parsed {len(validTs)} records\n")
+        # single pass parse + validate, bad rows go to output/quarantine.txt
+        validTs, rejection_summary = utils.file_handler.parse_and_validate(raw_data)
+        print(f"✓ Parsed {len(validTs)} records")
+        if rejection_summary["rejected"]:
+            print(f"  Rejected {rejection_summary['rejected']} records (see output/quarantine.txt):")
+            for reason, count in rejection_summary["by_reason"].items():
+                print(f"    {reason}: {count}")
+        print()
 
         # 3. Display filter options
-        regions = sorted({t["Region"] for t in validTs})
-        amounts = [t["Quantity"] * t["UnitPrice"] for t in validTs]
+        # region hash index + sorted amounts, built once for all filters
+        filter_index = utils.filter_index.FilterIndex(validTs)
+        regions = filter_index.regions()
+        min_amount, max_amount = filter_index.amount_range()
 
         print("[3/10] Filter Options Available:")
         print(f"Regions: {', '.join(regions)}")
-        print(f"Amount Range: ₹{min(amounts):,.0f} - ₹{max(amounts):,.0f}\n")
+        print(f"Amount Range: ₹{min_amount:,.0f} - ₹{max_amount:,.0f}\n")
 
         choice = input("Do you want to filter data? (y/n): ").strip().lower()
 
@@ -46,20 +58,11 @@ def main():
             min_amt = input("Enter minimum amount (or press Enter): ").strip()
             max_amt = input("Enter maximum amount (or press Enter): ").strip()
 
-            filtered = []
-            for t in validTs:
-                amount = t["Quantity"] * t["UnitPrice"]
-
-                if region_filter and t["Region"] != region_filter:
-                    continue
-                if min_amt and amount < float(min_amt):
-                    continue
-                if max_amt and amount > float(max_amt):
-                    continue
-
-                filtered.append(t)
-
-            validTs = filtered
+            validTs = filter_index.select(
+                region=region_filter or None,
+                min_amount=float(min_amt) if min_amt else None,
+                max_amount=float(max_amt) if max_amt else None
+            )
             print(f"\n✓ Filtered down to {len(validTs)} transactions\n")
         else:
             print()
@@ -75,22 +78,32 @@ def main():
 
         # 7. Fetch API products
         print("[6/10] Fetching product data from API...")
-        api_products = utils.api_handler.fetch_all_products(limit=200)
-        print(f"✓ Fetched {len(api_products)} products\n")
+        if LAZY_PRODUCT_LOOKUP:
+            product_cache = utils.catalog_cache.ProductCache()
+            product_mapping = utils.api_handler.create_product_mapping_lazy(validTs, cache=product_cache)
+            print(f"✓ Resolved {len(product_mapping)} products\n")
+        else:
+            # on-disk catalog cache: no refetch within its TTL, stale copy if offline
+            catalog_cache = utils.catalog_cache.CatalogCache()
+            api_products = utils.api_handler.fetch_all_products(cache=catalog_cache)
+            print(f"✓ Fetched {len(api_products)} products\n")
+            product_mapping = utils.api_handler.create_product_mapping(api_products)
 
         # 8. Enrich sales data
         print("[7/10] Enriching sales data...")
-        product_mapping = utils.api_handler.create_product_mapping(api_products)
-        enriched_transactions = utils.api_handler.enrich_sales_data(validTs, product_mapping)
+        # enriched rows are streamed to data/enriched_sales_data.txt and
+        # summarised for the report on the way, never held in memory
+        enrichment = utils.api_handler.EnrichmentSummary()
+        utils.api_handler.write_enriched_stream(validTs, product_mapping, report=enrichment)
 
-        enriched_count = sum(1 for t in enriched_transactions if t.get("API_Match"))
+        enriched_count = enrichment.matched
         success_rate = (enriched_count / len(validTs) * 100) if validTs else 0
 
         print(f"✓ Enriched {enriched_count}/{len(validTs)} transactions ({success_rate:.1f}%)\n")
 
         # 9. Generate report
         print("[9/10] Generating report...")
-        utils.api_handler.generate_sales_report(validTs, enriched_transactions)
+        utils.api_handler.generate_sales_report(validTs, enrichment)
         print("✓ Report saved to: output/sales_report.txt\n")
 
         # 10. Completion
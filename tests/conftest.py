@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"
+
+PRODUCTS = [("P101", "Laptop"), ("P102", "Mouse"), ("P103", "Keyboard"),
+            ("P104", "Monitor"), ("P105", "Webcam"), ("P106", "Headphones")]
+REGIONS = ["North", "South", "East", "West"]
+
+
+def make_sales_lines(rows, seed=11, fractional=True):
+    # Raw lines shaped like data/sales_data.txt (header first); fractional
+    # prices make the revenue sums sensitive to summation order. A few rows
+    # fail validation.
+    rng = random.Random(seed)
+    lines = [HEADER]
+    for i in range(rows):
+        pid, name = rng.choice(PRODUCTS)
+        price = round(rng.uniform(1, 90000), 2) if fractional else rng.randint(100, 90000)
+        quantity = rng.randint(1, 10) if i % 97 else 0
+        lines.append(
+            f"T{i:06d}|2024-{rng.randint(11, 12)}-{rng.randint(1, 28):02d}|{pid}|{name}|"
+            f"{quantity}|{price}|C{rng.randint(1, 500):04d}|{rng.choice(REGIONS)}"
+        )
+    return lines
+
+
+@pytest.fixture
+def sales_file(tmp_path):
+    # Factory: writes synthetic sales lines to a file and returns its path
+    def write(rows=20000, **kwargs):
+        path = tmp_path / "sales_data.txt"
+        path.write_text("\n".join(make_sales_lines(rows, **kwargs)) + "\n", encoding="utf-8")
+        return str(path)
+    return write
@@ -0,0 +1,102 @@
+import pytest
+
+import utils.data_processor
+import utils.file_handler
+from utils.aggregate_store import AggregateStore
+
+from conftest import make_sales_lines
+
+VIEWS = ["calculate_total_revenue", "region_wise_sales", "top_selling_products",
+         "customer_analysis", "daily_sales_trend", "find_peak_sales_day",
+         "low_performing_products"]
+
+
+def assert_same_views(store, engine):
+    for name in VIEWS:
+        func = getattr(utils.data_processor, name)
+        assert func(store) == func(engine), name
+
+
+def test_saved_and_updated_store_equals_a_full_pass(tmp_path):
+    rows = utils.file_handler.parse_transactions(make_sales_lines(3000))
+    snapshot = str(tmp_path / "aggregates.json")
+
+    AggregateStore(rows[:2000]).save(snapshot)
+    store = AggregateStore.load(snapshot)
+    # the first rows are corrected: retracted and added again
+    store.update(rows[2000:] + rows[:10], retractions=rows[:10])
+
+    assert_same_views(store, utils.data_processor.AggregationEngine(rows))
+
+
+def test_ingest_offsets_are_saved_with_the_aggregates(tmp_path):
+    lines = make_sales_lines(1000)
+    source = tmp_path / "sales_data.txt"
+    snapshot = str(tmp_path / "aggregates.json")
+
+    source.write_text("\n".join(lines[:601]) + "\n", encoding="utf-8")
+    store = AggregateStore()
+    store.update_from_file(str(source))
+    store.save(snapshot)
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines[601:]) + "\n")
+
+    # updated but never saved (crash): the snapshot still reads the new rows
+    AggregateStore.load(snapshot).update_from_file(str(source))
+    store = AggregateStore.load(snapshot)
+    store.update_from_file(str(source))
+    assert store.update_from_file(str(source)) == 0
+
+    full = utils.data_processor.AggregationEngine(utils.file_handler.parse_transactions(lines))
+    assert_same_views(store, full)
+
+
+def test_a_new_file_does_not_reset_the_store(tmp_path):
+    lines = make_sales_lines(1000)
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text("\n".join(lines[:501]) + "\n", encoding="utf-8")
+    second.write_text("\n".join(lines[:1] + lines[501:]) + "\n", encoding="utf-8")
+
+    store = AggregateStore()
+    store.update_from_file(str(first))
+    store.update_from_file(str(second))
+
+    full = utils.data_processor.AggregationEngine(utils.file_handler.parse_transactions(lines))
+    assert_same_views(store, full)
+
+
+def test_retracting_an_unknown_row_is_rejected():
+    rows = utils.file_handler.parse_transactions(make_sales_lines(200))
+    store = AggregateStore(rows[:100])
+    before = store.to_state()
+
+    with pytest.raises(ValueError):
+        store.update(retractions=[rows[0], rows[150]])
+    with pytest.raises(ValueError):
+        store.retract(dict(rows[1], Quantity=rows[1]["Quantity"] + 1000))
+
+    assert store.to_state() == before
+
+
+def test_snapshots_of_other_versions_are_rejected(tmp_path):
+    state = AggregateStore(utils.file_handler.parse_transactions(make_sales_lines(10))).to_state()
+    state["version"] = 1
+    with pytest.raises(ValueError):
+        AggregateStore.from_state(state)
+
+
+def test_merged_stores_can_retract_rows_of_either_part():
+    rows = utils.file_handler.parse_transactions(make_sales_lines(3000)[1:])
+    store = AggregateStore(rows[:1500]).merge(AggregateStore(rows[1500:]))
+    # rows from both parts, including customers only the second part had
+    store.update(retractions=rows[1400:1600])
+    AggregateStore.from_state(store.to_state())
+
+    assert_same_views(store, utils.data_processor.AggregationEngine(rows[:1400] + rows[1600:]))
+
+
+def test_stores_do_not_merge_plain_engines():
+    rows = utils.file_handler.parse_transactions(make_sales_lines(100)[1:])
+    with pytest.raises(TypeError):
+        AggregateStore(rows).merge(utils.data_processor.AggregationEngine(rows))
@@ -0,0 +1,22 @@
+import utils.file_handler
+from utils.api_handler import enrich_sales_data
+from utils.transaction_table import ENRICHMENT_FIELDS, EnrichedTransaction
+
+from conftest import make_sales_lines
+
+
+MAPPING = {101: {"category": "laptops", "brand": "Apple", "rating": 4.7}}
+
+
+def test_enrich_sales_data_returns_views_or_copies(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transactions = utils.file_handler.parse_transactions(make_sales_lines(50)[1:])
+    views = enrich_sales_data(transactions, MAPPING)
+    copies = enrich_sales_data(transactions, MAPPING, copy=True)
+
+    assert all(isinstance(row, EnrichedTransaction) for row in views)
+    assert all(type(row) is dict for row in copies)
+    assert copies == [dict(view.items()) for view in views]
+    assert list(copies[0])[-len(ENRICHMENT_FIELDS):] == list(ENRICHMENT_FIELDS)
+    copies[0]["API_Match"] = False      # the caller owns the copies
+    assert "API_Match" not in transactions[0]
@@ -0,0 +1,155 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import utils.catalog_cache
+import utils.catalog_client
+
+
+CATALOG_SIZE = 250
+PRODUCTS = [
+    {"id": i, "title": f"Product {i}", "category": "misc", "brand": "Acme",
+     "price": i * 1.5, "rating": 4.0, "description": "not requested"}
+    for i in range(1, CATALOG_SIZE + 1)
+]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /products pages with ETags and /products/<id> lookups"""
+
+    max_limit = None    # set to cap `limit` the way some servers do
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, payload, headers=()):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.startswith("/products/"):
+            product_id = int(url.path.rsplit("/", 1)[1])
+            if not 1 <= product_id <= CATALOG_SIZE:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_json(PRODUCTS[product_id - 1])
+            return
+
+        skip = int(query.get("skip", ["0"])[0])
+        limit = int(query.get("limit", ["30"])[0])
+        if self.max_limit is not None:
+            limit = min(limit, self.max_limit)
+        etag = f'"page-{skip}-{limit}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_json(
+            {"products": PRODUCTS[skip:skip + limit], "total": CATALOG_SIZE,
+             "skip": skip, "limit": limit},
+            headers=[("ETag", etag)]
+        )
+
+
+def start_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+@pytest.fixture
+def stub_url():
+    server, url = start_server(StubHandler)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def capped_url():
+    class CappedHandler(StubHandler):
+        max_limit = 30
+
+    server, url = start_server(CappedHandler)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def test_catalog_is_complete_and_in_order(stub_url):
+    products = utils.catalog_client.fetch_catalog(base_url=stub_url, page_size=100)
+    assert [product["id"] for product in products] == list(range(1, CATALOG_SIZE + 1))
+    assert set(products[0]) == set(utils.catalog_client.PRODUCT_FIELDS)
+
+
+def test_catalog_steps_by_the_limit_the_server_serves(capped_url):
+    products = utils.catalog_client.fetch_catalog(base_url=capped_url, page_size=100)
+    assert [product["id"] for product in products] == list(range(1, CATALOG_SIZE + 1))
+
+
+def test_catalog_cache_revalidates_unchanged_pages(tmp_path, stub_url):
+    cache = utils.catalog_cache.CatalogCache(path=str(tmp_path / "catalog.json"), ttl=0)
+    first = cache.get_products(base_url=stub_url, page_size=100)
+    second = cache.get_products(base_url=stub_url, page_size=100)
+
+    stats = cache.stats()
+    assert second == first
+    assert stats["misses"] == 1
+    assert stats["revalidations"] == 1
+    assert stats["last_source"] == utils.catalog_cache.SOURCE_REVALIDATED
+    assert stats["pages_not_modified"] == 3
+
+
+def test_product_cache_remembers_unknown_ids(tmp_path, stub_url):
+    cache = utils.catalog_cache.ProductCache(path=str(tmp_path / "products.json"))
+    first = cache.lookup([5, 101, 999], base_url=stub_url)
+    assert sorted(first) == [5, 101]
+    assert cache.stats()["fetched"] == 3
+
+    second = cache.lookup([5, 101, 999], base_url=stub_url)
+    stats = cache.stats()
+    assert second == first
+    assert stats["hits"] == 2
+    assert stats["negative_hits"] == 1
+    assert stats["fetched"] == 3
+
+
+def test_product_cache_entries_are_per_api_and_fields(tmp_path, stub_url, capped_url):
+    cache = utils.catalog_cache.ProductCache(path=str(tmp_path / "products.json"))
+    cache.lookup([5, 999], base_url=stub_url)
+
+    titles = cache.lookup([5], base_url=stub_url, fields=["id", "title"])
+    assert titles == {5: {"id": 5, "title": "Product 5"}}
+    other_api = cache.lookup([5, 999], base_url=capped_url)
+    assert sorted(other_api) == [5]
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["negative_hits"] == 0
+
+
+def test_product_cache_drops_expired_negative_entries(tmp_path, stub_url):
+    path = tmp_path / "products.json"
+    cache = utils.catalog_cache.ProductCache(path=str(path), negative_ttl=0.05)
+    cache.lookup([998, 999], base_url=stub_url)
+    assert len(cache.load()["missing"]) == 2
+
+    time.sleep(0.1)
+    cache.lookup([5], base_url=stub_url)
+    assert cache.load()["missing"] == {}
@@ -0,0 +1,48 @@
+import pytest
+
+import utils.data_processor
+import utils.file_handler
+from utils.cube import ALL_CUBOIDS, VIEW_CUBOIDS, SalesCube
+
+from conftest import make_sales_lines
+
+VIEWS = [
+    ("region_wise_sales", ()),
+    ("top_selling_products", (5,)),
+    ("customer_analysis", ()),
+    ("daily_sales_trend", ()),
+    ("unique_customers_rollup", ("month",)),
+    ("sales_rollup", ("week",)),
+    ("find_peak_sales_day", ()),
+    ("low_performing_products", (10,)),
+]
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return utils.file_handler.parse_transactions(make_sales_lines(3000))
+
+
+def test_default_cube_builds_only_the_view_cuboids(rows):
+    cube = SalesCube(rows)
+    assert len(cube.cuboids) == len(VIEW_CUBOIDS)
+
+    engine = utils.data_processor.AggregationEngine(rows)
+    assert cube.total_revenue == engine.total_revenue
+    for view, args in VIEWS:
+        assert getattr(cube, view)(*args) == getattr(engine, view)(*args), view
+
+
+def test_queries_roll_up_the_smallest_covering_cuboid(rows):
+    full = SalesCube(rows, cuboids=ALL_CUBOIDS)
+    by = ("Region", "Month", "ProductName")
+    expected = full.rollup(by, where={"Region": "North"})
+
+    assert utils.data_processor.group_by(rows, by, {"Region": "North"}, subtotals=True) == expected
+    drill_down = SalesCube(rows, cuboids=[("Region", "Date", "ProductName")])
+    assert drill_down.rollup(by, where={"Region": "North"}) == expected
+
+
+def test_missing_cuboids_are_reported(rows):
+    with pytest.raises(ValueError):
+        SalesCube(rows).query(("Region", "ProductName"))
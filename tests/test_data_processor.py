@@ -0,0 +1,55 @@
+import pytest
+
+import utils.data_processor
+import utils.file_handler
+from utils.api_handler import generate_sales_report
+from utils.data_processor import AggregationEngine, DISTINCT_HLL
+
+from conftest import make_sales_lines
+
+
+@pytest.fixture
+def transactions():
+    return utils.file_handler.parse_transactions(make_sales_lines(2000)[1:])
+
+
+def test_distinct_follows_the_engine_passed_in(transactions):
+    engine = AggregationEngine(transactions, DISTINCT_HLL, precision=10)
+    assert (utils.data_processor.daily_sales_trend(engine)
+            == utils.data_processor.daily_sales_trend(transactions, DISTINCT_HLL, 10))
+
+
+@pytest.mark.parametrize("distinct, precision", [("exact", None), ("hll", 14), (None, 14)])
+def test_conflicting_distinct_settings_raise(transactions, distinct, precision):
+    engine = AggregationEngine(transactions, DISTINCT_HLL, precision=10)
+    with pytest.raises(ValueError):
+        utils.data_processor.daily_sales_trend(engine, distinct, precision)
+
+
+def test_exact_engines_reject_hll(transactions):
+    with pytest.raises(ValueError):
+        utils.data_processor.unique_customers_rollup(AggregationEngine(transactions), distinct="hll")
+
+
+@pytest.mark.parametrize("options", [{"distinct_customers": "approx"},
+                                     {"distinct_customers": "hll", "precision": 20},
+                                     {"distinct_customers": "hll", "precision": 3},
+                                     {"distinct_customers": "hll", "precision": "12"}])
+def test_report_rejects_bad_distinct_options(tmp_path, transactions, options):
+    with pytest.raises(ValueError, match="between 4 and 16|'exact' or 'hll'"):
+        generate_sales_report(transactions, transactions, str(tmp_path / "report.txt"), **options)
+    assert not (tmp_path / "report.txt").exists()
+
+
+def test_engines_reject_a_bad_precision_up_front():
+    with pytest.raises(ValueError, match="between 4 and 16"):
+        AggregationEngine((), DISTINCT_HLL, precision=17)
+
+
+def test_report_uses_the_requested_precision(tmp_path, transactions):
+    for precision in (4, 16):
+        generate_sales_report(transactions, transactions, str(tmp_path / f"report_{precision}.txt"),
+                              distinct_customers="hll", precision=precision)
+    low = (tmp_path / "report_4.txt").read_text(encoding="utf-8")
+    high = (tmp_path / "report_16.txt").read_text(encoding="utf-8")
+    assert low != high
@@ -0,0 +1,180 @@
+import gzip
+import os
+import threading
+
+import utils.data_processor
+import utils.file_handler
+
+from conftest import make_sales_lines
+
+
+def write_files(tmp_path, count, rows):
+    lines = make_sales_lines(rows)
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"sales_{i}.txt"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        paths.append(str(path))
+    return paths, lines[1:]
+
+
+def test_many_files_are_read_in_order(tmp_path):
+    paths, lines = write_files(tmp_path, 3, 500)
+    assert utils.file_handler.read_sales_data(paths) == lines * 3
+
+
+def test_stopping_early_does_not_hang_the_readers(tmp_path):
+    # every file fits in exactly prefetch_chunks chunks, so each reader
+    # has a full queue when it wants to put its end marker
+    paths, _ = write_files(tmp_path, 4, 40)
+    done = threading.Event()
+
+    def consume():
+        chunks = utils.file_handler.iter_sales_data_many(paths, workers=4, chunk_size=10,
+                                                         prefetch_chunks=4)
+        next(chunks)
+        chunks.close()
+        done.set()
+
+    threading.Thread(target=consume, daemon=True).start()
+    assert done.wait(10)
+
+
+def test_a_directory_source_only_reads_sales_files(tmp_path):
+    lines = make_sales_lines(20)
+    (tmp_path / "a_sales.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with gzip.open(tmp_path / "b_sales.txt.gz", "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    (tmp_path / "enriched_sales_data.txt").write_text(
+        lines[0] + "|API_Category|API_Brand|API_Rating|API_Match\n", encoding="utf-8"
+    )
+    (tmp_path / "data.xlsx").write_bytes(b"PK\x03\x04")
+    (tmp_path / "notes.txt").write_text("not sales data\n", encoding="utf-8")
+
+    assert utils.file_handler.expand_sales_sources(str(tmp_path)) == [
+        str(tmp_path / "a_sales.txt"), str(tmp_path / "b_sales.txt.gz")
+    ]
+
+
+def test_incremental_reads_detect_a_replaced_file(tmp_path):
+    lines = make_sales_lines(20000)
+    path = tmp_path / "sales.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _, _, state = utils.file_handler.read_appended_records(str(path))
+
+    # same length, changed only far from both ends of the processed prefix,
+    # written as a new file over the old one
+    data = path.read_bytes()
+    middle = data.index(b"\n", len(data) // 2) + 1
+    changed = data[:middle] + data[middle:middle + 1].swapcase() + data[middle + 1:]
+    replacement = tmp_path / "sales.txt.new"
+    replacement.write_bytes(changed + b"T99999|2024-12-31|P1|Widget|1|2.5|C1|North\n")
+    os.replace(replacement, path)
+
+    new_lines, full_reload, _ = utils.file_handler.read_appended_records(str(path), state)
+    assert full_reload
+    assert len(new_lines) == len(lines)
+
+
+def test_incremental_reads_detect_an_edit_of_the_last_records(tmp_path):
+    lines = make_sales_lines(2000)
+    path = tmp_path / "sales.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _, _, state = utils.file_handler.read_appended_records(str(path))
+
+    with open(path, "r+b") as f:    # in place: same inode
+        f.seek(-10, os.SEEK_END)
+        f.write(b"X")
+    _, full_reload, _ = utils.file_handler.read_appended_records(str(path), state)
+    assert full_reload
+
+
+def test_incremental_reads_resume_after_appends(tmp_path):
+    lines = make_sales_lines(100)
+    path = tmp_path / "sales.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    first, full_reload, state = utils.file_handler.read_appended_records(str(path))
+    assert full_reload and first == lines[1:]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("T99999|2024-12-31|P1|Widget|1|2.5|C1|North\nT100000|2024")
+    new_lines, full_reload, state = utils.file_handler.read_appended_records(str(path), state)
+    assert not full_reload
+    assert new_lines == ["T99999|2024-12-31|P1|Widget|1|2.5|C1|North"]
+
+
+def write_messy_sales_file(path, rows):
+    # synthetic rows plus the irregular records the parser has to clean
+    lines = make_sales_lines(rows)
+    for i in range(3, len(lines), 50):
+        lines.insert(i, "")
+    lines[10] = "T9|2024-12-01|P101|Laptop, Pro|2|1,250.50|C0001|North"
+    lines[20] = "T8|2024-12-01|P101|Câble|1|2.5|C0001|South"
+    lines[30] = "T7|2024-12-01|P101|Laptop|x|2.5|C0001|North"
+    lines[40] = "T6|2024-12-01|P101"
+    path.write_text("\n".join(lines), encoding="utf-8")     # no final newline
+    return str(path)
+
+
+def serial_parse(filename):
+    return utils.data_processor.filterValidTransactions(
+        utils.file_handler.parse_transactions(utils.file_handler.read_sales_data(filename))
+    )
+
+
+def test_shard_ranges_cover_the_records_on_line_boundaries(tmp_path):
+    filename = write_messy_sales_file(tmp_path / "sales.txt", 300)
+    data = open(filename, "rb").read()
+    header_end = data.index(b"\n") + 1
+
+    for shards in range(1, 40):
+        ranges = utils.file_handler._shard_ranges(data, len(data), shards)
+        assert ranges[0][0] == header_end and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start and data[start - 1:start] == b"\n"
+
+
+def test_sharded_parse_matches_the_serial_parse(tmp_path):
+    filename = write_messy_sales_file(tmp_path / "sales.txt", 3000)
+    expected = serial_parse(filename)
+    assert {"T9", "T8"} <= {txn["TransactionID"] for txn in expected}
+
+    # shard targets fall mid-line; every shard has to snap to a record
+    for min_shard_bytes in (1000, 7919, 10 ** 9):
+        assert utils.file_handler.parse_sales_file_parallel(
+            filename, workers=4, min_shard_bytes=min_shard_bytes
+        ) == expected
+
+
+REJECTED = {
+    "T1|2024-12-01|P101|Laptop|2": "FIELD_COUNT",
+    "T2|2024-12-01|P101|Laptop|two|45000|C0001|North": "BAD_QUANTITY",
+    "T3|2024-12-01|P101|Laptop|2|n/a|C0001|North": "BAD_UNIT_PRICE",
+    "T4|2024-12-01|P101|Laptop|2|45000| |North": "EMPTY_FIELD",
+    "T5|2024-12-01|P101|Laptop|0|45000|C0001|North": "QUANTITY_NOT_POSITIVE",
+    "T6|2024-12-01|P101|Laptop|2|-1|C0001|North": "UNIT_PRICE_NOT_POSITIVE",
+    "X7|2024-12-01|P101|Laptop|2|45000|C0001|North": "TRANSACTION_ID_PREFIX",
+    "T8|2024-12-01|Q101|Laptop|2|45000|C0001|North": "PRODUCT_ID_PREFIX",
+    "T9|2024-12-01|P101|Laptop|2|45000|D0001|North": "CUSTOMER_ID_PREFIX",
+}
+
+
+def test_quarantine_lists_every_rejected_line_with_its_reason(tmp_path):
+    good = [line for line in make_sales_lines(200)[1:] if "|0|" not in line]
+    lines = good[:100] + list(REJECTED) + good[100:]
+    quarantine = tmp_path / "quarantine.txt"
+
+    valid, summary = utils.file_handler.parse_and_validate(lines, str(quarantine))
+
+    assert valid == utils.data_processor.filterValidTransactions(
+        utils.file_handler.parse_transactions(good)
+    )
+    assert quarantine.read_text(encoding="utf-8").splitlines() == [
+        f"{reason}|{line}" for line, reason in REJECTED.items()
+    ]
+    assert summary == {
+        "total_input": len(lines),
+        "valid": len(good),
+        "rejected": len(REJECTED),
+        "by_reason": {reason: 1 for reason in REJECTED.values()},
+    }
@@ -0,0 +1,71 @@
+import pytest
+
+import utils.file_handler
+from utils.filter_index import FilterIndex
+
+from conftest import make_sales_lines
+
+REQUIRED = {"TransactionID", "Date", "ProductID", "ProductName", "Quantity", "UnitPrice",
+            "CustomerID", "Region"}
+
+
+def scan_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+    # the list-scanning validate_and_filter that FilterIndex replaced
+    valid, invalid = [], 0
+    for txn in transactions:
+        try:
+            if not REQUIRED.issubset(txn.keys()) or (
+                not txn["TransactionID"].startswith("T")
+                or not txn["ProductID"].startswith("P")
+                or not txn["CustomerID"].startswith("C")
+                or txn["Quantity"] <= 0
+                or txn["UnitPrice"] <= 0
+            ):
+                invalid += 1
+                continue
+            valid.append(txn)
+        except Exception:
+            invalid += 1
+
+    summary = {"total_input": len(transactions), "invalid": invalid,
+               "filtered_by_region": 0, "filtered_by_amount": 0, "final_count": 0}
+    rows = valid
+    if region:
+        kept = [txn for txn in rows if txn["Region"] == region]
+        summary["filtered_by_region"] = len(rows) - len(kept)
+        rows = kept
+    if min_amount is not None or max_amount is not None:
+        kept = [
+            txn for txn in rows
+            if (min_amount is None or txn["Quantity"] * txn["UnitPrice"] >= min_amount)
+            and (max_amount is None or txn["Quantity"] * txn["UnitPrice"] <= max_amount)
+        ]
+        summary["filtered_by_amount"] = len(rows) - len(kept)
+        rows = kept
+    summary["final_count"] = len(rows)
+    return rows, invalid, summary
+
+
+@pytest.fixture(scope="module")
+def transactions():
+    rows = utils.file_handler.parse_transactions(make_sales_lines(4000, fractional=False)[1:])
+    rows[5] = dict(rows[5], CustomerID="X1")
+    rows[6] = {key: value for key, value in rows[6].items() if key != "Region"}
+    rows[7] = dict(rows[7], Quantity="2")   # wrong type: rejected, not raised
+    return rows
+
+
+@pytest.mark.parametrize("region", [None, "North", "West", "Nowhere"])
+@pytest.mark.parametrize("amounts", [(None, None), (5000, None), (None, 90000),
+                                     (20000, 200000), (300000, 100)])
+def test_index_matches_the_list_scan(transactions, region, amounts):
+    expected = scan_and_filter(transactions, region, *amounts)
+    assert utils.file_handler.validate_and_filter(transactions, region, *amounts) == expected
+
+
+def test_range_bounds_are_inclusive_and_the_index_is_reusable(transactions):
+    index = FilterIndex(transactions)
+    amount = transactions[0]["Quantity"] * transactions[0]["UnitPrice"]
+    for region, low, high in [("North", amount, amount), (None, amount, None), ("South", None, amount)]:
+        assert utils.file_handler.validate_and_filter(index, region, low, high) \
+            == scan_and_filter(transactions, region, low, high)
@@ -0,0 +1,69 @@
+import math
+import random
+
+import pytest
+
+import utils.data_processor
+import utils.file_handler
+from utils.parallel_analytics import PartialAggregate, aggregate_parallel
+from utils.summation import ExactSum
+
+from conftest import make_sales_lines
+
+VIEWS = [
+    ("calculate_total_revenue", ()),
+    ("region_wise_sales", ()),
+    ("top_selling_products", (5,)),
+    ("customer_analysis", ()),
+    ("daily_sales_trend", ()),
+    ("unique_customers_rollup", ("week",)),
+    ("unique_customers_rollup", ("month",)),
+    ("sales_rollup", ("week",)),
+    ("sales_rollup", ("month",)),
+    ("find_peak_sales_day", ()),
+    ("low_performing_products", (10,)),
+]
+
+
+def serial_engine(path):
+    return utils.data_processor.AggregationEngine(
+        utils.file_handler.parse_transactions(utils.file_handler.read_sales_data(path))
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_equals_serial_with_fractional_prices(sales_file, workers):
+    path = sales_file(20000, fractional=True)
+    serial = serial_engine(path)
+    parallel = aggregate_parallel(path, workers=workers, chunk_size=1000)
+
+    assert (parallel.valid_count, parallel.invalid_count) == (serial.valid_count, serial.invalid_count)
+    for name, args in VIEWS:
+        func = getattr(utils.data_processor, name)
+        assert func(parallel, *args) == func(serial, *args), name
+
+
+def test_partials_merge_to_the_serial_engine_whatever_the_split():
+    rows = utils.file_handler.parse_transactions(make_sales_lines(3000, seed=5))
+    serial = utils.data_processor.AggregationEngine(rows)
+
+    for size in (1, 7, 250, 1999):
+        total = PartialAggregate()
+        for start in range(0, len(rows), size):
+            total.merge(PartialAggregate(rows[start:start + size]))
+        engine = total.finalize()
+        for name, args in VIEWS:
+            func = getattr(utils.data_processor, name)
+            assert func(engine, *args) == func(serial, *args), (size, name)
+
+
+def test_exact_sum_is_correctly_rounded():
+    rng = random.Random(3)
+    amounts = [rng.randint(1, 10) * rng.uniform(10, 90000) for _ in range(20000)]
+
+    merged = ExactSum()
+    for start in range(0, len(amounts), 613):
+        merged.merge(ExactSum(amounts[start:start + 613]))
+
+    assert merged.value() == math.fsum(amounts)
+    assert ExactSum(reversed(amounts)).value() == math.fsum(amounts)
@@ -0,0 +1,70 @@
+import pytest
+
+import utils.data_processor
+import utils.file_handler
+import utils.result_cache
+from utils.result_cache import CACHEABLE, CachedAnalytics, ResultCache
+
+from conftest import make_sales_lines
+
+# arguments for every memoizable function
+CALLS = {
+    "calculate_total_revenue": ((), {}),
+    "region_wise_sales": ((), {}),
+    "top_selling_products": ((3,), {}),
+    "customer_analysis": ((), {}),
+    "daily_sales_trend": ((), {}),
+    "unique_customers_rollup": (("week",), {}),
+    "sales_rollup": (("month",), {}),
+    "find_peak_sales_day": ((), {}),
+    "low_performing_products": ((), {"threshold": 50}),
+    "group_by": ((("Region", "Month"),), {}),
+}
+
+
+@pytest.fixture(params=["rows", "table"])
+def transactions(request):
+    lines = make_sales_lines(3000)
+    return utils.file_handler.parse_transactions(lines, columnar=request.param == "table")
+
+
+def test_every_cacheable_function_through_the_wrapper(transactions):
+    assert set(CALLS) == set(CACHEABLE)
+    cache = ResultCache()
+    analytics = CachedAnalytics(transactions, cache)
+
+    for name in CACHEABLE:
+        args, kwargs = CALLS[name]
+        expected = getattr(utils.data_processor, name)(transactions, *args, **kwargs)
+        assert getattr(analytics, name)(*args, **kwargs) == expected, name
+        assert getattr(analytics, name)(*args, **kwargs) == expected, name
+
+    assert cache.stats()["misses"] == len(CACHEABLE)
+    assert cache.stats()["hits"] == len(CACHEABLE)
+
+
+def test_equivalent_calls_share_one_entry():
+    transactions = utils.file_handler.parse_transactions(make_sales_lines(500))
+    cache = ResultCache()
+    analytics = CachedAnalytics(transactions, cache)
+
+    first = analytics.top_selling_products(5)
+    assert analytics.top_selling_products(n=5) == first
+    assert analytics.top_selling_products() == first
+    analytics.daily_sales_trend(distinct="exact")
+    analytics.daily_sales_trend()
+
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["memory_entries"] == 2
+    assert analytics.top_selling_products(3) != first
+
+
+def test_fingerprints_are_taken_batch_by_batch(monkeypatch):
+    monkeypatch.setattr(utils.result_cache, "FINGERPRINT_BATCH", 64)
+    rows = utils.file_handler.parse_transactions(make_sales_lines(1000)[1:])
+    fingerprint = utils.result_cache.dataset_fingerprint(rows)
+    assert utils.result_cache.dataset_fingerprint([dict(row) for row in rows]) == fingerprint
+
+    changed = [dict(row) for row in rows]
+    changed[-1]["UnitPrice"] += 0.01    # last row of the last batch
+    assert utils.result_cache.dataset_fingerprint(changed) != fingerprint
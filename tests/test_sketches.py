@@ -0,0 +1,62 @@
+import random
+from collections import Counter
+
+import utils.data_processor
+import utils.file_handler
+from utils.sketches import SpaceSaving
+
+from conftest import make_sales_lines
+
+
+def skewed_stream(length, seed):
+    # Zipf-like item frequencies with random weights
+    rng = random.Random(seed)
+    items = [f"C{i:04d}" for i in range(2000)]
+    ranks = [1 / (rank + 1) for rank in range(len(items))]
+    return [(item, rng.randint(1, 20)) for item in rng.choices(items, ranks, k=length)]
+
+
+def assert_bounds(sketch, truth):
+    total = sum(truth.values())
+    assert sketch.total == total
+    for item, estimate, error in sketch.top(len(sketch.counts)):
+        assert estimate - error <= truth[item] <= estimate, item
+        assert error <= total / sketch.capacity
+    for item, weight in truth.items():
+        if weight > total / sketch.capacity:
+            assert item in sketch.counts, item
+
+
+def test_estimates_stay_within_the_error_bound():
+    stream = skewed_stream(50000, seed=3)
+    sketch = SpaceSaving(capacity=100)
+    truth = Counter()
+    for item, weight in stream:
+        sketch.add(item, weight)
+        truth[item] += weight
+
+    assert_bounds(sketch, truth)
+    if sketch.is_guaranteed(5):
+        assert {item for item, _, _ in sketch.top(5)} == {item for item, _ in truth.most_common(5)}
+
+
+def test_merged_sketches_keep_the_bounds():
+    stream = skewed_stream(50000, seed=5)
+    left, right = SpaceSaving(capacity=80), SpaceSaving(capacity=80)
+    for i, (item, weight) in enumerate(stream):
+        (left if i % 3 else right).add(item, weight)
+
+    truth = Counter()
+    for item, weight in stream:
+        truth[item] += weight
+    assert_bounds(left.merge(right), truth)
+
+
+def test_heavy_hitters_find_the_top_customers():
+    rows = utils.file_handler.parse_transactions(make_sales_lines(5000))
+    sketch = utils.data_processor.heavy_hitters(rows, capacity=600)
+    exact = utils.data_processor.customer_analysis(rows)
+
+    # capacity above the number of customers: every count is exact
+    assert sketch.error_bound == 0
+    assert [item for item, _, _ in sketch.top(5)] == list(exact)[:5]
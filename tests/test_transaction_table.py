@@ -0,0 +1,61 @@
+import json
+import struct
+
+import pytest
+
+import utils.file_handler
+from utils.transaction_table import TransactionTable
+
+from conftest import make_sales_lines
+
+
+@pytest.fixture
+def table():
+    return utils.file_handler.parse_transactions(make_sales_lines(2000), columnar=True)
+
+
+def test_load_maps_the_columns_without_copying(table, tmp_path):
+    path = str(tmp_path / "table.txntable")
+    table.save(path)
+    loaded = TransactionTable.load(path)
+
+    assert list(loaded) == list(table)
+    for column in (loaded.quantity, loaded.unit_price, loaded.codes("Region")):
+        assert isinstance(column, memoryview)
+        assert column.readonly
+
+    # the file may be rewritten while a loaded table is still in use
+    table.save(path)
+    assert list(loaded) == list(table)
+
+
+def test_header_records_byte_order_and_item_sizes(table, tmp_path):
+    path = str(tmp_path / "table.txntable")
+    table.save(path)
+    with open(path, "rb") as f:
+        f.read(10)
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+
+    assert header["byte_order"] == "little"
+    formats = {name: column_format for name, column_format, _, _ in header["sections"]}
+    assert formats["Quantity"] == "<i8"
+    assert formats["UnitPrice"] == "<f8"
+    assert formats["Region"] == "<u4"
+    assert all(offset % 8 == 0 for _, _, offset, _ in header["sections"])
+
+
+def test_loaded_table_can_still_be_appended_to(table, tmp_path):
+    path = str(tmp_path / "table.txntable")
+    table.save(path)
+    loaded = TransactionTable.load(path)
+
+    loaded.append(["T999999", "2024-12-01", "P101", "Laptop", 1, 10.5, "C0001", "North"])
+    assert len(loaded) == len(table) + 1
+    assert loaded[len(table)]["UnitPrice"] == 10.5
+
+
+def test_empty_table_round_trip(tmp_path):
+    path = str(tmp_path / "table.txntable")
+    TransactionTable().save(path)
+    assert len(TransactionTable.load(path)) == 0
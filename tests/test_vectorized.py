@@ -0,0 +1,50 @@
+import pytest
+
+import utils.data_processor
+import utils.file_handler
+from utils.vectorized import VectorizedEngine
+
+from conftest import make_sales_lines
+
+pytest.importorskip("numpy")
+
+VIEWS = [
+    ("region_wise_sales", ()),
+    ("top_selling_products", (5,)),
+    ("customer_analysis", ()),
+    ("daily_sales_trend", ()),
+    ("unique_customers_rollup", ("week",)),
+    ("unique_customers_rollup", ("month",)),
+    ("sales_rollup", ("day",)),
+    ("sales_rollup", ("week",)),
+    ("sales_rollup", ("month",)),
+    ("find_peak_sales_day", ()),
+    ("low_performing_products", (10,)),
+]
+
+
+def assert_parity(lines):
+    rows = utils.file_handler.parse_transactions(lines)
+    table = utils.file_handler.parse_transactions(lines, columnar=True)
+    python_engine = utils.data_processor.AggregationEngine(rows)
+    numpy_engine = VectorizedEngine(table)
+
+    assert numpy_engine.total_revenue == python_engine.total_revenue
+    assert numpy_engine.valid_count == python_engine.valid_count
+    assert numpy_engine.invalid_count == python_engine.invalid_count
+    for view, args in VIEWS:
+        assert getattr(numpy_engine, view)(*args) == getattr(python_engine, view)(*args), view
+
+
+def test_parity_on_the_sales_data_file():
+    assert_parity(utils.file_handler.read_sales_data("data/sales_data.txt"))
+
+
+@pytest.mark.parametrize("fractional", [True, False])
+def test_parity_on_synthetic_data(fractional):
+    assert_parity(make_sales_lines(20000, seed=3, fractional=fractional)[1:])
+
+
+def test_data_processor_picks_the_vectorized_engine_for_tables():
+    table = utils.file_handler.parse_transactions(make_sales_lines(100)[1:], columnar=True)
+    assert isinstance(utils.data_processor._engine(table), VectorizedEngine)
@@ -0,0 +1,38 @@
+from datetime import date
+
+import pytest
+
+import utils.file_handler
+from utils.xlsx_reader import iter_xlsx_sales_data, read_xlsx_sales_data
+
+from conftest import make_sales_lines
+
+
+def test_workbook_parses_like_the_text_extract():
+    assert utils.file_handler.parse_transactions(read_xlsx_sales_data("data/data.xlsx")) \
+        == utils.file_handler.parse_transactions(utils.file_handler.read_sales_data("data/sales_data.txt"))
+
+
+def test_columns_are_matched_by_name_and_dates_converted(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    lines = make_sales_lines(300)
+    header = lines[0].split("|")
+    order = header[::-1]    # reversed column order plus a formula column
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(order + ["Revenue"])
+    for i, line in enumerate(lines[1:], start=2):
+        row = dict(zip(header, line.split("|")))
+        row["Date"] = date.fromisoformat(row["Date"])
+        row["Quantity"] = int(row["Quantity"])
+        row["UnitPrice"] = float(row["UnitPrice"])
+        sheet.append([row[name] for name in order] + [f"=E{i}*F{i}"])
+        if i % 100 == 0:
+            sheet.append([])    # empty rows are skipped
+    path = str(tmp_path / "sales.xlsx")
+    workbook.save(path)
+
+    chunks = list(iter_xlsx_sales_data(path, chunk_size=128))
+    assert [len(chunk) for chunk in chunks] == [128, 128, 44]
+    assert utils.file_handler.parse_transactions(read_xlsx_sales_data(path)) \
+        == utils.file_handler.parse_transactions(lines[1:])
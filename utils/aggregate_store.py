@@ -0,0 +1,282 @@
+"""
+    Persisted, incrementally maintained aggregates
+
+    AggregateStore keeps the accumulators behind region_wise_sales,
+    top_selling_products, customer_analysis, daily_sales_trend (and the other
+    AggregationEngine views) in a JSON snapshot between runs. Each run only
+    adds the newly arrived transactions, so its cost is proportional to the
+    new data instead of to all history.
+
+    Corrections are applied as delta rows: the original transaction is
+    retracted (subtracted) and the corrected one added. To make retraction
+    possible, distinct products per customer and customers per date are kept
+    as multiplicity counters instead of sets. Revenue is held in ExactSum
+    accumulators, so a retraction cancels its row exactly.
+
+    For file sources the read position of every ingested file is part of the
+    snapshot, so the aggregates and the offsets they reflect are always
+    saved together (one atomic file replace).
+"""
+
+import json
+import os
+from collections import Counter
+
+import utils.file_handler
+from utils.data_processor import AggregationEngine, _is_valid
+from utils.summation import ExactSum
+
+STORE_FILE = "output/aggregates.json"
+STORE_VERSION = 2
+
+
+class AggregateStore(AggregationEngine):
+    """
+    AggregationEngine whose state can be saved, reloaded and updated
+
+    Expected Usage:
+        store = AggregateStore.load()               # empty if no snapshot yet
+        store.update(new_transactions, retractions=[old_row])
+        store.update_from_file("data/sales_data.txt")
+        store.save()
+        region_wise_sales(store), daily_sales_trend(store), ...
+    """
+
+    def __init__(self, transactions=()):
+        self.ingest = {}        # absolute path -> read position of the file
+        super().__init__(transactions)
+
+    def _new_customer_set(self):
+        # multiplicities instead of a set, so rows can be retracted
+        return Counter()
+
+    def _new_product_set(self):
+        return Counter()
+
+    def merge(self, other):
+        """
+        Folds another store into this one; the multiplicity counters add up,
+        so rows of either store can still be retracted afterwards
+
+        Raises TypeError for a plain AggregationEngine, whose sets do not
+        say how many rows hold each product / customer
+        """
+        if not isinstance(other, AggregateStore):
+            raise TypeError("an AggregateStore can only merge another AggregateStore")
+        return super().merge(other)
+
+    # -----------------------------
+    # DELTAS
+    # -----------------------------
+    def add(self, txn, sign=1):
+        """
+        Adds (sign=1) or retracts (sign=-1) one transaction
+
+        Raises ValueError when a retracted row is not in the store (a count
+        would drop below zero); the store is then left unchanged
+        """
+        if not _is_valid(txn):
+            if sign < 0 and self.invalid_count < 1:
+                raise ValueError(f"cannot retract {txn.get('TransactionID')}: no invalid rows in the store")
+            self.invalid_count += sign
+            return
+        if sign < 0:
+            self._check_retractable(txn)
+
+        quantity = txn["Quantity"] * sign
+        revenue = quantity * txn["UnitPrice"]
+        product = txn["ProductName"]
+        customer = txn["CustomerID"]
+
+        self.valid_count += sign
+        self.revenue_sum.add(revenue)
+
+        region = self.regions.setdefault(txn["Region"], [ExactSum(), 0])
+        region[0].add(revenue)
+        region[1] += sign
+        if region[1] == 0:
+            del self.regions[txn["Region"]]
+
+        product_acc = self.products.setdefault(product, [0, ExactSum()])
+        product_acc[0] += quantity
+        product_acc[1].add(revenue)
+        if product_acc[0] == 0:
+            del self.products[product]
+
+        customer_acc = self.customers.setdefault(customer, [ExactSum(), 0, self._new_product_set()])
+        customer_acc[0].add(revenue)
+        customer_acc[1] += sign
+        _count(customer_acc[2], product, sign)
+        if customer_acc[1] == 0:
+            del self.customers[customer]
+
+        date_acc = self.dates.setdefault(txn["Date"], [ExactSum(), 0, self._new_customer_set()])
+        date_acc[0].add(revenue)
+        date_acc[1] += sign
+        _count(date_acc[2], customer, sign)
+        if date_acc[1] == 0:
+            del self.dates[txn["Date"]]
+
+    def _check_retractable(self, txn):
+        # Every accumulator the row was added to must still hold it
+        region = self.regions.get(txn["Region"])
+        product = self.products.get(txn["ProductName"])
+        customer = self.customers.get(txn["CustomerID"])
+        day = self.dates.get(txn["Date"])
+        if (
+            region is None
+            or product is None or product[0] < txn["Quantity"]
+            or customer is None or customer[2][txn["ProductName"]] < 1
+            or day is None or day[2][txn["CustomerID"]] < 1
+        ):
+            raise ValueError(f"cannot retract {txn['TransactionID']}: row is not in the store")
+
+    def retract(self, txn):
+        self.add(txn, sign=-1)
+
+    def update(self, new_transactions=(), retractions=()):
+        """
+        Applies one batch of deltas
+
+        Parameters:
+        - new_transactions: newly arrived (or corrected) rows to add
+        - retractions: previously ingested rows to subtract (corrections,
+          cancellations); a correction is its original row here plus the
+          fixed row in new_transactions
+
+        Raises ValueError when a retraction is not in the store; the batch's
+        earlier retractions are undone first, so nothing is applied
+        """
+        retracted = []
+        try:
+            for txn in retractions:
+                self.retract(txn)
+                retracted.append(txn)
+        except ValueError:
+            for txn in reversed(retracted):
+                self.add(txn)
+            raise
+        for txn in new_transactions:
+            self.add(txn)
+        return self
+
+    def update_from_file(self, filename):
+        """
+        Adds the records appended to filename since the last update
+
+        The file's read position is kept in the store (see
+        read_appended_records) and only reaches disk with save(), together
+        with the aggregates it belongs to: after a crash before save() the
+        records are simply read again.
+
+        When a file already in the store was truncated or rewritten, the
+        store is rebuilt from scratch with that file; other files are then
+        read in full again on their next update.
+
+        Returns: number of valid transactions added
+        """
+        key = os.path.abspath(filename)
+        new_lines, full_reload, state = utils.file_handler.read_appended_records(
+            filename, self.ingest.get(key)
+        )
+        if state is None:
+            return 0        # file not found, store unchanged
+        if full_reload and key in self.ingest:
+            AggregationEngine.__init__(self)
+            self.ingest = {}
+
+        before = self.valid_count
+        self.update(utils.file_handler.parse_transactions(new_lines))
+        self.ingest[key] = state
+        return self.valid_count - before
+
+    # -----------------------------
+    # PERSISTENCE
+    # -----------------------------
+    def to_state(self):
+        return {
+            "version": STORE_VERSION,
+            "total_revenue": _sum_state(self.revenue_sum),
+            "valid_count": self.valid_count,
+            "invalid_count": self.invalid_count,
+            "regions": {
+                region: [_sum_state(sales), count]
+                for region, (sales, count) in self.regions.items()
+            },
+            "products": {
+                product: [quantity, _sum_state(revenue)]
+                for product, (quantity, revenue) in self.products.items()
+            },
+            "customers": {
+                customer: [_sum_state(spent), count, dict(products)]
+                for customer, (spent, count, products) in self.customers.items()
+            },
+            "dates": {
+                txn_date: [_sum_state(revenue), count, dict(customers)]
+                for txn_date, (revenue, count, customers) in self.dates.items()
+            },
+            "ingest": self.ingest
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        if state.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported aggregate store version: {state.get('version')}")
+
+        store = cls()
+        store.revenue_sum = _sum_from_state(state["total_revenue"])
+        store.valid_count = state["valid_count"]
+        store.invalid_count = state["invalid_count"]
+        store.regions = {
+            region: [_sum_from_state(sales), count]
+            for region, (sales, count) in state["regions"].items()
+        }
+        store.products = {
+            product: [quantity, _sum_from_state(revenue)]
+            for product, (quantity, revenue) in state["products"].items()
+        }
+        store.customers = {
+            customer: [_sum_from_state(spent), count, Counter(products)]
+            for customer, (spent, count, products) in state["customers"].items()
+        }
+        store.dates = {
+            txn_date: [_sum_from_state(revenue), count, Counter(customers)]
+            for txn_date, (revenue, count, customers) in state["dates"].items()
+        }
+        store.ingest = state["ingest"]
+        return store
+
+    def save(self, filename=STORE_FILE):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.to_state(), f)
+        os.replace(filename + ".tmp", filename)
+
+    @classmethod
+    def load(cls, filename=STORE_FILE):
+        """
+        Loads a snapshot; returns an empty store if there is none yet
+        """
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                return cls.from_state(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+
+def _sum_state(total):
+    # ExactSum -> JSON: [integer part, float partials]
+    return [total.integer, total.partials]
+
+
+def _sum_from_state(state):
+    total = ExactSum()
+    total.integer, total.partials = state[0], list(state[1])
+    return total
+
+
+def _count(counter, key, sign):
+    # Adjust a multiplicity, dropping keys that reach zero
+    counter[key] += sign
+    if counter[key] <= 0:
+        del counter[key]
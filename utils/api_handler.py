@@ -1,14 +1,24 @@
 import requests
+import itertools
 import json
 import os
 import re
+from operator import itemgetter
+import utils.catalog_cache
+import utils.catalog_client
+from utils.file_handler import WRITE_BUFFER
+from utils.transaction_table import EnrichedTransaction, ENRICHMENT_FIELDS
 #import utils.file_handler
 #import utils.data_processor
 
 # data['products'] contains list of all products
 # data['total'] gives total count
 
-def fetch_all_products(limit=300):
+ENRICHED_FILE = "data/enriched_sales_data.txt"
+
+def fetch_all_products(limit=None, base_url=utils.catalog_client.API_BASE_URL,
+                       page_size=utils.catalog_client.PAGE_SIZE,
+                       max_concurrency=utils.catalog_client.MAX_CONCURRENCY, cache=None):
     """ Task 3.1 Fetch all Products
     Fetches all products from DummyJSON API
     Returns: list of product dictionaries
@@ -30,28 +40,37 @@ def fetch_all_products(limit=300):
     - Handle connection errors with try-except
     - Return empty list if API fails
     - Print status message (success/failure)
+
+    limit caps the number of products (None = whole catalog). Pages of
+    page_size are fetched concurrently (see utils.catalog_client), only
+    the fields above are requested; base_url can point at a stub server.
+
+    cache: optional utils.catalog_cache.CatalogCache; the catalog is then
+    served from disk within its TTL, revalidated conditionally after it,
+    and the stale copy is used when the API is unreachable.
     """
-    params = {'limit': limit}
-    url = 'https://dummyjson.com/products'
-    
     try:
-        response = requests.get(url, params=params, timeout=10)
-        # Raise an exception for HTTP errors (4xx or 5xx)
-        response.raise_for_status()
-        # Parse JSON and extract the list of products
-        data = response.json()
-        products = data.get('products', [])
-        
-        result = []
-        for p in products:
-            result.append({
-                "id": p.get("id"),
-                "title": p.get("title"),
-                "category": p.get("category"),
-                "brand": p.get("brand"),
-                "price": p.get("price"),
-                "rating": p.get("rating")
-            })
+        if cache is None:
+            result = utils.catalog_client.fetch_catalog(
+                base_url=base_url,
+                page_size=page_size,
+                max_concurrency=max_concurrency,
+                max_products=limit
+            )
+        else:
+            result = cache.get_products(
+                base_url=base_url,
+                page_size=page_size,
+                max_concurrency=max_concurrency,
+                max_products=limit
+            )
+            age = cache.age() or 0
+            if cache.last_source == utils.catalog_cache.SOURCE_STALE:
+                print(f"Warning: API unreachable, using {len(result)} cached products from {age / 3600:.1f} h ago.")
+                return result
+            if cache.last_source == utils.catalog_cache.SOURCE_CACHE:
+                print(f"Success: Loaded {len(result)} products from cache ({age / 60:.0f} min old).")
+                return result
 
         print(f"Success: Fetched {len(result)} products.")
         return result
@@ -98,61 +117,225 @@ def create_product_mapping(api_products):
     print(f"Created product mapping for {len(product_mapping)} products")
     return product_mapping
 
-def enrich_sales_data(transactions, product_mapping):
-    """
-    Enriches transaction data with API product information
+def _numeric_product_id(product_id_raw):
+    # Extract numeric ID (P101 -> 101, P5 -> 5)
+    match = re.search(r"\d+", product_id_raw)
+    return int(match.group()) if match else None
+
+
+def create_product_mapping_lazy(transactions, cache=None,
+                                base_url=utils.catalog_client.API_BASE_URL,
+                                max_concurrency=utils.catalog_client.MAX_CONCURRENCY):
     """
-    enriched_transactions = []
+    Demand-driven alternative to fetch_all_products + create_product_mapping
 
-    # Ensure output directory exists
-    os.makedirs("data", exist_ok=True)
-    output_file = "data/enriched_sales_data.txt"
+    Only the distinct products referenced by the transactions are looked
+    up: each id is resolved against the cache first and the missing ones
+    are fetched concurrently via /products/{id}.
+
+    Parameters:
+    - transactions: transactions to be enriched
+    - cache: optional utils.catalog_cache.ProductCache (persists products
+      and the ids that do not exist between runs)
 
+    Returns: dictionary mapping product IDs to info, same format as
+    create_product_mapping()
+    """
+    product_ids = set()
     for tx in transactions:
-        enriched_tx = tx.copy()
+        try:
+            numeric_id = _numeric_product_id(tx.get("ProductID", ""))
+        except Exception:
+            continue
+        if numeric_id is not None:
+            product_ids.add(numeric_id)
+
+    if cache is not None:
+        found = cache.lookup(product_ids, base_url, max_concurrency)
+        stats = cache.stats()
+        print(f"Success: Resolved {len(found)}/{len(product_ids)} referenced products "
+              f"({stats['hits']} cached, {stats['fetched']} fetched, {stats['failed']} failed).")
+    else:
+        found, _, failed = utils.catalog_client.fetch_products(sorted(product_ids), base_url, max_concurrency)
+        print(f"Success: Resolved {len(found)}/{len(product_ids)} referenced products "
+              f"({len(failed)} failed).")
+
+    return create_product_mapping([found[product_id] for product_id in sorted(found)])
+
+
+_NO_MATCH = (None, None, None, False)
+
+
+def _product_side_row(product_id_raw, product_mapping):
+    # API columns for one distinct ProductID (None, None, None, False if unmatched)
+    try:
+        numeric_id = _numeric_product_id(product_id_raw)
+        product_info = product_mapping.get(numeric_id)
+
+        if product_info:
+            return (
+                product_info.get("category"),
+                product_info.get("brand"),
+                product_info.get("rating"),
+                True
+            )
+    except Exception:
+        pass
+    return _NO_MATCH
+
+
+def _enriched_lines(rows, headers, report=None):
+    # Pipe-delimited lines in `headers` order; EnrichedTransaction views are
+    # formatted from their base values + shared side tuple in one go.
+    # Every row is also handed to report.add() when a report is given.
+    base_fields = headers[:-len(ENRICHMENT_FIELDS)]
+    joined = tuple(headers[-len(ENRICHMENT_FIELDS):]) == ENRICHMENT_FIELDS and len(base_fields) > 1
+    base_values = itemgetter(*base_fields) if joined else None
+
+    for row in rows:
+        if report is not None:
+            report.add(row)
+        if joined and type(row) is EnrichedTransaction:
+            try:
+                yield "|".join(map(str, base_values(row.base) + row.side)) + "\n"
+                continue
+            except KeyError:
+                pass    # field missing in this row, use the generic path
+        yield "|".join(str(row.get(h, "")) for h in headers) + "\n"
+
+
+def _write_enriched(rows, output_file, report=None, buffer_size=WRITE_BUFFER):
+    # Single buffered write pass; header taken from the first row.
+    # Returns the number of rows written (no file for an empty stream)
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    headers = list(first.keys())
+    written = 0
+
+    def counted():
+        nonlocal written
+        for row in itertools.chain((first,), rows):
+            written += 1
+            yield row
+
+    with open(output_file, "w", encoding="utf-8", buffering=buffer_size) as f:
+        f.write("|".join(headers) + "\n")
+        f.writelines(_enriched_lines(counted(), headers, report))
+    return written
+
+
+class EnrichmentSummary:
+    """
+    Streaming accumulator of the report's API ENRICHMENT SUMMARY
+
+    Can be passed to generate_sales_report instead of the enriched list,
+    so enriched rows never have to be kept in memory:
+        summary = EnrichmentSummary()
+        write_enriched_stream(transactions, mapping, report=summary)
+        generate_sales_report(transactions, summary)
+    """
+
+    def __init__(self, enriched_transactions=()):
+        self.total = 0
+        self.matched = 0
+        self.failed_products = set()
+        for row in enriched_transactions:
+            self.add(row)
+
+    def add(self, row):
+        self.total += 1
+        if row.get("API_Match"):
+            self.matched += 1
+        else:
+            self.failed_products.add(row["ProductID"])
+
+    @property
+    def success_rate(self):
+        return self.matched / self.total * 100 if self.total else 0
+
+
+def iter_enriched_transactions(transactions, product_mapping):
+    """
+    Generator stage of the enrichment: yields one EnrichedTransaction view
+    per input transaction
 
+    Hash join on ProductID: every distinct ProductID is resolved against
+    product_mapping once; rows are processed as they arrive, so the input
+    can be any transaction stream (e.g. parsed chunk by chunk).
+    """
+    side_rows = {}      # raw ProductID -> (category, brand, rating, match)
+    for tx in transactions:
+        product_id_raw = tx.get("ProductID", "")
         try:
-            product_id_raw = tx.get("ProductID", "")
-
-            # Extract numeric ID (P101 -> 101, P5 -> 5)
-            match = re.search(r"\d+", product_id_raw)
-            numeric_id = int(match.group()) if match else None
-            #print(numeric_id)
-            product_info = product_mapping.get(numeric_id)
-            
-            if product_info:
-                enriched_tx.update({
-                    "API_Category": product_info.get("category"),
-                    "API_Brand": product_info.get("brand"),
-                    "API_Rating": product_info.get("rating"),
-                    "API_Match": True
-                })
-            else:
-                enriched_tx.update({
-                    "API_Category": None,
-                    "API_Brand": None,
-                    "API_Rating": None,
-                    "API_Match": False
-                })
+            side = side_rows.get(product_id_raw)
+        except TypeError:       # unhashable ProductID
+            side = _product_side_row(product_id_raw, product_mapping)
+        else:
+            if side is None:
+                side = side_rows[product_id_raw] = _product_side_row(product_id_raw, product_mapping)
 
-        except Exception:
-            enriched_tx.update({
-                "API_Category": None,
-                "API_Brand": None,
-                "API_Rating": None,
-                "API_Match": False
-            })
+        yield EnrichedTransaction(tx, side)
 
-        enriched_transactions.append(enriched_tx)
 
-    # Write to pipe-delimited file
-    if enriched_transactions:
-        headers = enriched_transactions[0].keys()
+def write_enriched_stream(transactions, product_mapping, output_file=ENRICHED_FILE,
+                          report=None, buffer_size=WRITE_BUFFER):
+    """
+    Streams transactions through the enrichment straight into output_file
+
+    Parameters:
+    - transactions: any iterable of transactions (list, generator, table)
+    - product_mapping: from create_product_mapping / create_product_mapping_lazy
+    - report: optional accumulator with add(row), e.g. EnrichmentSummary,
+      fed with every enriched row while it is written (tee)
+    - buffer_size: size of the output buffer
+
+    Returns: number of rows written
+
+    Same file format as enrich_sales_data; rows are formatted once and
+    written through one large buffer, nothing is kept in memory.
+    """
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    written = _write_enriched(
+        iter_enriched_transactions(transactions, product_mapping),
+        output_file,
+        report,
+        buffer_size
+    )
+
+    print(f"✅ Enriched {written} transactions")
+    print(f"📄 Output saved to {output_file}")
+    return written
+
+
+def enrich_sales_data(transactions, product_mapping, copy=False):
+    """
+    Enriches transaction data with API product information
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("|".join(headers) + "\n")
-            for row in enriched_transactions:
-                f.write("|".join(str(row.get(h, "")) for h in headers) + "\n")
+    Hash join on ProductID: every distinct ProductID is resolved against
+    product_mapping once, and each transaction is returned as an
+    EnrichedTransaction view (the original row + the shared API columns)
+    instead of a copied dictionary.
+
+    Returns: list of read-only EnrichedTransaction views, each supporting
+    row["API_Brand"], row.get(...) and iteration over the transaction's
+    fields followed by API_Category, API_Brand, API_Rating and API_Match.
+    Pass copy=True for plain dictionaries that can be modified. For large
+    inputs write_enriched_stream() produces the same file without holding
+    the enriched rows.
+    """
+    # Ensure output directory exists
+    os.makedirs("data", exist_ok=True)
+    output_file = ENRICHED_FILE
+
+    enriched_transactions = list(iter_enriched_transactions(transactions, product_mapping))
+    if copy:
+        enriched_transactions = [row.copy() for row in enriched_transactions]
+
+    # Write to pipe-delimited file
+    _write_enriched(enriched_transactions, output_file)
 
     print(f"✅ Enriched {len(enriched_transactions)} transactions")
     print(f"📄 Output saved to {output_file}")
@@ -177,30 +360,27 @@ def save_enriched_data(enriched_transactions, filename='data/enrhd_sales_data.tx
     # Ensure output directory exists
     output_file = filename
     # Write to pipe-delimited file
-    if enriched_transactions:
-        headers = enriched_transactions[0].keys()
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("|".join(headers) + "\n")
-            for row in enriched_transactions:
-                f.write("|".join(str(row.get(h, "")) for h in headers) + "\n")
+    _write_enriched(enriched_transactions, output_file)
 
     print(f"📄 Output saved to {output_file}")
 
 
-from datetime import datetime
+from datetime import date, datetime
 from collections import defaultdict, Counter
-
-def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
+import heapq
+from utils.data_processor import HLL_PRECISION
+from utils.dates import date_range
+from utils.sketches import HyperLogLog
+from utils.transaction_table import TransactionTable
+
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt',
+                          distinct_customers="exact", precision=HLL_PRECISION):
     # -------------------------------
     # Helper functions
     # -------------------------------
     def fmt_currency(value):
         return f"₹{value:,.2f}"
 
-    def parse_date(d):
-        return datetime.strptime(d, "%Y-%m-%d")
-
     # -------------------------------
     # Basic metrics
     # -------------------------------
@@ -208,9 +388,13 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     total_revenue = sum(t["Quantity"] * t["UnitPrice"] for t in transactions)
     avg_order_value = total_revenue / total_transactions if total_transactions else 0
 
-    dates = [parse_date(t["Date"]) for t in transactions]
-    min_date = min(dates).date()
-    max_date = max(dates).date()
+    # each distinct date is parsed once, not every transaction's
+    if isinstance(transactions, TransactionTable):
+        ordinals = transactions.date_ordinals(per_row=False)
+        min_date = date.fromordinal(min(ordinals))
+        max_date = date.fromordinal(max(ordinals))
+    else:
+        min_date, max_date = date_range(t["Date"] for t in transactions)
 
     # -------------------------------
     # Region-wise performance
@@ -239,11 +423,11 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
         product_qty[t["ProductName"]] += t["Quantity"]
         product_rev[t["ProductName"]] += t["Quantity"] * t["UnitPrice"]
 
-    top_products = sorted(
+    top_products = heapq.nlargest(
+        5,
         product_rev.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+        key=lambda x: x[1]
+    )
 
     # -------------------------------
     # Top 5 customers
@@ -255,18 +439,26 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
         customer_spend[t["CustomerID"]] += t["Quantity"] * t["UnitPrice"]
         customer_orders[t["CustomerID"]] += 1
 
-    top_customers = sorted(
+    top_customers = heapq.nlargest(
+        5,
         customer_spend.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+        key=lambda x: x[1]
+    )
 
     # -------------------------------
     # Daily sales trend
     # -------------------------------
     daily_rev = defaultdict(float)
     daily_tx = defaultdict(int)
-    daily_customers = defaultdict(set)
+    # "hll" counts daily customers with HyperLogLog sketches of the given
+    # precision instead of sets
+    if distinct_customers == "hll":
+        HyperLogLog.validate_precision(precision)
+        daily_customers = defaultdict(lambda: HyperLogLog(precision))
+    elif distinct_customers == "exact":
+        daily_customers = defaultdict(set)
+    else:
+        raise ValueError("distinct_customers must be 'exact' or 'hll'")
 
     for t in transactions:
         daily_rev[t["Date"]] += t["Quantity"] * t["UnitPrice"]
@@ -292,14 +484,15 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     # -------------------------------
     # API enrichment summary
     # -------------------------------
-    enriched = [t for t in enriched_transactions if t.get("API_Match")]
-    failed = [t for t in enriched_transactions if not t.get("API_Match")]
+    # an EnrichmentSummary teed from write_enriched_stream, or the list
+    if isinstance(enriched_transactions, EnrichmentSummary):
+        enrichment = enriched_transactions
+    else:
+        enrichment = EnrichmentSummary(enriched_transactions)
 
-    success_rate = (len(enriched) / len(enriched_transactions) * 100) if enriched_transactions else 0
+    success_rate = enrichment.success_rate
 
-    failed_products = sorted(
-        {t["ProductID"] for t in failed}
-    )
+    failed_products = sorted(enrichment.failed_products)
 
     # -------------------------------
     # Write report
@@ -372,7 +565,7 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
         # API ENRICHMENT SUMMARY
         f.write("API ENRICHMENT SUMMARY\n")
         f.write("-" * 44 + "\n")
-        f.write(f"Total Products Enriched: {len(enriched)}\n")
+        f.write(f"Total Products Enriched: {enrichment.matched}\n")
         f.write(f"Success Rate: {success_rate:.2f}%\n")
         f.write("Products Not Enriched:\n")
         for p in failed_products:
@@ -0,0 +1,49 @@
+"""
+    LRU index shared by the on-disk caches (parse cache, result cache)
+
+    Each cache directory holds its entry files plus an index.json mapping a
+    key to {'file': ..., 'bytes': ..., 'last_used': ...} (and any other
+    fields the cache stores). evict() keeps the directory within a byte
+    budget by removing the least recently used entries first.
+"""
+
+import json
+import os
+
+INDEX_FILE = "index.json"
+
+
+def load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_index(cache_dir, index):
+    path = os.path.join(cache_dir, INDEX_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def remove_entry(cache_dir, index, key):
+    entry = index.pop(key, None)
+    if entry:
+        try:
+            os.remove(os.path.join(cache_dir, entry["file"]))
+        except FileNotFoundError:
+            pass
+
+
+def evict(cache_dir, index, max_bytes, keep=None):
+    # Drop least recently used entries until the cache fits in max_bytes
+    total = sum(entry["bytes"] for entry in index.values())
+    for key in sorted(index, key=lambda k: index[k]["last_used"]):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        total -= index[key]["bytes"]
+        remove_entry(cache_dir, index, key)
@@ -0,0 +1,309 @@
+"""
+    Persistent product-catalog cache with TTL and conditional revalidation
+
+    The catalog pages fetched by utils.catalog_client are stored on disk
+    together with their fetch time and HTTP validators (ETag /
+    Last-Modified):
+
+    - younger than the TTL      -> served from disk, no network at all
+    - older than the TTL        -> every page is revalidated with a
+                                   conditional request; unchanged pages
+                                   (304) are reused, changed ones replaced
+    - network / API failure     -> the stale copy is served
+    - nothing cached and no API -> the error is raised to the caller
+
+    Expected Usage:
+        cache = CatalogCache()
+        products = cache.get_products()     # same list as fetch_catalog()
+        cache.stats()   # {'hits': 1, 'misses': 0, 'age_seconds': 42.0, ...}
+
+    ProductCache does the same per product id, for demand-driven lookups
+    that only fetch the products a dataset references; ids the API does not
+    know are remembered as negative entries.
+"""
+
+import json
+import os
+import time
+
+import requests
+
+import utils.catalog_client
+
+CATALOG_CACHE_FILE = "output/cache/catalog.json"
+CATALOG_TTL = 24 * 60 * 60      # seconds a cached catalog is served as-is
+CACHE_VERSION = 1
+
+PRODUCT_CACHE_FILE = "output/cache/products.json"
+PRODUCT_CACHE_VERSION = 2       # entries keyed by request URL, not bare id
+PRODUCT_TTL = 24 * 60 * 60      # seconds a cached product is served as-is
+NEGATIVE_TTL = 60 * 60          # seconds an unknown id is not asked again
+
+# how the last get_products() call was answered
+SOURCE_CACHE = "cache"
+SOURCE_REVALIDATED = "revalidated"
+SOURCE_NETWORK = "network"
+SOURCE_STALE = "stale"
+
+
+class CatalogCache:
+    """
+    On-disk cache in front of the catalog fetch
+
+    Parameters:
+    - path: JSON file holding the cached pages
+    - ttl: seconds a cached catalog is used without revalidation
+    """
+
+    def __init__(self, path=CATALOG_CACHE_FILE, ttl=CATALOG_TTL):
+        self.path = path
+        self.ttl = ttl
+
+        self.hits = 0           # served within the TTL
+        self.revalidations = 0  # revalidated after the TTL (304s reused)
+        self.misses = 0         # fetched in full
+        self.stale = 0          # served stale because the API failed
+        self.last_source = None
+        self.last_not_modified = 0  # pages confirmed by 304 in the last revalidation
+        self.fetched_at = None
+
+    # -----------------------------
+    # PERSISTENCE
+    # -----------------------------
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if state.get("version") != CACHE_VERSION:
+            return None
+        return state
+
+    def save(self, state):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    # -----------------------------
+    # LOOKUP
+    # -----------------------------
+    def get_products(self, base_url=utils.catalog_client.API_BASE_URL,
+                     page_size=utils.catalog_client.PAGE_SIZE,
+                     max_concurrency=utils.catalog_client.MAX_CONCURRENCY,
+                     fields=utils.catalog_client.PRODUCT_FIELDS, max_products=None):
+        """
+        Returns: list of product dictionaries, as fetch_catalog()
+
+        Raises requests.exceptions.RequestException only when the API fails
+        and no cached copy of this catalog exists
+        """
+        key = {
+            "base_url": base_url,
+            "page_size": page_size,
+            "fields": list(fields),
+            "max_products": max_products
+        }
+        state = self.load()
+        if state is not None and state["key"] != key:
+            state = None    # cached copy of a different catalog / query
+
+        now = time.time()
+        if state is not None and now - state["fetched_at"] < self.ttl:
+            self.hits += 1
+            return self._answer(SOURCE_CACHE, state)
+
+        try:
+            catalog = utils.catalog_client.fetch_catalog_pages(
+                base_url, page_size, max_concurrency, fields, max_products,
+                previous=state["catalog"] if state else None
+            )
+        except requests.exceptions.RequestException:
+            if state is None:
+                raise
+            self.stale += 1
+            return self._answer(SOURCE_STALE, state)
+
+        if state is not None:
+            self.revalidations += 1
+            source = SOURCE_REVALIDATED
+        else:
+            self.misses += 1
+            source = SOURCE_NETWORK
+
+        state = {
+            "version": CACHE_VERSION,
+            "key": key,
+            "fetched_at": now,
+            "catalog": {"total": catalog["total"], "pages": catalog["pages"]}
+        }
+        self.save(state)
+        self.last_not_modified = catalog["not_modified"]
+        return self._answer(source, state)
+
+    def _answer(self, source, state):
+        self.last_source = source
+        self.fetched_at = state["fetched_at"]
+        return utils.catalog_client.catalog_products(state["catalog"])
+
+    # -----------------------------
+    # STATS
+    # -----------------------------
+    def age(self):
+        """
+        Seconds since the served catalog was fetched / revalidated (None if unknown)
+        """
+        if self.fetched_at is None:
+            state = self.load()
+            if state is None:
+                return None
+            return time.time() - state["fetched_at"]
+        return time.time() - self.fetched_at
+
+    def stats(self):
+        """
+        Returns: dictionary of cache counters and the catalog age
+
+        Expected Output Format:
+        {'hits': 1, 'revalidations': 0, 'misses': 0, 'stale': 0,
+         'last_source': 'cache', 'pages_not_modified': 0, 'age_seconds': 3605.2}
+        """
+        age = self.age()
+        return {
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "stale": self.stale,
+            "last_source": self.last_source,
+            "pages_not_modified": self.last_not_modified,
+            "age_seconds": round(age, 1) if age is not None else None
+        }
+
+
+def _product_key(base_url, fields, product_id):
+    # the request a product entry answers, as fetch_product() issues it
+    return f"{base_url.rstrip('/')}/products/{product_id}?select={','.join(fields or ())}"
+
+
+class ProductCache:
+    """
+    On-disk cache of individual products, with negative entries
+
+    Parameters:
+    - path: JSON file holding the cached products
+    - ttl: seconds a cached product is used without refetching
+    - negative_ttl: seconds an id answered with 404 is not requested again
+
+    Entries (positive and negative) are keyed by the request they answer,
+    i.e. base_url, fields and id, so lookups against another API or field
+    set never see each other's products. Negative entries are dropped once
+    they expire.
+    """
+
+    def __init__(self, path=PRODUCT_CACHE_FILE, ttl=PRODUCT_TTL, negative_ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self.hits = 0           # ids served from the cache
+        self.negative_hits = 0  # ids known not to exist
+        self.fetched = 0        # ids fetched from the API
+        self.failed = 0         # ids whose fetch failed (stale copy used if any)
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"version": PRODUCT_CACHE_VERSION, "products": {}, "missing": {}}
+        if state.get("version") != PRODUCT_CACHE_VERSION:
+            return {"version": PRODUCT_CACHE_VERSION, "products": {}, "missing": {}}
+        return state
+
+    def save(self, state):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def lookup(self, product_ids, base_url=utils.catalog_client.API_BASE_URL,
+               max_concurrency=utils.catalog_client.MAX_CONCURRENCY,
+               fields=utils.catalog_client.PRODUCT_FIELDS):
+        """
+        Resolves product ids, fetching only the ones not cached
+
+        Returns: {id: product dictionary} for every id that exists; unknown
+        ids are left out
+        """
+        state = self.load()
+        products = state["products"]    # request URL -> entry
+        missing = state["missing"]      # request URL -> time of the 404
+        now = time.time()
+
+        expired = [key for key, at in missing.items() if now - at >= self.negative_ttl]
+        for key in expired:
+            del missing[key]
+        changed = bool(expired)
+
+        def key_of(product_id):
+            return _product_key(base_url, fields, product_id)
+
+        found = {}
+        to_fetch = []
+        for product_id in set(product_ids):
+            key = key_of(product_id)
+            entry = products.get(key)
+            if entry is not None and now - entry["fetched_at"] < self.ttl:
+                self.hits += 1
+                found[product_id] = entry["product"]
+            elif key in missing:
+                self.negative_hits += 1
+            else:
+                to_fetch.append(product_id)
+
+        if to_fetch:
+            fetched, not_found, failed = utils.catalog_client.fetch_products(
+                sorted(to_fetch), base_url, max_concurrency, fields
+            )
+            self.fetched += len(fetched) + len(not_found)
+            self.failed += len(failed)
+            changed = changed or bool(fetched or not_found)
+
+            for product_id, product in fetched.items():
+                products[key_of(product_id)] = {"fetched_at": now, "product": product}
+                missing.pop(key_of(product_id), None)
+                found[product_id] = product
+            for product_id in not_found:
+                products.pop(key_of(product_id), None)
+                missing[key_of(product_id)] = now
+            for product_id in failed:
+                # offline: fall back to an expired entry
+                entry = products.get(key_of(product_id))
+                if entry is not None:
+                    found[product_id] = entry["product"]
+
+        if changed:
+            self.save(state)
+
+        return found
+
+    def stats(self):
+        """
+        Returns: dictionary of lookup counters
+
+        Expected Output Format:
+        {'hits': 180, 'negative_hits': 3, 'fetched': 12, 'failed': 0}
+        """
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "fetched": self.fetched,
+            "failed": self.failed
+        }
@@ -0,0 +1,266 @@
+"""
+    Concurrent, paginated client for the DummyJSON product catalog
+
+    fetch_catalog() reads the first page to learn the catalog's `total`, then
+    fetches the remaining skip/limit pages concurrently over one pooled
+    keep-alive requests.Session (bounded by max_concurrency). Only the fields
+    the pipeline uses are requested (`select`), and pages are reassembled in
+    catalog order.
+
+    base_url is a parameter so the client can be pointed at a local stub
+    server (any server answering GET /products?limit=&skip=&select= with
+    {"products": [...], "total": N, "skip": S, "limit": L}).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE_URL = "https://dummyjson.com"
+PAGE_SIZE = 100
+MAX_CONCURRENCY = 8
+TIMEOUT = 10
+RETRIES = 2
+
+# fields used by create_product_mapping / generate_sales_report
+PRODUCT_FIELDS = ["id", "title", "category", "brand", "price", "rating"]
+
+
+def make_session(pool_size=MAX_CONCURRENCY, retries=RETRIES):
+    """
+    Returns a requests.Session with a keep-alive connection pool
+
+    Idempotent GETs are retried on connection errors and 429/5xx answers
+    with a short backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",)
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _select(fields):
+    # 'id' is always returned by the API
+    return ",".join(field for field in fields if field != "id")
+
+
+def fetch_page(session, skip, limit, base_url=API_BASE_URL, fields=PRODUCT_FIELDS,
+               timeout=TIMEOUT, validators=None):
+    """
+    Fetches one page of the catalog
+
+    Parameters:
+    - validators: {'etag': ..., 'last_modified': ...} of a cached copy; the
+      request is then conditional (If-None-Match / If-Modified-Since)
+
+    Returns: tuple (body, validators)
+    - body: decoded JSON {'products': [...], 'total': ..., ...}, or None
+      when the server answered 304 Not Modified
+    - validators: the response's ETag / Last-Modified
+    Raises requests.exceptions.RequestException on failure
+    """
+    params = {"limit": limit, "skip": skip}
+    if fields:
+        params["select"] = _select(fields)
+
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = session.get(
+        f"{base_url.rstrip('/')}/products",
+        params=params,
+        headers=headers,
+        timeout=timeout
+    )
+    returned = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified")
+    }
+    if response.status_code == 304:
+        return None, validators
+    # Raise an exception for HTTP errors (4xx or 5xx)
+    response.raise_for_status()
+    return response.json(), returned
+
+
+def _normalize(product, fields):
+    return {field: product.get(field) for field in fields}
+
+
+def fetch_product(session, product_id, base_url=API_BASE_URL, fields=PRODUCT_FIELDS, timeout=TIMEOUT):
+    """
+    Fetches one product by id (GET /products/{id})
+
+    Returns: product dictionary restricted to `fields`, or None when the
+    product does not exist (404)
+    Raises requests.exceptions.RequestException on other failures
+    """
+    params = {"select": _select(fields)} if fields else {}
+    response = session.get(
+        f"{base_url.rstrip('/')}/products/{product_id}",
+        params=params,
+        timeout=timeout
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return _normalize(response.json(), fields)
+
+
+def fetch_products(product_ids, base_url=API_BASE_URL, max_concurrency=MAX_CONCURRENCY,
+                   fields=PRODUCT_FIELDS, session=None, timeout=TIMEOUT):
+    """
+    Fetches several products by id concurrently
+
+    Returns: tuple (found, missing, failed)
+    - found: {id: product dictionary}
+    - missing: ids the API does not know (404)
+    - failed: ids whose request failed (network / server error)
+    """
+    own_session = session is None
+    if own_session:
+        session = make_session(max_concurrency)
+
+    def lookup(product_id):
+        try:
+            return product_id, fetch_product(session, product_id, base_url, fields, timeout), None
+        except requests.exceptions.RequestException as e:
+            return product_id, None, e
+
+    found, missing, failed = {}, set(), set()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            for product_id, product, error in pool.map(lookup, product_ids):
+                if error is not None:
+                    failed.add(product_id)
+                elif product is None:
+                    missing.add(product_id)
+                else:
+                    found[product_id] = product
+    finally:
+        if own_session:
+            session.close()
+
+    return found, missing, failed
+
+
+def fetch_catalog_pages(base_url=API_BASE_URL, page_size=PAGE_SIZE, max_concurrency=MAX_CONCURRENCY,
+                        fields=PRODUCT_FIELDS, max_products=None, session=None, timeout=TIMEOUT,
+                        previous=None):
+    """
+    Fetches the catalog page by page, keeping every page's validators
+
+    Parameters:
+    - previous: an earlier result of this function; its pages are
+      revalidated with conditional requests and reused when unchanged
+
+    Returns: dictionary
+    {
+        'total': 194,
+        'pages': [{'skip': 0, 'limit': 100, 'etag': ..., 'last_modified': ...,
+                   'products': [...]}, ...],
+        'not_modified': 2       # pages confirmed unchanged (304)
+    }
+    Raises requests.exceptions.RequestException when any page fails or the
+    pages do not add up to `total`
+
+    Requirements:
+    - First page tells the catalog `total` and the page size the server
+      actually serves (its reported `limit`, which may be lower than
+      page_size); the remaining pages advance by that size
+    - Remaining pages are fetched concurrently, at most max_concurrency
+      requests in flight, over one pooled session
+    - Products are restricted to `fields`; pages stay in catalog order
+    """
+    cached = {
+        (page["skip"], page["limit"]): page
+        for page in (previous or {}).get("pages", [])
+    }
+
+    own_session = session is None
+    if own_session:
+        session = make_session(max_concurrency)
+
+    def page(skip, limit):
+        old = cached.get((skip, limit))
+        body, validators = fetch_page(session, skip, limit, base_url, fields, timeout, old)
+        if body is None:
+            return dict(old, not_modified=True), None
+        return {
+            "skip": skip,
+            "limit": limit,
+            "etag": validators["etag"],
+            "last_modified": validators["last_modified"],
+            "products": [_normalize(product, fields) for product in body.get("products", [])]
+        }, body
+
+    try:
+        first_limit = page_size if max_products is None else min(page_size, max_products)
+        first, body = page(0, first_limit)
+        fetched = len(first["products"])
+        if body is None:
+            total = previous["total"]   # first page unchanged, so is its total
+            step = fetched
+        else:
+            total = body.get("total", fetched)
+            if max_products is not None:
+                total = min(total, max_products)
+            # servers may cap `limit`; step by what is actually served
+            step = min(page_size, body.get("limit") or fetched)
+
+        pages = [first]
+        skips = range(fetched, total, step) if fetched and step > 0 else range(0)
+        if skips:
+            with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+                # map() keeps the pages in skip order
+                for result, _ in pool.map(lambda skip: page(skip, min(step, total - skip)), skips):
+                    pages.append(result)
+
+        received = sum(len(result["products"]) for result in pages)
+        if received < total:
+            raise requests.exceptions.RequestException(
+                f"Incomplete catalog: received {received} of {total} products"
+            )
+
+        not_modified = sum(1 for result in pages if result.pop("not_modified", False))
+        return {"total": total, "pages": pages, "not_modified": not_modified}
+
+    finally:
+        if own_session:
+            session.close()
+
+
+def fetch_catalog(base_url=API_BASE_URL, page_size=PAGE_SIZE, max_concurrency=MAX_CONCURRENCY,
+                  fields=PRODUCT_FIELDS, max_products=None, session=None, timeout=TIMEOUT):
+    """
+    Fetches the whole product catalog (or its first max_products entries)
+
+    Returns: list of product dictionaries restricted to `fields`, in
+    catalog order
+    Raises requests.exceptions.RequestException when any page fails
+    """
+    catalog = fetch_catalog_pages(base_url, page_size, max_concurrency, fields,
+                                  max_products, session, timeout)
+    return catalog_products(catalog)
+
+
+def catalog_products(catalog):
+    """
+    Flattens a fetch_catalog_pages() result into its list of products
+    """
+    products = [product for page in catalog["pages"] for product in page["products"]]
+    return products[:catalog["total"]]
@@ -0,0 +1,326 @@
+"""
+    Multi-dimensional group-by / rollup cube over the sales transactions
+
+    SalesCube makes one pass over the transactions and fills a set of
+    cuboids (groupings over subsets of its dimensions, down to the grand
+    total). A group-by and its subtotals are answered from the smallest
+    cuboid that covers the requested dimensions:
+
+        cube = SalesCube(transactions, cuboids=ALL_CUBOIDS)
+        cube.query(("Region", "Month", "ProductName"))
+        cube.query(("ProductName",), where={"Region": "North"})
+        cube.rollup(("Region", "Month"))        # with subtotal rows
+
+    By default only VIEW_CUBOIDS are built: the ones read by the view
+    methods. All 2**4 cuboids would include Region x Date x ProductName x
+    CustomerID, which has about one cell per row and costs more memory than
+    the rows it summarizes; build it (cuboids=ALL_CUBOIDS, or a list of
+    dimension tuples) only for drill-downs that need it.
+
+    Each cell holds [revenue, quantity, transaction_count], revenue as an
+    ExactSum like the AggregationEngine accumulators, so every total is
+    bit-for-bit equal to the engine's, and the cube exposes the same view
+    methods (region_wise_sales, customer_analysis, ...) so the data_processor
+    functions accept it directly.
+
+    Week and Month are derived from the Date dimension at query time by
+    rolling up the per-day cells.
+"""
+
+import heapq
+from itertools import combinations
+
+import utils.data_processor
+import utils.dates
+from utils.summation import ExactSum
+
+DIMENSIONS = ("Region", "Date", "ProductName", "CustomerID")
+DATE_GRAINS = ("Week", "Month")     # rolled up from Date
+TOTAL = None                        # subtotal marker in rollup() keys
+
+# cuboids read by the view methods (region_wise_sales, customer_analysis, ...)
+VIEW_CUBOIDS = (
+    (), ("Region",), ("Date",), ("ProductName",), ("CustomerID",),
+    ("Date", "CustomerID"), ("ProductName", "CustomerID")
+)
+ALL_CUBOIDS = "all"                 # every subset of the dimensions
+
+
+class SalesCube:
+    """
+    Precomputed rollup cube with subtotals
+
+    Parameters:
+    - transactions: iterable of transaction dicts / Transaction rows
+    - dimensions: subset of DIMENSIONS to group by
+    - cuboids: dimension tuples to materialize (those using a dimension
+      the cube does not have are skipped; the grand total is always
+      kept), or ALL_CUBOIDS for all 2**len(dimensions). Every row updates
+      each cuboid once.
+    """
+
+    def __init__(self, transactions=(), dimensions=DIMENSIONS, cuboids=VIEW_CUBOIDS):
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown cube dimension: {dimension}")
+
+        self.dimensions = tuple(dimensions)
+        self.valid_count = 0
+        self.invalid_count = 0
+
+        if cuboids == ALL_CUBOIDS:
+            layout = [
+                positions
+                for size in range(len(self.dimensions) + 1)
+                for positions in combinations(range(len(self.dimensions)), size)
+            ]
+        else:
+            wanted = {()}
+            for names in cuboids:
+                for name in names:
+                    if name not in DIMENSIONS:
+                        raise ValueError(f"Unknown cube dimension: {name}")
+                if all(name in self.dimensions for name in names):
+                    wanted.add(tuple(sorted(self.dimensions.index(name) for name in names)))
+            layout = sorted(wanted, key=lambda positions: (len(positions), positions))
+
+        # positions (ascending) -> {key tuple: [ExactSum revenue, quantity, count]}
+        self.cuboids = {positions: {} for positions in layout}
+        self._layout = list(self.cuboids.items())
+
+        for txn in transactions:
+            self.add(txn)
+
+    # -----------------------------
+    # AGGREGATION PHASE
+    # -----------------------------
+    def add(self, txn):
+        """
+        Validates one transaction and adds it to every cuboid
+        """
+        if not utils.data_processor._is_valid(txn):
+            self.invalid_count += 1
+            return
+
+        quantity = txn["Quantity"]
+        revenue = quantity * txn["UnitPrice"]
+        values = [txn[dimension] for dimension in self.dimensions]
+        self.valid_count += 1
+
+        # whole amounts go straight into ExactSum's integer part
+        whole = type(revenue) is int or revenue.is_integer()
+        if whole:
+            revenue = int(revenue)
+
+        for positions, cells in self._layout:
+            key = tuple([values[i] for i in positions])
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = [ExactSum(), 0, 0]
+            if whole:
+                cell[0].integer += revenue
+            else:
+                cell[0].add(revenue)
+            cell[1] += quantity
+            cell[2] += 1
+
+    @property
+    def total_revenue(self):
+        apex = self.cuboids[()].get(())
+        return apex[0].value() if apex else 0.0
+
+    # -----------------------------
+    # QUERIES
+    # -----------------------------
+    def _source(self, by, where):
+        # Smallest cuboid holding every requested dimension (Week/Month
+        # are read from Date) and a projection from its keys to `by`
+        wanted = set(by) | set(where or ())
+        base = {"Date" if name in DATE_GRAINS else name for name in wanted}
+        for name in base:
+            if name not in self.dimensions:
+                raise ValueError(f"Cube has no '{name}' dimension")
+
+        positions = tuple(i for i, name in enumerate(self.dimensions) if name in base)
+        if positions not in self.cuboids:
+            covering = [other for other in self.cuboids if set(positions) <= set(other)]
+            if not covering:
+                raise ValueError(
+                    f"Cube has no cuboid covering {sorted(base)}; build it with cuboids=ALL_CUBOIDS"
+                )
+            positions = min(covering, key=lambda other: len(self.cuboids[other]))
+        slot = {self.dimensions[i]: n for n, i in enumerate(positions)}
+        periods = {}
+
+        def value(key, name):
+            if name not in DATE_GRAINS:
+                return key[slot[name]]
+            txn_date = key[slot["Date"]]
+            period = periods.get((name, txn_date))
+            if period is None:
+                period = periods[(name, txn_date)] = utils.data_processor._period_key(
+                    txn_date, name.lower()
+                )
+            return period
+
+        return self.cuboids[positions], value
+
+    def query(self, by=(), where=None):
+        """
+        Group-by over the cube
+
+        Parameters:
+        - by: dimensions to group on, any of Region, Date, Week, Month,
+          ProductName, CustomerID (Date is at day grain)
+        - where: optional {dimension: value} filter, e.g. {"Region": "North"}
+
+        Returns: dictionary keyed by value tuples in the order of `by`
+
+        Expected Output Format:
+        {
+            ('North', '2024-12', 'Laptop'): {
+                'revenue': 180000.0,
+                'quantity': 4,
+                'transaction_count': 3
+            },
+            ...
+        }
+        """
+        cells, value = self._source(by, where)
+        groups = {}
+        for key, (revenue, quantity, count) in cells.items():
+            if where and any(value(key, name) != wanted for name, wanted in where.items()):
+                continue
+            group = tuple(value(key, name) for name in by)
+            acc = groups.get(group)
+            if acc is None:
+                acc = groups[group] = [ExactSum(), 0, 0]
+            acc[0].merge(revenue)
+            acc[1] += quantity
+            acc[2] += count
+        return {
+            group: {
+                "revenue": revenue.value(),
+                "quantity": quantity,
+                "transaction_count": count
+            }
+            for group, (revenue, quantity, count) in groups.items()
+        }
+
+    def rollup(self, by, where=None):
+        """
+        Group-by with subtotals, like SQL GROUP BY ROLLUP(by)
+
+        Returns: dictionary from query(by) plus one subtotal row for every
+        prefix of `by`; rolled-up positions hold TOTAL (None)
+
+        Expected Output Format:
+        {
+            ('North', '2024-12'): {...},
+            ('North', None): {...},     # North, all months
+            (None, None): {...},        # grand total
+            ...
+        }
+        """
+        result = {}
+        for size in range(len(by), -1, -1):
+            padding = (TOTAL,) * (len(by) - size)
+            for group, measures in self.query(by[:size], where).items():
+                result[group + padding] = measures
+        return result
+
+    # -----------------------------
+    # VIEWS (same shapes as AggregationEngine)
+    # -----------------------------
+    def region_wise_sales(self):
+        return utils.data_processor._region_summary(
+            ((region, revenue.value(), count) for (region,), (revenue, _, count) in self._cells("Region").items()),
+            self.total_revenue
+        )
+
+    def _cells(self, name):
+        # One-dimensional cuboid, filled in row order like the engine's dicts
+        if name not in self.dimensions:
+            raise ValueError(f"Cube has no '{name}' dimension")
+        cells = self.cuboids.get((self.dimensions.index(name),))
+        if cells is None:
+            raise ValueError(f"Cube has no '{name}' cuboid; build it with VIEW_CUBOIDS")
+        return cells
+
+    def _product_totals(self):
+        return [
+            (product, quantity, revenue.value())
+            for (product,), (revenue, quantity, _) in self._cells("ProductName").items()
+        ]
+
+    def top_selling_products(self, n=5):
+        products = heapq.nlargest(n, self._product_totals(), key=lambda item: item[1])
+        return [
+            (product, quantity, round(revenue, 2))
+            for product, quantity, revenue in products
+        ]
+
+    def low_performing_products(self, threshold=10):
+        low_products = [
+            (product, quantity, round(revenue, 2))
+            for product, quantity, revenue in self._product_totals()
+            if quantity < threshold
+        ]
+        low_products.sort(key=lambda item: item[1])
+        return low_products
+
+    def customer_analysis(self):
+        bought = {}
+        for (customer, product), _ in self.query(("CustomerID", "ProductName")).items():
+            bought.setdefault(customer, []).append(product)
+
+        customer_summary = {}
+        for (customer,), (spent, _, purchase_count) in self._cells("CustomerID").items():
+            total_spent = spent.value()
+            customer_summary[customer] = {
+                "total_spent": total_spent,
+                "purchase_count": purchase_count,
+                "products_bought": sorted(bought[customer]),
+                "avg_order_value": round(total_spent / purchase_count, 2)
+            }
+
+        return dict(
+            sorted(
+                customer_summary.items(),
+                key=lambda item: item[1]["total_spent"],
+                reverse=True
+            )
+        )
+
+    def daily_sales_trend(self):
+        unique_customers = {}
+        for (txn_date, _) in self.query(("Date", "CustomerID")):
+            unique_customers[txn_date] = unique_customers.get(txn_date, 0) + 1
+
+        return {
+            txn_date: {
+                "revenue": revenue.value(),
+                "transaction_count": count,
+                "unique_customers": unique_customers[txn_date]
+            }
+            for (txn_date,), (revenue, _, count) in sorted(self._cells("Date").items())
+        }
+
+    def unique_customers_rollup(self, period="week"):
+        customers = {}
+        for (txn_date, customer) in sorted(self.query(("Date", "CustomerID"))):
+            customers.setdefault(utils.data_processor._period_key(txn_date, period), set()).add(customer)
+        return {key: len(members) for key, members in customers.items()}
+
+    def sales_rollup(self, period="day"):
+        return utils.dates.rollup_daily(
+            ((txn_date, revenue.value(), count) for (txn_date,), (revenue, _, count) in self._cells("Date").items()),
+            period
+        )
+
+    def find_peak_sales_day(self):
+        peak_date, revenue, count = max(
+            ((txn_date, revenue.value(), count) for (txn_date,), (revenue, _, count) in self._cells("Date").items()),
+            key=lambda item: item[1]
+        )
+        return (peak_date, round(revenue, 2), count)
@@ -1,37 +1,387 @@
 
 #import utils.file_handler
 import json
-
-def filterValidTransactions(transactions):
-    invalid_count = 0
-    required_fields = {
+import heapq
+import utils.cube
+import utils.dates
+import utils.vectorized
+from utils.sketches import HyperLogLog, SpaceSaving
+from utils.summation import ExactSum
+
+REQUIRED_FIELDS = {
     "TransactionID", "Date", "ProductID", "ProductName",
     "Quantity", "UnitPrice", "CustomerID", "Region"
-    }
+}
+
+# Distinct-customer counting modes
+DISTINCT_EXACT = "exact"
+DISTINCT_HLL = "hll"
+HLL_PRECISION = 12          # 4 KB per sketch, ~1.6% standard error
+
+
+def _is_valid(txn):
+    # Required fields present + validation rules
+    if not REQUIRED_FIELDS.issubset(txn.keys()):
+        return False
+    return not (
+        txn["Quantity"] <= 0 or
+        txn["UnitPrice"] <= 0 or
+        not txn["TransactionID"].startswith("T") or
+        not txn["ProductID"].startswith("P") or
+        not txn["CustomerID"].startswith("C")
+    )
+
+
+def _region_summary(region_totals, total_revenue):
+    # (region, total_sales, count) rows -> region_wise_sales dictionary;
+    # every region present in the data is reported
+    region_summary = {}
+    for region, total_sales, count in region_totals:
+        percentage = 100 * total_sales / total_revenue if total_revenue else 0.0
+        region_summary[region] = {
+            "total_sales": float(total_sales),
+            "transaction_count": int(count),
+            "percentage": round(percentage, 2)
+        }
 
+    return dict(
+        sorted(
+            region_summary.items(),
+            key=lambda item: item[1]["total_sales"],
+            reverse=True
+        )
+    )
+
+
+def filterValidTransactions(transactions):
     valid_transactions = []
-    invalid_count = 0
 
     for txn in transactions:
-        # Check required fields
-        if not required_fields.issubset(txn.keys()):
-            invalid_count += 1
-            continue
+        # If all checks pass → valid record
+        if _is_valid(txn):
+            valid_transactions.append(txn)
+    return valid_transactions
+
+
+class AggregationEngine:
+    """
+    Single-pass aggregation behind the data_processor analytics functions
+
+    One scan over the transactions validates every row once and fills the
+    per-region, per-product, per-customer and per-date accumulators. All
+    analytics functions are then answered from this shared state:
+
+        engine = AggregationEngine(transactions)
+        engine.region_wise_sales()
+        engine.top_selling_products(n=5)
+        engine.customer_analysis()
+        engine.daily_sales_trend()
+        engine.find_peak_sales_day()
+        engine.low_performing_products(threshold=10)
+
+    The module-level functions accept either transactions or an engine, so
+    region_wise_sales(engine) etc. reuse the same pass.
+
+    The per-region, per-product, per-customer and per-date accumulators are
+    the cube's VIEW_CUBOIDS (utils.cube) kept as plain dictionaries, so the
+    functions are views over those groupings. They are built here rather
+    than through a SalesCube because one dictionary update per accumulator
+    is cheaper than the cube's generic tuple-keyed cells; a SalesCube passed
+    in is answered from its own cuboids.
+
+    distinct="hll" keeps a HyperLogLog sketch (2**precision bytes) per date
+    instead of an exact set of CustomerIDs, so unique_customers becomes an
+    estimate but memory no longer grows with the number of customers.
+
+    Revenue is accumulated exactly (utils.summation.ExactSum), so totals are
+    the correctly rounded sums whatever the row order, and engines built over
+    separate partitions merge to the same results (merge()).
+    """
+
+    def __init__(self, transactions=(), distinct=DISTINCT_EXACT, precision=HLL_PRECISION):
+        if distinct not in (DISTINCT_EXACT, DISTINCT_HLL):
+            raise ValueError(f"distinct must be '{DISTINCT_EXACT}' or '{DISTINCT_HLL}'")
+        if distinct == DISTINCT_HLL:
+            HyperLogLog.validate_precision(precision)
+        self.distinct = distinct
+        self.precision = precision
+        self.revenue_sum = ExactSum()
+        self.valid_count = 0
+        self.invalid_count = 0
+        # revenue accumulators are ExactSum objects
+        self.regions = {}       # region  -> [total_sales, transaction_count]
+        self.products = {}      # product -> [total_quantity, total_revenue]
+        self.customers = {}     # customer -> [total_spent, purchase_count, {products}]
+        self.dates = {}         # date -> [revenue, transaction_count, customers]
+
+        for txn in transactions:
+            self.add(txn)
+
+    # -----------------------------
+    # AGGREGATION PHASE
+    # -----------------------------
+    def add(self, txn):
+        """
+        Validates one transaction and adds it to every accumulator
+        """
+        if not _is_valid(txn):
+            self.invalid_count += 1
+            return
+
+        quantity = txn["Quantity"]
+        revenue = quantity * txn["UnitPrice"]
+        product = txn["ProductName"]
+        customer = txn["CustomerID"]
+
+        self.valid_count += 1
+
+        region = self.regions.get(txn["Region"])
+        if region is None:
+            region = self.regions[txn["Region"]] = [ExactSum(), 0]
+        region[1] += 1
+
+        product_acc = self.products.get(product)
+        if product_acc is None:
+            product_acc = self.products[product] = [0, ExactSum()]
+        product_acc[0] += quantity
+
+        customer_acc = self.customers.get(customer)
+        if customer_acc is None:
+            customer_acc = self.customers[customer] = [ExactSum(), 0, self._new_product_set()]
+        customer_acc[1] += 1
+        customer_acc[2].add(product)
+
+        date_acc = self.dates.get(txn["Date"])
+        if date_acc is None:
+            date_acc = self.dates[txn["Date"]] = [ExactSum(), 0, self._new_customer_set()]
+        date_acc[1] += 1
+        date_acc[2].add(customer)
+
+        if type(revenue) is int or revenue.is_integer():
+            # whole amounts (the usual case): ExactSum's integer part directly
+            revenue = int(revenue)
+            self.revenue_sum.integer += revenue
+            region[0].integer += revenue
+            product_acc[1].integer += revenue
+            customer_acc[0].integer += revenue
+            date_acc[0].integer += revenue
+        else:
+            for acc in (self.revenue_sum, region[0], product_acc[1], customer_acc[0], date_acc[0]):
+                acc.add(revenue)
+
+    def merge(self, other):
+        """
+        Folds an engine built over a later partition into this one (keys
+        keep first-seen order); the result equals one engine over all rows
+        """
+        self.valid_count += other.valid_count
+        self.invalid_count += other.invalid_count
+        self.revenue_sum.merge(other.revenue_sum)
+
+        for region, (revenue, count) in other.regions.items():
+            acc = self.regions.get(region)
+            if acc is None:
+                self.regions[region] = [revenue.copy(), count]
+                continue
+            acc[0].merge(revenue)
+            acc[1] += count
+
+        for product, (quantity, revenue) in other.products.items():
+            acc = self.products.get(product)
+            if acc is None:
+                self.products[product] = [quantity, revenue.copy()]
+                continue
+            acc[0] += quantity
+            acc[1].merge(revenue)
+
+        for customer, (spent, count, products) in other.customers.items():
+            acc = self.customers.get(customer)
+            if acc is None:
+                acc = self.customers[customer] = [spent.copy(), count, self._new_product_set()]
+                acc[2].update(products)
+                continue
+            acc[0].merge(spent)
+            acc[1] += count
+            acc[2].update(products)
+
+        for txn_date, (revenue, count, customers) in other.dates.items():
+            acc = self.dates.get(txn_date)
+            if acc is None:
+                acc = self.dates[txn_date] = [revenue.copy(), count, self._new_customer_set()]
+                acc[2].update(customers)
+                continue
+            acc[0].merge(revenue)
+            acc[1] += count
+            acc[2].update(customers)
+
+        return self
+
+    @property
+    def total_revenue(self):
+        return self.revenue_sum.value()
+
+    def _new_customer_set(self):
+        # exact set or HyperLogLog; both support add() and len()
+        if self.distinct == DISTINCT_HLL:
+            return HyperLogLog(self.precision)
+        return set()
+
+    def _new_product_set(self):
+        # distinct products of one customer
+        return set()
+
+    # -----------------------------
+    # VIEWS (same shapes as the module functions)
+    # -----------------------------
+    def region_wise_sales(self):
+        return _region_summary(
+            ((region, total_sales.value(), count) for region, (total_sales, count) in self.regions.items()),
+            self.total_revenue
+        )
+
+    def top_selling_products(self, n=5):
+        # heap-based top n, no full sort of every product
+        top_products = heapq.nlargest(
+            n,
+            self.products.items(),
+            key=lambda item: item[1][0]
+        )
+        return [
+            (product, quantity, round(revenue.value(), 2))
+            for product, (quantity, revenue) in top_products
+        ]
+
+    def customer_analysis(self):
+        customer_summary = {}
+        for customer_id, (spent, purchase_count, products) in self.customers.items():
+            total_spent = spent.value()
+            customer_summary[customer_id] = {
+                "total_spent": total_spent,
+                "purchase_count": purchase_count,
+                "products_bought": sorted(products),
+                "avg_order_value": round(total_spent / purchase_count, 2)
+            }
+        return dict(
+            sorted(
+                customer_summary.items(),
+                key=lambda item: item[1]["total_spent"],
+                reverse=True
+            )
+        )
+
+    def daily_sales_trend(self):
+        return {
+            txn_date: {
+                "revenue": revenue.value(),
+                "transaction_count": count,
+                "unique_customers": len(customers)
+            }
+            for txn_date, (revenue, count, customers) in sorted(self.dates.items())
+        }
 
-        # Apply validation rules
-        if (
-            txn["Quantity"] <= 0 or
-            txn["UnitPrice"] <= 0 or
-            not txn["TransactionID"].startswith("T") or
-            not txn["ProductID"].startswith("P") or
-            not txn["CustomerID"].startswith("C")
-        ):
-            invalid_count += 1
+    def unique_customers_rollup(self, period="week"):
+        # Union the per-date customer sets / sketches into week or month buckets
+        buckets = {}
+        for txn_date, (_, _, customers) in sorted(self.dates.items()):
+            key = _period_key(txn_date, period)
+            if key not in buckets:
+                buckets[key] = self._new_customer_set()
+            buckets[key].update(customers)
+        return {key: len(customers) for key, customers in buckets.items()}
+
+    def sales_rollup(self, period="day"):
+        return utils.dates.rollup_daily(
+            ((txn_date, revenue.value(), count) for txn_date, (revenue, count, _) in self.dates.items()),
+            period
+        )
+
+    def find_peak_sales_day(self):
+        peak_date, revenue, count = max(
+            ((txn_date, revenue.value(), count) for txn_date, (revenue, count, _) in self.dates.items()),
+            key=lambda item: item[1]
+        )
+        return (peak_date, round(revenue, 2), count)
+
+    def low_performing_products(self, threshold=10):
+        low_products = [
+            (product, quantity, round(revenue.value(), 2))
+            for product, (quantity, revenue) in self.products.items()
+            if quantity < threshold
+        ]
+        low_products.sort(key=lambda item: item[1])
+        return low_products
+
+
+def _engine(transactions, distinct=None, precision=None):
+    # Reuse an existing engine or cube, use the NumPy backend for columnar
+    # input, otherwise make one pass over the transactions. distinct /
+    # precision of None mean "as the engine was built" (exact when building).
+    if isinstance(transactions, (AggregationEngine, utils.vectorized.VectorizedEngine,
+                                 utils.cube.SalesCube)):
+        _check_engine(transactions, distinct, precision)
+        return transactions
+    if distinct is None:
+        distinct = DISTINCT_EXACT
+    if precision is None:
+        precision = HLL_PRECISION
+    if distinct == DISTINCT_EXACT and utils.vectorized.supports(transactions):
+        return utils.vectorized.VectorizedEngine(transactions)
+    return AggregationEngine(transactions, distinct, precision)
+
+
+def _check_engine(engine, distinct, precision):
+    # An engine's distinct counting is fixed when it is built; asking for a
+    # different mode or sketch precision must not be silently ignored
+    built = getattr(engine, "distinct", DISTINCT_EXACT)     # vectorized / cube are exact
+    if distinct is not None and distinct != built:
+        raise ValueError(f"distinct='{distinct}' conflicts with an engine built with distinct='{built}'")
+    if precision is not None and built == DISTINCT_HLL and precision != engine.precision:
+        raise ValueError(
+            f"precision={precision} conflicts with an engine built with precision={engine.precision}"
+        )
+
+
+def _period_key(txn_date, period):
+    # 'YYYY-MM-DD' -> 'YYYY-Www' (ISO week) or 'YYYY-MM'
+    if period == "month":
+        return txn_date[:7]
+    if period == "week":
+        return utils.dates.period_label(utils.dates.date_ordinal(txn_date), period)
+    raise ValueError("period must be 'week' or 'month'")
+
+
+def heavy_hitters(transactions, field="CustomerID", measure="revenue", capacity=1000, sketch=None):
+    """
+    Streams valid transactions into a bounded-memory Space-Saving sketch
+
+    Parameters:
+    - field: grouping key, e.g. 'CustomerID' or 'ProductName'
+    - measure: 'revenue' (Quantity * UnitPrice), 'quantity' or 'count'
+    - capacity: number of counters kept (memory bound)
+    - sketch: existing sketch to keep updating (incremental mode)
+
+    Returns: SpaceSaving sketch; sketch.top(5) gives
+    [(key, estimate, error), ...] with estimate - error <= true value <= estimate
+
+    Sketches built over separate chunks or days can be combined with
+    sketch.merge(other).
+    """
+    if sketch is None:
+        sketch = SpaceSaving(capacity)
+
+    for txn in transactions:
+        if not _is_valid(txn):
             continue
+        if measure == "revenue":
+            weight = txn["Quantity"] * txn["UnitPrice"]
+        elif measure == "quantity":
+            weight = txn["Quantity"]
+        else:
+            weight = 1
+        sketch.add(txn[field], weight)
+
+    return sketch
 
-        # If all checks pass → valid record
-        valid_transactions.append(txn)
-    return valid_transactions
 
 def calculate_total_revenue(transactions):
     """
@@ -43,37 +393,7 @@ def calculate_total_revenue(transactions):
     Expected Output: Single number representing sum of (Quantity * UnitPrice)
     Example: 1545000.50
     """
-    invalid_count = 0
-    header_fields = {
-        "TransactionID", "Date", "ProductID", "ProductName", "Quantity", "UnitPrice", 
-        "CustomerID", "Region"
-    }
-    totRevenue = 0.00
-    for txn in a:
-        try:
-            # Required fields check
-            if not header_fields.issubset(txn.keys()):
-                invalid_count += 1
-                continue
-
-            # Field-level validation
-            if (
-                not txn["TransactionID"].startswith("T")
-                or not txn["ProductID"].startswith("P")
-                or not txn["CustomerID"].startswith("C")
-                or txn["Quantity"] <= 0
-                or txn["UnitPrice"] <= 0
-            ):
-                invalid_count += 1
-                continue
-
-            revenue = txn["Quantity"] * txn["UnitPrice"]
-            totRevenue = totRevenue + revenue
-        except Exception as e:
-            print(f"An error occurred: {e}")
-    
-    return totRevenue
-
+    return _engine(transactions).total_revenue
 
 
 def region_wise_sales(transactions):
@@ -98,113 +418,52 @@ def region_wise_sales(transactions):
     - Count transactions per region
     - Calculate percentage of total sales
     - Sort by total_sales in descending order
+    - Report every region found in the data
     """
-    #------------------------------
-    fNorthPercent = 0
-    fSouthPercent = 0
-    fEastPercent = 0
-    fWestPercent = 0
-    #------------------------------
-    iNorthRev = 0
-    iSouthRev = 0
-    iEastRev = 0
-    iWestRev = 0
-    #------------------------------
-    iNorthCount = 0
-    iSouthCount = 0
-    iEastCount = 0
-    iWestCount = 0
-    
-    invalid_count = 0
-    header_fields = {
-        "TransactionID", "Date", "ProductID", "ProductName", "Quantity", "UnitPrice", 
-        "CustomerID", "Region"
-    }
+    return _engine(transactions).region_wise_sales()
 
-    # North = 0
-    # South = 1
-    # East  = 2
-    # West  = 3
 
-    #header_return = {"Region", 'total_sales','transaction_count','percentage' }
+def group_by(transactions, by, where=None, subtotals=False):
+    """
+    Aggregates sales over any combination of dimensions
 
-    totRevenue = 0.00
-    for txn in a:
-        try:
-            # Required fields check
-            if not header_fields.issubset(txn.keys()):
-                invalid_count += 1
-                continue
+    Parameters:
+    - transactions: transactions or a prebuilt utils.cube.SalesCube
+    - by: tuple of Region, Date, Week, Month, ProductName, CustomerID
+    - where: optional {dimension: value} filter
+    - subtotals: also return the ROLLUP subtotal rows (None = all values)
 
-            # Field-level validation
-            if (
-                not txn["TransactionID"].startswith("T")
-                or not txn["ProductID"].startswith("P")
-                or not txn["CustomerID"].startswith("C")
-                or txn["Quantity"] <= 0
-                or txn["UnitPrice"] <= 0
-            ):
-                invalid_count += 1
-                continue
-            
-            revenue = txn["Quantity"] * txn["UnitPrice"]
-            totRevenue = totRevenue + revenue
-            
-            match txn["Region"]:
-                case "North":
-                    iNorthRev = iNorthRev + revenue
-                    iNorthCount += 1
-                case "South":
-                    iSouthRev = iSouthRev + revenue
-                    iSouthCount += 1
-                case "East" :
-                    iEastRev = iEastRev + revenue
-                    iEastCount += 1
-                case "West" :
-                    iWestRev = iWestRev + revenue
-                    iWestCount += 1
-        except Exception as e:
-            print(f"An error occurred: {e}")
-
-    fNorthPercent = 100 * iNorthRev / totRevenue
-    fSouthPercent = 100 * iSouthRev / totRevenue
-    fEastPercent = 100 * iEastRev / totRevenue
-    fWestPercent = 100 * iWestRev / totRevenue
-
-    region_summary = {
-        "North": {
-            "total_sales": float(iNorthRev),
-            "transaction_count": int(iNorthCount),
-            "percentage": round(fNorthPercent, 2)
-        },
-        "South": {
-            "total_sales": float(iSouthRev),
-            "transaction_count": int(iSouthCount),
-            "percentage": round(fSouthPercent, 2)
-        },
-        "East": {
-            "total_sales": float(iEastRev),
-            "transaction_count": int(iEastCount),
-            "percentage": round(fEastPercent, 2)
+    Returns: dictionary keyed by value tuples in the order of `by`
+
+    Expected Output Format:
+    {
+        ('North', '2024-12'): {
+            'revenue': 450000.0,
+            'quantity': 38,
+            'transaction_count': 15
         },
-        "West": {
-            "total_sales": float(iWestRev),
-            "transaction_count": int(iWestCount),
-            "percentage": round(fWestPercent, 2)
-        }
+        ...
     }
 
-    region_summary = dict(
-        sorted(
-            region_summary.items(),
-            key=lambda item: item[1]["total_sales"],
-            reverse=True
-        )
-    )
+    Drill-downs over the same data should build the cube once:
+        cube = SalesCube(transactions, cuboids=ALL_CUBOIDS)
+        group_by(cube, ("Region", "Month")), group_by(cube, ("Region", "Month", "ProductName"))
+
+    Without a cube, one cuboid over exactly the needed dimensions is built;
+    the subtotal rows are rolled up from it.
+    """
+    cube = transactions
+    if not isinstance(cube, utils.cube.SalesCube):
+        needed = {
+            "Date" if name in utils.cube.DATE_GRAINS else name
+            for name in (*by, *(where or ()))
+        }
+        dimensions = [name for name in utils.cube.DIMENSIONS if name in needed]
+        cube = utils.cube.SalesCube(transactions, dimensions, cuboids=[dimensions])
+    if subtotals:
+        return cube.rollup(tuple(by), where)
+    return cube.query(tuple(by), where)
 
-    return region_summary
-    
-        
 
 def top_selling_products(transactions, n=5):
     """
@@ -226,51 +485,7 @@ def top_selling_products(transactions, n=5):
     - Sort by TotalQuantity descending
     - Return top n products
     """
-    valid_transactions = filterValidTransactions(transactions)
-    #print (valid_transactions)
-    #================================================
-    product_summary = {}
-
-    # -----------------------------
-    # AGGREGATION PHASE
-    # -----------------------------
-    for txn in valid_transactions:
-        product = txn["ProductName"]
-        quantity = txn["Quantity"]
-        revenue = txn["Quantity"] * txn["UnitPrice"]
-
-        if product not in product_summary:
-            product_summary[product] = {
-                "total_quantity": 0,
-                "total_revenue": 0.0
-            }
-
-        product_summary[product]["total_quantity"] += quantity
-        product_summary[product]["total_revenue"] += revenue
-
-    # -----------------------------
-    # SORT BY TOTAL QUANTITY DESC
-    # -----------------------------
-    sorted_products = sorted(
-        product_summary.items(),
-        key=lambda item: item[1]["total_quantity"],
-        reverse=True
-    )
-
-    # -----------------------------
-    # BUILD FINAL OUTPUT (TOP N)
-    # -----------------------------
-    result = [
-        (
-            product,
-            data["total_quantity"],
-            round(data["total_revenue"], 2)
-        )
-        for product, data in sorted_products[:n]
-    ]
-
-    return result
-
+    return _engine(transactions).top_selling_products(n)
 
 
 def customer_analysis(transactions):
@@ -297,54 +512,10 @@ def customer_analysis(transactions):
     - List unique products bought
     - Sort by total_spent descending
     """
-    valid_transactions = filterValidTransactions(transactions)
-    #print (valid_transactions)
-
-    customer_summary = {}
-
-    # -----------------------------
-    # AGGREGATION PHASE
-    # -----------------------------
-    for txn in valid_transactions:
-        customer_id = txn["CustomerID"]
-        amount = txn["Quantity"] * txn["UnitPrice"]
-        product = txn["ProductName"]
-
-        if customer_id not in customer_summary:
-            customer_summary[customer_id] = {
-                "total_spent": 0.0,
-                "purchase_count": 0,
-                "products_bought": set()  # use set to keep products unique
-            }
-
-        customer_summary[customer_id]["total_spent"] += amount
-        customer_summary[customer_id]["purchase_count"] += 1
-        customer_summary[customer_id]["products_bought"].add(product)
-
-    # -----------------------------
-    # POST-PROCESSING
-    # -----------------------------
-    for customer_id, data in customer_summary.items():
-        data["avg_order_value"] = round(
-            data["total_spent"] / data["purchase_count"], 2
-        )
-        data["products_bought"] = sorted(list(data["products_bought"]))
+    return _engine(transactions).customer_analysis()
 
-    # -----------------------------
-    # SORT BY TOTAL_SPENT DESC
-    # -----------------------------
-    sorted_summary = dict(
-        sorted(
-            customer_summary.items(),
-            key=lambda item: item[1]["total_spent"],
-            reverse=True
-        )
-    )
 
-    return sorted_summary
-
-
-def daily_sales_trend(transactions):
+def daily_sales_trend(transactions, distinct=None, precision=None):
     """
     Analyzes sales trends by date
 
@@ -367,93 +538,68 @@ def daily_sales_trend(transactions):
     - Count daily transactions
     - Count unique customers per day
     - Sort chronologically
+
+    distinct="hll" estimates unique_customers with a HyperLogLog sketch of
+    the given precision (default HLL_PRECISION) per date instead of keeping
+    every CustomerID. Left as None they follow an engine passed in (exact
+    otherwise); values conflicting with that engine raise ValueError.
     """
-    valid_transactions = filterValidTransactions(transactions)
-    #print (valid_transactions)
+    return _engine(transactions, distinct, precision).daily_sales_trend()
 
-    date_summary = {}
 
-    # -----------------------------
-    # AGGREGATION PHASE
-    # -----------------------------
-    for txn in valid_transactions:
-        txnDate = txn["Date"]
-        amount = txn["Quantity"] * txn["UnitPrice"]
-        customer = txn["CustomerID"]
-        
+def unique_customers_rollup(transactions, period="week", distinct=None, precision=None):
+    """
+    Counts unique customers per ISO week or calendar month
 
-        if txnDate not in date_summary:
-            date_summary[txnDate] = {
-                "revenue": 0.0,
-                "transaction_count": 0,
-                "unique_customers": set()  # use set to keep products unique
-            }
+    Returns: dictionary sorted by period
 
-        date_summary[txnDate]["revenue"] += amount
-        date_summary[txnDate]["transaction_count"] += 1
-        date_summary[txnDate]["unique_customers"].add(customer)
+    Expected Output Format:
+    {'2024-W49': 21, '2024-W50': 18, ...}     # period="week"
+    {'2024-12': 30}                           # period="month"
 
-    # -----------------------------
-    # POST-PROCESSING
-    # -----------------------------
-    for txnDate, data in date_summary.items():
-        data["unique_customers"] = len(data["unique_customers"])
-    #print(date_summary)
-    # -----------------------------
-    # SORT BY DATE ASC
-    # -----------------------------
-    sorted_summary = dict(
-        sorted(
-            date_summary.items(),
-            key=lambda item: item[0]
-        )
-    )
+    The per-date customer sets (or HyperLogLog sketches with
+    distinct="hll") are unioned into the period buckets, the transactions
+    are not scanned again. Accepts transactions, an engine, a SalesCube or a
+    TransactionTable; distinct / precision follow daily_sales_trend().
+    """
+    return _engine(transactions, distinct, precision).unique_customers_rollup(period)
 
-    return sorted_summary
 
-def find_peak_sales_day(transactions):
+def sales_rollup(transactions, period="day"):
     """
-    Identifies the date with highest revenue
+    Revenue and transaction counts per day, ISO week or calendar month
 
-    Returns: tuple (date, revenue, transaction_count)
+    Returns: dictionary sorted by period
 
     Expected Output Format:
-    ('2024-12-15', 185000.0, 12)
-    """
-    valid_transactions = filterValidTransactions(transactions)
+    {
+        '2024-W49': {
+            'revenue': 1250000.0,
+            'transaction_count': 41
+        },
+        '2024-W50': {...},
+        ...
+    }
 
-    daily_summary = {}
-    # -----------------------------
-    # AGGREGATION PHASE
-    # -----------------------------
-    for txn in transactions:
-        txn_date = txn["Date"]
-        amount = txn["Quantity"] * txn["UnitPrice"]
+    Requirements:
+    - period is 'day' ('YYYY-MM-DD'), 'week' ('YYYY-Www') or 'month' ('YYYY-MM')
+    - Dates are parsed once per distinct value, not per transaction
+    - Accepts transactions, an engine, a SalesCube or a TransactionTable
+      (grouped with NumPy when available)
+    """
+    return _engine(transactions).sales_rollup(period)
 
-        if txn_date not in daily_summary:
-            daily_summary[txn_date] = {
-                "revenue": 0.0,
-                "transaction_count": 0
-            }
 
-        daily_summary[txn_date]["revenue"] += amount
-        daily_summary[txn_date]["transaction_count"] += 1
+def find_peak_sales_day(transactions):
+    """
+    Identifies the date with highest revenue
 
-    #print(daily_summary)
-    
-    # -----------------------------
-    # FIND PEAK SALES DAY
-    # -----------------------------
-    peak_date, peak_data = max(
-        daily_summary.items(),
-        key=lambda item: item[1]["revenue"]
-    )
+    Returns: tuple (date, revenue, transaction_count)
 
-    return (
-        peak_date,
-        round(peak_data["revenue"], 2),
-        peak_data["transaction_count"]
-    )
+    Expected Output Format:
+    ('2024-12-15', 185000.0, 12)
+    """
+    return _engine(transactions).find_peak_sales_day()
 
 
 def low_performing_products(transactions, threshold=10):
@@ -471,47 +617,8 @@ def low_performing_products(transactions, threshold=10):
     - Include total quantity and revenue
     - Sort by TotalQuantity ascending
     """
+    return _engine(transactions).low_performing_products(threshold)
 
-    valid_transactions = filterValidTransactions(transactions)
-    
-    product_summary = {}
-
-    # -----------------------------
-    # AGGREGATION PHASE
-    # -----------------------------
-    for txn in valid_transactions:
-        product = txn["ProductName"]
-        quantity = txn["Quantity"]
-        revenue = txn["Quantity"] * txn["UnitPrice"]
-
-        if product not in product_summary:
-            product_summary[product] = {
-                "total_quantity": 0,
-                "total_revenue": 0.0
-            }
-
-        product_summary[product]["total_quantity"] += quantity
-        product_summary[product]["total_revenue"] += revenue
-    
-    # -----------------------------
-    # FILTER LOW-PERFORMING PRODUCTS
-    # -----------------------------
-    low_products = [
-        (
-            product,
-            data["total_quantity"],
-            round(data["total_revenue"], 2)
-        )
-        for product, data in product_summary.items()
-        if data["total_quantity"] < threshold
-    ]
-
-    # -----------------------------
-    # SORT BY TOTAL QUANTITY ASC
-    # -----------------------------
-    low_products.sort(key=lambda item: item[1])
-
-    return low_products
 
 
 
@@ -0,0 +1,95 @@
+"""
+    Date parsing and time-bucket helpers for the 'YYYY-MM-DD' Date column
+
+    Dates are turned into integer day ordinals (date.toordinal()) once per
+    distinct value: sales dates repeat on thousands of rows, so the parse
+    cache makes the per-row cost a dictionary lookup instead of a strptime
+    call. Ordinals sort chronologically and make week / month bucketing
+    plain integer arithmetic.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+PERIODS = ("day", "week", "month")
+
+
+@lru_cache(maxsize=1 << 16)
+def date_ordinal(txn_date):
+    """
+    'YYYY-MM-DD' -> day ordinal, parsed once per distinct string
+
+    Raises ValueError for malformed dates, like datetime.strptime
+    """
+    return datetime.strptime(txn_date, "%Y-%m-%d").toordinal()
+
+
+def ordinal_column(dates):
+    """
+    Day ordinals for an iterable of date strings (one list entry per row)
+    """
+    return [date_ordinal(txn_date) for txn_date in dates]
+
+
+def date_range(dates):
+    """
+    Earliest and latest date of an iterable of date strings
+
+    Returns: tuple (datetime.date, datetime.date)
+    """
+    ordinals = [date_ordinal(txn_date) for txn_date in set(dates)]
+    return date.fromordinal(min(ordinals)), date.fromordinal(max(ordinals))
+
+
+def period_label(ordinal, period):
+    """
+    Day ordinal -> 'YYYY-MM-DD' (day), 'YYYY-Www' (ISO week) or 'YYYY-MM' (month)
+    """
+    day = date.fromordinal(ordinal)
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return f"{day.year:04d}-{day.month:02d}"
+    raise ValueError("period must be 'day', 'week' or 'month'")
+
+
+def rollup_daily(daily_totals, period="day"):
+    """
+    Sums per-date totals into day, week or month buckets
+
+    Parameters:
+    - daily_totals: iterable of (date string, revenue, transaction_count)
+    - period: 'day', 'week' or 'month'
+
+    Returns: dictionary sorted by period
+
+    Expected Output Format:
+    {
+        '2024-W49': {'revenue': 1250000.0, 'transaction_count': 41},
+        '2024-W50': {...},
+        ...
+    }
+
+    Days are added in chronological order, so every backend that produces
+    the same daily totals produces the same buckets.
+    """
+    if period not in PERIODS:
+        raise ValueError("period must be 'day', 'week' or 'month'")
+
+    days = sorted(
+        (date_ordinal(txn_date), revenue, count)
+        for txn_date, revenue, count in daily_totals
+    )
+
+    buckets = {}
+    for ordinal, revenue, count in days:
+        key = period_label(ordinal, period)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {"revenue": 0.0, "transaction_count": 0}
+        bucket["revenue"] += revenue
+        bucket["transaction_count"] += count
+    return buckets
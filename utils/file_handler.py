@@ -16,8 +16,249 @@
 
 import pandas as pd
 import json
+import bz2
+import codecs
+import fnmatch
+import glob
+import gzip
+import hashlib
+import lzma
+import mmap
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import utils.data_processor
+import utils.xlsx_reader
+from utils.filter_index import FilterIndex
+from utils.transaction_table import Transaction, TransactionTable, TRANSACTION_FIELDS
 from typing import Literal, Annotated
 
+ENCODINGS = ["utf-8", "latin-1", "cp1252"]
+SNIFF_SIZE = 64 * 1024        # bytes inspected to pick the encoding
+CHUNK_LINES = 10000           # lines handed out per chunk by iter_sales_data
+MIN_SHARD_BYTES = 1024 * 1024  # smallest byte range worth a worker process
+CHECKSUM_WINDOW = 64 * 1024    # prefix bytes checked by incremental reads
+INGEST_STATE_FILE = "output/ingest_state.json"
+READ_WORKERS = 4               # files read/decompressed concurrently
+PREFETCH_CHUNKS = 4            # chunks buffered ahead per file
+
+QUARANTINE_FILE = "output/quarantine.txt"
+WRITE_BUFFER = 1024 * 1024     # buffer size for streamed output files
+
+# Rejection reason codes used by the fused parse + validate pass
+REJECT_FIELD_COUNT = "FIELD_COUNT"
+REJECT_BAD_QUANTITY = "BAD_QUANTITY"
+REJECT_BAD_UNIT_PRICE = "BAD_UNIT_PRICE"
+REJECT_EMPTY_FIELD = "EMPTY_FIELD"
+REJECT_QUANTITY_NOT_POSITIVE = "QUANTITY_NOT_POSITIVE"
+REJECT_UNIT_PRICE_NOT_POSITIVE = "UNIT_PRICE_NOT_POSITIVE"
+REJECT_TRANSACTION_ID_PREFIX = "TRANSACTION_ID_PREFIX"
+REJECT_PRODUCT_ID_PREFIX = "PRODUCT_ID_PREFIX"
+REJECT_CUSTOMER_ID_PREFIX = "CUSTOMER_ID_PREFIX"
+
+COMPRESSED_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open
+}
+
+# files picked up when a directory is given as the sales source
+SALES_FILE_PATTERNS = ("*.txt", "*.txt.gz", "*.txt.bz2", "*.txt.xz")
+
+
+def _open_binary(filename):
+    # Open a sales file for binary reading, decompressing by extension
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(filename)[1].lower())
+    if opener:
+        return opener(filename, mode="rb")
+    return open(filename, mode="rb")
+
+
+def detect_encoding(filename, sample_size=SNIFF_SIZE):
+    """
+    Picks the encoding for a sales file by decoding a leading sample
+
+    Returns: first encoding from ENCODINGS that decodes the sample
+
+    The sample is decoded incrementally so a multi-byte character cut off
+    at the end of the sample does not count as a failure.
+    """
+    with _open_binary(filename) as file:
+        sample = file.read(sample_size)
+
+    for encoding in ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+
+    return ENCODINGS[-1]
+
+
+def _decode_line(raw_line, encoding):
+    # Decode one line, falling back line-by-line instead of re-reading the file
+    try:
+        return raw_line.decode(encoding)
+    except UnicodeDecodeError:
+        for fallback in ENCODINGS:
+            try:
+                return raw_line.decode(fallback)
+            except UnicodeDecodeError:
+                continue
+        return raw_line.decode(encoding, errors="replace")
+
+
+def iter_sales_data(filename, chunk_size=CHUNK_LINES):
+    """
+    Streams sales data from file in bounded chunks
+
+    Yields: lists of at most chunk_size cleaned raw lines (strings)
+
+    Expected Output Format:
+    ['T001|2024-12-01|P101|Laptop|2|45000|C001|North', ...]
+
+    Same cleaning as read_sales_data (header skipped, lines stripped, empty
+    lines removed), but memory stays bounded by chunk_size regardless of the
+    file size. The encoding is sniffed once from a leading sample; a line that
+    still fails to decode later in the file is decoded on its own with the
+    next supported encoding. .gz, .bz2 and .xz files are decompressed on the
+    fly, .xlsx workbooks are streamed through utils.xlsx_reader.
+    """
+    if filename.lower().endswith(".xlsx"):
+        yield from utils.xlsx_reader.iter_xlsx_sales_data(filename, chunk_size)
+        return
+
+    try:
+        encoding = detect_encoding(filename)
+        with _open_binary(filename) as file:
+            file.readline()     # skip header
+
+            chunk = []
+            for raw_line in file:
+                line = _decode_line(raw_line, encoding).strip()
+                if not line:    # remove empty lines
+                    continue
+
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return
+
+
+def _has_sales_header(filename):
+    # True when the file's first line is exactly the sales data header
+    # (enriched outputs add API_* columns, other files differ entirely)
+    try:
+        with _open_binary(filename) as file:
+            header = file.readline(4096)
+    except (OSError, EOFError, lzma.LZMAError):
+        return False
+    return header.decode("utf-8-sig", errors="replace").strip().split("|") == TRANSACTION_FIELDS
+
+
+def expand_sales_sources(source, patterns=SALES_FILE_PATTERNS):
+    """
+    Resolves a sales data source into an ordered list of file paths
+
+    Accepts a single path, a directory, a glob pattern ('data/*.txt.gz') or
+    a list/tuple of any of these.
+
+    A directory contributes the files matching `patterns` whose first line
+    is the sales header, sorted by name, so generated files next to the
+    input (enriched_sales_data.txt, workbooks, logs) are not read as sales
+    data. Paths and glob patterns are taken as given.
+    """
+    if isinstance(source, (list, tuple)):
+        return [path for item in source for path in expand_sales_sources(item, patterns)]
+
+    if os.path.isdir(source):
+        return sorted(
+            entry.path
+            for entry in os.scandir(source)
+            if entry.is_file()
+            and not entry.name.startswith(".")
+            and any(fnmatch.fnmatch(entry.name.lower(), pattern) for pattern in patterns)
+            and _has_sales_header(entry.path)
+        )
+
+    if glob.has_magic(source):
+        return sorted(glob.glob(source))
+
+    return [source]
+
+
+def _put_unless_stopped(chunks, item, stop):
+    # Blocking put that gives up once the consumer has stopped
+    # Returns: True when the item was queued
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_file_into_queue(filename, chunk_size, chunks, stop):
+    # Worker: stream one file's chunks into its bounded queue, then the end
+    # marker (None) or the exception; never blocks after the consumer stops
+    try:
+        for chunk in iter_sales_data(filename, chunk_size):
+            if not _put_unless_stopped(chunks, chunk, stop):
+                return
+    except Exception as e:
+        _put_unless_stopped(chunks, e, stop)
+        return
+    _put_unless_stopped(chunks, None, stop)
+
+
+def iter_sales_data_many(sources, workers=READ_WORKERS, chunk_size=CHUNK_LINES,
+                         prefetch_chunks=PREFETCH_CHUNKS):
+    """
+    Streams sales data from several (optionally compressed) files
+
+    Yields: lists of cleaned raw lines, like iter_sales_data, with every
+    file's header skipped. Files are yielded in expand_sales_sources order.
+
+    Up to `workers` files are read and decompressed concurrently in a thread
+    pool (zlib, bz2 and lzma release the GIL while decompressing). Each file
+    buffers at most prefetch_chunks chunks ahead of the consumer, so memory
+    stays bounded no matter how many files there are.
+    """
+    files = expand_sales_sources(sources)
+    if not files:
+        print(f"Error: No sales files found for '{sources}'.")
+        return
+
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=prefetch_chunks) for _ in files]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+        for filename, chunks in zip(files, queues):
+            pool.submit(_read_file_into_queue, filename, chunk_size, chunks, stop)
+
+        try:
+            for chunks in queues:
+                while True:
+                    chunk = chunks.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+        finally:
+            stop.set()
+
+
 def read_sales_data(filename):
     """
     Task 1.1 Read Sales Data with Encoding Handling
@@ -34,33 +275,25 @@ def read_sales_data(filename):
     - Handle FileNotFoundError with appropriate error message
     - Skip the header row
     - Remove empty lines
-    """
 
-    encodings = ["utf-8", "latin-1", "cp1252"]
+    filename may also be a directory, a glob pattern or a list of files,
+    including .gz/.bz2/.xz extracts; they are read concurrently and
+    concatenated in order (see iter_sales_data_many).
 
-    for encoding in encodings:
-        try:
-            with open(filename, mode="r", encoding=encoding) as file:
-                lines = file.readlines()
-                # Skip header and remove empty lines
-                data_lines = [
-                    line.strip()
-                    for line in lines[1:]     # skip header
-                    if line.strip()           # remove empty lines
-                ]
-
-                return data_lines
-
-        except UnicodeDecodeError:
-            # Try next encoding
-            continue
+    For large files prefer iter_sales_data(), which yields the same lines
+    in bounded chunks instead of building one list.
+    """
 
-        except FileNotFoundError:
-            print(f"Error: File '{filename}' not found.")
-            return []
+    if isinstance(filename, str) and expand_sales_sources(filename) == [filename]:
+        chunks = iter_sales_data(filename)
+    else:
+        chunks = iter_sales_data_many(filename)
 
-    print("Error: Unable to read file with supported encodings.")
-    return []
+    return [
+        line
+        for chunk in chunks
+        for line in chunk
+    ]
 
 #df = pd.DataFrame(lines)
 #record_count = df.shape[0]
@@ -68,7 +301,190 @@ def read_sales_data(filename):
 #df.to_csv('outputL.csv', index=False)
 
 
-def parse_transactions(raw_lines):
+def _window_checksum(file, start, end):
+    # Checksum of bytes [start, end) of an open binary file
+    file.seek(start)
+    return hashlib.blake2b(file.read(end - start), digest_size=16).hexdigest()
+
+
+def _prefix_checksums(file, offset):
+    # Head and tail windows of the already processed prefix [0, offset)
+    return {
+        "head": _window_checksum(file, 0, min(CHECKSUM_WINDOW, offset)),
+        "tail": _window_checksum(file, max(0, offset - CHECKSUM_WINDOW), offset)
+    }
+
+
+def _file_identity(file):
+    # Device and inode: a file replaced by a new one (rename, copy over,
+    # rotation) gets a new inode even when its size and windows match
+    stat = os.fstat(file.fileno())
+    return [stat.st_dev, stat.st_ino]
+
+
+def read_sales_data_incremental(filename, state_file=INGEST_STATE_FILE, commit=True):
+    """
+    Reads only the records appended to a sales file since the previous call
+
+    Returns: tuple (new_lines, full_reload)
+    - new_lines: raw lines (strings) not returned by an earlier call, cleaned
+      the same way as read_sales_data
+    - full_reload: True when the file was read from the start (first run,
+      truncated or rewritten file)
+
+    The read position of every file is kept in state_file (see
+    read_appended_records). Pass commit=False to read without advancing the
+    stored offset.
+    """
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            all_states = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        all_states = {}
+
+    key = os.path.abspath(filename)
+    new_lines, full_reload, state = read_appended_records(filename, all_states.get(key))
+    if state is None:
+        return [], True
+
+    if commit:
+        all_states[key] = state
+        os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+        with open(state_file, "w", encoding="utf-8") as f:
+            json.dump(all_states, f, indent=2)
+
+    return new_lines, full_reload
+
+
+def read_appended_records(filename, state=None):
+    """
+    Reads the records appended to a sales file after a saved read position
+
+    Parameters:
+    - state: read position returned by an earlier call for this file, or
+      None to read the whole file
+
+    Returns: tuple (new_lines, full_reload, new_state)
+    - new_lines: raw lines (strings), cleaned the same way as read_sales_data
+    - full_reload: True when the file was read from the start (no state,
+      truncated or rewritten file)
+    - new_state: JSON-serializable read position after new_lines, to be
+      passed to the next call once the lines have been processed; None when
+      the file does not exist
+
+    The state holds the byte offset after the last complete record, the
+    file's device / inode and checksums of the first and last
+    CHECKSUM_WINDOW bytes of the processed prefix. The file is only read
+    from that offset if it is the same inode, at least as long and both
+    windows still match; otherwise it is re-read in full. Each call thus
+    reads the new records plus two bounded windows, never the whole history.
+
+    Limitation: an in-place edit (same inode) that keeps the file length
+    and changes only bytes between the two windows is not detected, and
+    those rows are not re-read. Rewrites that replace the file, shorten it
+    or touch its first or last processed bytes are detected; writers that
+    correct old rows in place should replace the file instead.
+
+    A trailing line without a newline is left for the next call, as it may
+    still be written.
+    """
+    try:
+        with open(filename, mode="rb") as file:
+            size = os.fstat(file.fileno()).st_size
+
+            # -----------------------------
+            # RESUME OR FULL RE-READ?
+            # -----------------------------
+            identity = _file_identity(file)
+            full_reload = (
+                state is None
+                or state.get("identity") != identity
+                or size < state["offset"]
+                or _prefix_checksums(file, state["offset"]) != state["checksums"]
+            )
+            if full_reload:
+                encoding = detect_encoding(filename)
+                file.seek(0)
+                file.readline()     # skip header
+            else:
+                encoding = state["encoding"]
+                file.seek(state["offset"])
+
+            # -----------------------------
+            # READ COMPLETE NEW RECORDS
+            # -----------------------------
+            new_lines = []
+            offset = file.tell()
+            for raw_line in file:
+                if not raw_line.endswith(b"\n"):
+                    break           # incomplete record, still being appended
+                offset += len(raw_line)
+                line = _decode_line(raw_line, encoding).strip()
+                if line:            # remove empty lines
+                    new_lines.append(line)
+
+            checksums = _prefix_checksums(file, offset)
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return [], True, None
+
+    new_state = {
+        "offset": offset,
+        "identity": identity,
+        "checksums": checksums,
+        "encoding": encoding
+    }
+    return new_lines, full_reload, new_state
+
+
+def _clean_record(listRec):
+    # Clean and type one split line
+    # Returns: tuple (value, reason) - value is None when the row is rejected
+    if len(listRec) != len(TRANSACTION_FIELDS):
+        return None, REJECT_FIELD_COUNT
+
+    strTransactionID    = listRec[0]
+    strDate             = listRec[1]
+    strProductID        = listRec[2]
+    strProductName      = str(listRec[3]).replace(',', '')
+    try:
+        strQuantity     = int(listRec[4])
+    except ValueError:
+        return None, REJECT_BAD_QUANTITY
+    try:
+        strUnitPrice    = float(str(listRec[5]).replace(',', ''))
+    except ValueError:
+        return None, REJECT_BAD_UNIT_PRICE
+    strCustomerID       = listRec[6]
+    strRegion           = listRec[7]
+    value = [strTransactionID,strDate, strProductID,strProductName, strQuantity, strUnitPrice,strCustomerID,strRegion ]
+    if all(str(v).strip() != "" for v in value):
+        return value, None
+    return None, REJECT_EMPTY_FIELD
+
+
+def _validation_failure(value):
+    # Same rules, in the same order, as data_processor.filterValidTransactions
+    if value[4] <= 0:
+        return REJECT_QUANTITY_NOT_POSITIVE
+    if value[5] <= 0:
+        return REJECT_UNIT_PRICE_NOT_POSITIVE
+    if not value[0].startswith("T"):
+        return REJECT_TRANSACTION_ID_PREFIX
+    if not value[2].startswith("P"):
+        return REJECT_PRODUCT_ID_PREFIX
+    if not value[6].startswith("C"):
+        return REJECT_CUSTOMER_ID_PREFIX
+    return None
+
+
+def _parse_record(listRec):
+    # Clean and type one split line; returns None if the row is unusable
+    return _clean_record(listRec)[0]
+
+
+def parse_transactions(raw_lines, columnar=False, compact=False):
     """
     Task 1.2 Parse and Clean Data
     Parses raw lines into clean list of dictionaries
@@ -99,38 +515,275 @@ def parse_transactions(raw_lines):
     - Convert Quantity to int
     - Convert UnitPrice to float
     - Skip rows with incorrect number of fields
+      (rows whose Quantity/UnitPrice cannot be converted are skipped too)
+
+    With columnar=True a TransactionTable is returned instead of the list.
+    Iterating it yields the same dictionaries, one row at a time.
+    With compact=True the list holds Transaction records (__slots__ and
+    interned strings) instead of dictionaries; they are read the same way.
     """
 
+    if columnar:
+        table = TransactionTable()
+        for line in raw_lines:
+            value = _parse_record(line.split("|"))
+            if value is not None:
+                table.append(value)
+        return table
+
+    if compact:
+        transactions = []
+        for line in raw_lines:
+            value = _parse_record(line.split("|"))
+            if value is not None:
+                transactions.append(Transaction(*value))
+        return transactions
 
-    sales_dict = {}
     values= []
-    keys = ['TransactionID', 'Date', 'ProductID', 'ProductName', 'Quantity', 'UnitPrice', 'CustomerID', 'Region']
-    #print(keys)
+    keys = TRANSACTION_FIELDS
     # iterate thru the Lines
     for line in raw_lines:
-        #print (line)
-        listRec = line.split("|")
-        #items from 0 to 7
-        #print(listRec[7])
-        strTransactionID    = listRec[0] 
-        strDate             = listRec[1]         
-        strProductID        = listRec[2]   
-        strProductName      = str(listRec[3]).replace(',', '')
-        strQuantity         = int(listRec[4])
-        strUnitPrice        = float(str(listRec[5]).replace(',', ''))
-        strCustomerID       = listRec[6] 
-        strRegion           = listRec[7] 
-        value = [strTransactionID,strDate, strProductID,strProductName, strQuantity, strUnitPrice,strCustomerID,strRegion ]
-        if all(str(v).strip() != "" for v in value):
+        value = _parse_record(line.split("|"))
+        if value is not None:
             values.append(value)
-   
- 
+
+
     sales_dict = [dict(zip(keys, value)) for value in values]
     return sales_dict
-    #print (sales_dict)
 
 
 
+def iter_valid_transactions(raw_lines, quarantine=None, counters=None):
+    """
+    Fused single pass: parse, type-convert and validate each raw line
+
+    Yields: valid transaction dictionaries, the same ones as
+    filterValidTransactions(parse_transactions(raw_lines))
+
+    Rejected lines are written to the open text file `quarantine` (if given)
+    as 'REASON|raw line', and every outcome is counted in the `counters`
+    dictionary (if given) under its reason code or 'VALID'.
+    """
+    keys = TRANSACTION_FIELDS
+    for line in raw_lines:
+        value, reason = _clean_record(line.split("|"))
+        if reason is None:
+            reason = _validation_failure(value)
+
+        if counters is not None:
+            counters[reason or "VALID"] = counters.get(reason or "VALID", 0) + 1
+
+        if reason is None:
+            yield dict(zip(keys, value))
+        elif quarantine is not None:
+            quarantine.write(f"{reason}|{line}\n")
+
+
+def parse_and_validate(raw_lines, quarantine_file=QUARANTINE_FILE):
+    """
+    Parses and validates raw lines in one pass, quarantining bad rows
+
+    Returns: tuple (valid_transactions, rejection_summary)
+
+    Expected Output Format:
+    (
+        [list of valid transaction dictionaries],
+        {
+            'total_input': 80,
+            'valid': 70,
+            'rejected': 10,
+            'by_reason': {'QUANTITY_NOT_POSITIVE': 2, 'EMPTY_FIELD': 3, ...}
+        }
+    )
+
+    Unlike parse_transactions + filterValidTransactions, a malformed row
+    (wrong field count, non-numeric Quantity/UnitPrice) does not abort the
+    run: it is written with its reason code to quarantine_file
+    (pass None to skip writing) and counted.
+    """
+    counters = {}
+
+    if quarantine_file:
+        os.makedirs(os.path.dirname(quarantine_file) or ".", exist_ok=True)
+        with open(quarantine_file, "w", encoding="utf-8", buffering=WRITE_BUFFER) as quarantine:
+            valid_transactions = list(iter_valid_transactions(raw_lines, quarantine, counters))
+    else:
+        valid_transactions = list(iter_valid_transactions(raw_lines, None, counters))
+
+    valid_count = counters.pop("VALID", 0)
+    rejected = sum(counters.values())
+    rejection_summary = {
+        "total_input": valid_count + rejected,
+        "valid": valid_count,
+        "rejected": rejected,
+        "by_reason": dict(sorted(counters.items(), key=lambda item: item[1], reverse=True))
+    }
+
+    return valid_transactions, rejection_summary
+
+
+def _parse_record_bytes(fields, encoding):
+    # Byte-level twin of _parse_record: numeric fields are converted straight
+    # from bytes, only the text fields are decoded
+    if len(fields) != len(TRANSACTION_FIELDS):
+        return None
+    try:
+        strQuantity     = int(fields[4])
+        strUnitPrice    = float(fields[5].replace(b',', b''))
+    except ValueError:
+        return None
+    strTransactionID    = _decode_line(fields[0], encoding)
+    strDate             = _decode_line(fields[1], encoding)
+    strProductID        = _decode_line(fields[2], encoding)
+    strProductName      = _decode_line(fields[3].replace(b',', b''), encoding)
+    strCustomerID       = _decode_line(fields[6], encoding)
+    strRegion           = _decode_line(fields[7], encoding)
+    value = [strTransactionID,strDate, strProductID,strProductName, strQuantity, strUnitPrice,strCustomerID,strRegion ]
+    if all(str(v).strip() != "" for v in value):
+        return value
+    return None
+
+
+def _iter_mmap_records(data, start, end, encoding):
+    # Yield parsed rows for the records in data[start:end] (newline aligned)
+    pos = start
+    while pos < end:
+        newline = data.find(b"\n", pos, end)
+        if newline == -1:
+            newline = end
+        line = data[pos:newline].strip()
+        pos = newline + 1
+
+        if not line:    # remove empty lines
+            continue
+
+        value = _parse_record_bytes(line.split(b"|"), encoding)
+        if value is not None:
+            yield value
+
+
+def iter_transactions_mmap(filename, encoding=None):
+    """
+    Memory-mapped, byte-level ingest of a pipe-delimited sales file
+
+    Yields: parsed rows as lists in TRANSACTION_FIELDS order
+    ['T001', '2024-12-01', 'P101', 'Laptop', 2, 45000.0, 'C001', 'North']
+
+    Records and '|' fields are split on raw bytes of the mapped file; only
+    the text fields are decoded and Quantity/UnitPrice are converted from
+    bytes directly. The OS pages the file in and out, so files larger than
+    RAM can be processed. Cleaning rules are the same as
+    parse_transactions(read_sales_data(filename)).
+    """
+    try:
+        if encoding is None:
+            encoding = detect_encoding(filename)
+
+        with open(filename, mode="rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # skip header
+                header_end = data.find(b"\n")
+                start = size if header_end == -1 else header_end + 1
+                yield from _iter_mmap_records(data, start, size, encoding)
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return
+
+
+def parse_transactions_mmap(filename, columnar=False):
+    """
+    Reads and parses a sales file through the memory-mapped byte path
+
+    Returns: same result as parse_transactions(read_sales_data(filename)),
+    either a list of dictionaries or, with columnar=True, a TransactionTable
+    """
+    if columnar:
+        return TransactionTable.from_values(iter_transactions_mmap(filename))
+
+    keys = TRANSACTION_FIELDS
+    return [dict(zip(keys, value)) for value in iter_transactions_mmap(filename)]
+
+
+def _shard_ranges(data, size, shards):
+    # Split data into newline-aligned byte ranges; shard 0 starts after the header
+    header_end = data.find(b"\n")
+    first = size if header_end == -1 else header_end + 1
+
+    bounds = [first]
+    for i in range(1, shards):
+        target = max(first + (size - first) * i // shards, bounds[-1])
+        newline = data.find(b"\n", target)
+        bounds.append(size if newline == -1 else newline + 1)
+    bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _parse_shard(filename, start, end, encoding):
+    # Worker: parse and validate one byte range of the file
+    keys = TRANSACTION_FIELDS
+    with open(filename, mode="rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            transactions = [
+                dict(zip(keys, value))
+                for value in _iter_mmap_records(data, start, end, encoding)
+            ]
+    return utils.data_processor.filterValidTransactions(transactions)
+
+
+def parse_sales_file_parallel(filename, workers=None, min_shard_bytes=MIN_SHARD_BYTES):
+    """
+    Parses and validates one large sales file on several cores
+
+    Returns: list of valid transaction dictionaries, identical (same rows,
+    same order, same values) to
+    filterValidTransactions(parse_transactions(read_sales_data(filename)))
+
+    The file is split into byte ranges aligned to newline boundaries, each
+    range is parsed and validated in a process pool and the results are
+    concatenated back in file order. Small files are handled in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    try:
+        encoding = detect_encoding(filename)
+        with open(filename, mode="rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return []
+            shards = max(1, min(workers, size // min_shard_bytes))
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = _shard_ranges(data, size, shards)
+
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return []
+
+    if len(ranges) <= 1:
+        return [
+            txn
+            for start, end in ranges
+            for txn in _parse_shard(filename, start, end, encoding)
+        ]
+
+    valid_transactions = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [
+            pool.submit(_parse_shard, filename, start, end, encoding)
+            for start, end in ranges
+        ]
+        # merge in file order
+        for future in futures:
+            valid_transactions.extend(future.result())
+
+    return valid_transactions
+
+
 def validate_and_filter(transactions, region: Literal['East', 'North', 'South', 'West']=None, 
                         min_amount: Annotated[int, "gt=500", "le=900000"]=None, max_amount=None):
     """
@@ -141,7 +794,8 @@ def validate_and_filter(transactions, region: Literal['East', 'North', 'South',
     Validates transactions and applies optional filters
 
     Parameters:
-    - transactions: list of transaction dictionaries
+    - transactions: list of transaction dictionaries, or a FilterIndex
+      built over them (reused across calls)
     - region: filter by specific region (optional)
     - min_amount: minimum transaction amount (Quantity * UnitPrice) (optional)
     - max_amount: maximum transaction amount (optional)
@@ -175,105 +829,51 @@ def validate_and_filter(transactions, region: Literal['East', 'North', 'South',
     - Show count of records after each filter applied
     """
 
-    header_fields = {
-        "TransactionID", "Date", "ProductID", "ProductName", "Quantity", "UnitPrice", 
-        "CustomerID", "Region"
-    }
-
-    valid_transactions = []
-    invalid_count = 0
-
-    for txn in transactions:
-        try:
-            # Required fields check
-            if not header_fields.issubset(txn.keys()):
-                invalid_count += 1
-                continue
-
-            # Field-level validation
-            if (
-                not txn["TransactionID"].startswith("T")
-                or not txn["ProductID"].startswith("P")
-                or not txn["CustomerID"].startswith("C")
-                or txn["Quantity"] <= 0
-                or txn["UnitPrice"] <= 0
-            ):
-                invalid_count += 1
-                continue
+    # Validation and the region / amount indexes are built once; pass a
+    # FilterIndex instead of the list to reuse them across filter calls
+    if isinstance(transactions, FilterIndex):
+        index = transactions
+    else:
+        index = FilterIndex(transactions)
 
-            valid_transactions.append(txn)
-
-        except Exception:
-            invalid_count += 1
+    invalid_count = index.invalid_count
 
     # -----------------------------
     # DISPLAY AVAILABLE FILTER INFO
     # -----------------------------
-    available_regions = sorted(
-        {txn["Region"] for txn in valid_transactions}
-    )
+    available_regions = index.regions()
     #print("Available Regions:", available_regions)
     # available_regions = ['East', 'West', 'North', 'South']
-    amounts = [
-        txn["Quantity"] * txn["UnitPrice"]
-        for txn in valid_transactions
-    ]
 
-    #if amounts:
-        #print(f"Transaction Amount Range: "  f"{min(amounts)} to {max(amounts)}" )
+    #if len(index):
+        #print(f"Transaction Amount Range: "  f"{index.amount_range()[0]} to {index.amount_range()[1]}" )
 
     # -----------------------------
     # FILTERING PHASE
     # -----------------------------
     filter_summary = {
-        "total_input": len(transactions),
+        "total_input": index.total_input,
         "invalid": invalid_count,
         "filtered_by_region": 0,
         "filtered_by_amount": 0,
         "final_count": 0
     }
 
-    filtered_transactions = valid_transactions
+    remaining = len(index)
 
-    # Region filter
+    # Region filter (hash index lookup)
     if region:
-        before = len(filtered_transactions)
-        filtered_transactions = [
-            txn for txn in filtered_transactions
-            if txn["Region"] == region
-        ]
-        filter_summary["filtered_by_region"] = (
-            before - len(filtered_transactions)
-        )
-        # print(
-        #     f"Records after region filter ({region}): "
-        #     f"{len(filtered_transactions)}"
-        # )
+        region_count = len(index.region_rows(region))
+        filter_summary["filtered_by_region"] = remaining - region_count
+        remaining = region_count
 
-    # Amount filter
+    # Amount filter (binary search over the sorted amounts, intersected
+    # with the region rows)
+    filtered_transactions = index.select(region, min_amount, max_amount)
     if min_amount is not None or max_amount is not None:
-        before = len(filtered_transactions)
-
-        def amount_in_range(txn):
-            amount = txn["Quantity"] * txn["UnitPrice"]
-            if min_amount is not None and amount < min_amount:
-                return False
-            if max_amount is not None and amount > max_amount:
-                return False
-            return True
-
-        filtered_transactions = [
-            txn for txn in filtered_transactions
-            if amount_in_range(txn)
-        ]
-
         filter_summary["filtered_by_amount"] = (
-            before - len(filtered_transactions)
+            remaining - len(filtered_transactions)
         )
-        # print(
-        #     "Records after amount filter:",
-        #     len(filtered_transactions)
-        # )
 
     filter_summary["final_count"] = len(filtered_transactions)
 
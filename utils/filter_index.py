@@ -0,0 +1,136 @@
+"""
+    Reusable index for region / amount filtering of a loaded dataset
+
+    Built once over the valid transactions:
+    - a hash index Region -> row ids (ascending)
+    - the transaction amounts (Quantity * UnitPrice), computed once and kept
+      both per row and sorted, with the matching row ids
+
+    A region lookup is a dictionary hit and a min/max amount range is two
+    binary searches over the sorted amounts, so every filter combination is
+    answered without rescanning the transactions. Combined filters intersect
+    the two results, walking only the smaller one.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from utils.data_processor import _is_valid
+
+
+class FilterIndex:
+    """
+    Region hash index + sorted amount column over valid transactions
+
+    Expected Usage:
+        index = FilterIndex(transactions)     # invalid rows are counted, not indexed
+        index.regions()                        # ['East', 'North', ...]
+        index.amount_range()                   # (min amount, max amount)
+        index.select(region="North", min_amount=1000, max_amount=50000)
+    """
+
+    def __init__(self, transactions):
+        self.total_input = 0
+        self.invalid_count = 0
+        self.transactions = []
+        self.amounts = array('d')           # per row
+        self.by_region = {}                 # region -> array of row ids
+
+        for txn in transactions:
+            self.total_input += 1
+            try:
+                valid = _is_valid(txn)
+            except Exception:
+                valid = False
+            if not valid:
+                self.invalid_count += 1
+                continue
+
+            row = len(self.transactions)
+            self.transactions.append(txn)
+            self.amounts.append(txn["Quantity"] * txn["UnitPrice"])
+            rows = self.by_region.get(txn["Region"])
+            if rows is None:
+                rows = self.by_region[txn["Region"]] = array('q')
+            rows.append(row)
+
+        order = sorted(range(len(self.amounts)), key=self.amounts.__getitem__)
+        self.sorted_rows = array('q', order)
+        self.sorted_amounts = array('d', [self.amounts[row] for row in order])
+        self._region_of_row = None
+
+    def __len__(self):
+        return len(self.transactions)
+
+    # -----------------------------
+    # FILTER INFO
+    # -----------------------------
+    def regions(self):
+        return sorted(self.by_region)
+
+    def amount_range(self):
+        """
+        Returns: tuple (min amount, max amount)
+        """
+        if not self.sorted_amounts:
+            raise ValueError("No valid transactions to filter")
+        return self.sorted_amounts[0], self.sorted_amounts[-1]
+
+    # -----------------------------
+    # QUERIES
+    # -----------------------------
+    def amount_rows(self, min_amount=None, max_amount=None):
+        """
+        Row ids with min_amount <= amount <= max_amount, in amount order
+        """
+        lo = 0 if min_amount is None else bisect_left(self.sorted_amounts, min_amount)
+        hi = len(self.sorted_amounts) if max_amount is None else bisect_right(self.sorted_amounts, max_amount)
+        return self.sorted_rows[lo:hi] if lo < hi else array('q')
+
+    def region_rows(self, region):
+        return self.by_region.get(region, array('q'))
+
+    def rows(self, region=None, min_amount=None, max_amount=None):
+        """
+        Row ids matching every given filter, in original row order
+        """
+        by_amount = min_amount is not None or max_amount is not None
+        if not region:
+            if not by_amount:
+                return list(range(len(self.transactions)))
+            return sorted(self.amount_rows(min_amount, max_amount))
+
+        region_rows = self.region_rows(region)
+        if not by_amount:
+            return list(region_rows)
+
+        amount_rows = self.amount_rows(min_amount, max_amount)
+        if len(region_rows) <= len(amount_rows):
+            # walk the region rows, test their precomputed amounts
+            return [
+                row for row in region_rows
+                if (min_amount is None or self.amounts[row] >= min_amount)
+                and (max_amount is None or self.amounts[row] <= max_amount)
+            ]
+
+        # walk the amount slice, test the region
+        region_of_row = self._regions_by_row()
+        code = region_of_row[1][region]
+        return sorted(row for row in amount_rows if region_of_row[0][row] == code)
+
+    def _regions_by_row(self):
+        # Lazily built row -> region code column for amount-driven intersections
+        if self._region_of_row is None:
+            codes = {region: code for code, region in enumerate(self.by_region)}
+            column = array('I', bytes(4 * len(self.transactions)))
+            for region, rows in self.by_region.items():
+                for row in rows:
+                    column[row] = codes[region]
+            self._region_of_row = (column, codes)
+        return self._region_of_row
+
+    def select(self, region=None, min_amount=None, max_amount=None):
+        """
+        Returns: list of the matching transactions, in original order
+        """
+        return [self.transactions[row] for row in self.rows(region, min_amount, max_amount)]
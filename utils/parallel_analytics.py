@@ -0,0 +1,105 @@
+"""
+    Map-reduce execution of the data_processor analytics on a process pool
+
+    The AggregationEngine state (revenue totals, per-region / product /
+    customer / date sums and counts, distinct customer and product sets) is
+    built as mergeable partial states:
+
+        map:    each chunk of raw lines is parsed and aggregated into a
+                PartialAggregate in a worker process
+        reduce: partials are merged in source order and finalized into a
+                regular AggregationEngine
+
+    Chunks come from iter_sales_data / iter_sales_data_many, so big extracts
+    are streamed and every core is busy parsing and aggregating.
+
+    Exactness: AggregationEngine accumulates revenue exactly
+    (utils.summation.ExactSum), so merging partials never depends on how
+    rows were split and the finalized results equal the serial functions
+    bit for bit, fractional prices included.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import utils.file_handler
+from utils.data_processor import AggregationEngine, DISTINCT_EXACT, HLL_PRECISION
+
+MAP_CHUNK_LINES = 100000        # lines parsed + aggregated per task
+IN_FLIGHT_PER_WORKER = 2        # bounded queue of submitted chunks
+
+
+class PartialAggregate(AggregationEngine):
+    """
+    AggregationEngine state over one row partition, mergeable with others
+
+    Expected Usage:
+        left = PartialAggregate(rows[:n])
+        left.merge(PartialAggregate(rows[n:]))
+        engine = left.finalize()        # AggregationEngine, same views
+    """
+
+    def finalize(self):
+        """
+        Returns: AggregationEngine with the merged totals, usable with every
+        data_processor function (region_wise_sales(engine), ...)
+        """
+        engine = AggregationEngine(distinct=self.distinct, precision=self.precision)
+        engine.__dict__.update(self.__dict__)
+        return engine
+
+
+def _aggregate_chunk(raw_lines, distinct, precision):
+    # Worker: parse one chunk of raw lines and aggregate it
+    return PartialAggregate(
+        utils.file_handler.parse_transactions(raw_lines),
+        distinct,
+        precision
+    )
+
+
+def _line_chunks(source, chunk_size):
+    if isinstance(source, str) and utils.file_handler.expand_sales_sources(source) == [source]:
+        return utils.file_handler.iter_sales_data(source, chunk_size)
+    return utils.file_handler.iter_sales_data_many(source, chunk_size=chunk_size)
+
+
+def aggregate_parallel(source, workers=None, chunk_size=MAP_CHUNK_LINES,
+                       distinct=DISTINCT_EXACT, precision=HLL_PRECISION):
+    """
+    Aggregates a sales source on a process pool
+
+    Parameters:
+    - source: file, directory, glob pattern or list of files (anything
+      read_sales_data accepts, compressed extracts included)
+    - workers: number of worker processes (default: all cores)
+    - chunk_size: raw lines per map task
+    - distinct / precision: as for AggregationEngine
+
+    Returns: AggregationEngine equal to
+    AggregationEngine(parse_transactions(read_sales_data(source)))
+
+    Requirements:
+    - At most workers * IN_FLIGHT_PER_WORKER chunks are pending at a time,
+      so memory stays bounded for any source size
+    - Partials are merged in source order
+    """
+    workers = workers or os.cpu_count() or 1
+    total = PartialAggregate(distinct=distinct, precision=precision)
+
+    if workers == 1:
+        for chunk in _line_chunks(source, chunk_size):
+            total.merge(_aggregate_chunk(chunk, distinct, precision))
+        return total.finalize()
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _line_chunks(source, chunk_size):
+            pending.append(pool.submit(_aggregate_chunk, chunk, distinct, precision))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+
+    return total.finalize()
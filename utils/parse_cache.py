@@ -0,0 +1,108 @@
+"""
+    Binary cache of parsed sales files
+
+    load_transactions_cached() returns the parsed transactions of a sales file
+    as a TransactionTable. The first run parses the text file and stores the
+    table in a binary columnar file under output/cache/; later runs over the
+    unchanged file load that binary file instead of re-parsing.
+
+    Cache entries are keyed by the source path and validated against its
+    size, modification time and content hash. The total size of the cache
+    directory is bounded, least recently used entries are evicted first.
+"""
+
+import hashlib
+import os
+import time
+
+import utils.file_handler
+from utils.cache_index import evict, load_index, remove_entry, save_index
+from utils.transaction_table import TransactionTable
+
+CACHE_DIR = "output/cache"
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+HASH_BLOCK = 1024 * 1024
+
+
+def file_fingerprint(filename, with_hash=True):
+    """
+    Identifies the current contents of a source file
+
+    Returns: dictionary with path, size, mtime_ns and (optionally) digest
+    """
+    stat = os.stat(filename)
+    fingerprint = {
+        "path": os.path.abspath(filename),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+    if with_hash:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filename, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                digest.update(block)
+        fingerprint["digest"] = digest.hexdigest()
+
+    return fingerprint
+
+
+def load_transactions_cached(filename, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """
+    Returns the parsed transactions of filename as a TransactionTable
+
+    Uses the binary cache when its entry still matches the file's size,
+    mtime and content hash; otherwise parses the file through the mmap
+    ingest path and refreshes the cache entry.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    try:
+        quick = file_fingerprint(filename, with_hash=False)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return TransactionTable()
+
+    index = load_index(cache_dir)
+    key = quick["path"]
+    entry = index.get(key)
+
+    # -----------------------------
+    # CACHE HIT?
+    # -----------------------------
+    if entry and entry["size"] == quick["size"] and entry["mtime_ns"] == quick["mtime_ns"]:
+        fingerprint = file_fingerprint(filename)
+        if entry["digest"] == fingerprint["digest"]:
+            try:
+                table = TransactionTable.load(os.path.join(cache_dir, entry["file"]))
+                entry["last_used"] = time.time()
+                evict(cache_dir, index, max_bytes, keep=key)
+                save_index(cache_dir, index)
+                return table
+            except (FileNotFoundError, ValueError):
+                pass
+    else:
+        fingerprint = file_fingerprint(filename)
+
+    # -----------------------------
+    # MISS: PARSE AND STORE
+    # -----------------------------
+    remove_entry(cache_dir, index, key)
+
+    table = utils.file_handler.parse_transactions_mmap(filename, columnar=True)
+
+    cache_file = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest() + ".txntable"
+    table.save(os.path.join(cache_dir, cache_file))
+
+    index[key] = dict(
+        fingerprint,
+        file=cache_file,
+        bytes=os.path.getsize(os.path.join(cache_dir, cache_file)),
+        last_used=time.time()
+    )
+    evict(cache_dir, index, max_bytes, keep=key)
+    if index[key]["bytes"] > max_bytes:
+        remove_entry(cache_dir, index, key)
+    save_index(cache_dir, index)
+
+    return table
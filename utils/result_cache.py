@@ -0,0 +1,382 @@
+"""
+    Memoized analytics results
+
+    ResultCache stores the results of the data_processor functions keyed by
+    a fingerprint of the dataset plus the function name and call arguments,
+    so repeated calls over unchanged data (a dashboard refreshing every
+    minute) are answered without aggregating again.
+
+    Two tiers:
+    - memory: least recently used entries, bounded by entry count and bytes
+    - disk (optional): pickled results under output/cache/results/, bounded
+      by total bytes like the parse cache, so they survive restarts
+
+    Results are stored pickled, which gives every entry an exact size for
+    the eviction policy and hands each caller its own copy.
+
+    Expected Usage:
+        analytics = CachedAnalytics(transactions, source="data/sales_data.txt")
+        analytics.top_selling_products(n=5)
+        analytics.customer_analysis()
+        analytics.cache.stats()     # {'hits': ..., 'misses': ..., ...}
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter
+
+import utils.data_processor
+import utils.parse_cache
+from utils.cache_index import evict, load_index, remove_entry, save_index
+from utils.transaction_table import TRANSACTION_FIELDS, ENCODED_FIELDS, Transaction, TransactionTable
+
+RESULT_CACHE_DIR = "output/cache/results"
+MAX_MEMORY_ENTRIES = 256
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+MAX_DISK_BYTES = 256 * 1024 * 1024
+FINGERPRINT_BATCH = 8192       # rows rendered per hash update
+
+# data_processor functions whose results can be memoized
+CACHEABLE = (
+    "calculate_total_revenue", "region_wise_sales", "top_selling_products",
+    "customer_analysis", "daily_sales_trend", "unique_customers_rollup",
+    "sales_rollup", "find_peak_sales_day", "low_performing_products", "group_by"
+)
+
+# numeric row fields are hashed as packed doubles
+_NUMERIC_FIELDS = ["Quantity", "UnitPrice"]
+_TEXT_FIELDS = [field for field in TRANSACTION_FIELDS if field not in _NUMERIC_FIELDS]
+
+
+def _batch_bytes(rows):
+    # One batch of rows rendered as byte blocks. Uniform dict / Transaction
+    # rows take two C-level passes (text fields joined, numeric fields
+    # packed as doubles); anything else goes through txn.get()
+    row_type = type(rows[0])
+    if row_type is dict or row_type is Transaction:
+        getter = itemgetter if row_type is dict else attrgetter
+        try:
+            text = "\x1f".join(chain.from_iterable(map(getter(*_TEXT_FIELDS), rows)))
+            numbers = array("d", chain.from_iterable(map(getter(*_NUMERIC_FIELDS), rows)))
+            return [b"columns", text.encode("utf-8"), numbers]
+        except (KeyError, AttributeError, TypeError, OverflowError):
+            pass    # missing field, other value types or mixed rows
+    try:
+        return [b"rows"] + [
+            repr([txn.get(field) for field in TRANSACTION_FIELDS]).encode("utf-8")
+            for txn in rows
+        ]
+    except AttributeError:
+        raise TypeError("dataset_fingerprint needs transaction rows or a TransactionTable") from None
+
+
+def _update_rows(digest, rows):
+    # Hash the rows FINGERPRINT_BATCH at a time, so the rendered bytes never
+    # grow with the dataset
+    for start in range(0, len(rows), FINGERPRINT_BATCH):
+        for block in _batch_bytes(rows[start:start + FINGERPRINT_BATCH]):
+            digest.update(b"\x1e")
+            digest.update(block)
+
+
+@lru_cache(maxsize=None)
+def _signature(func):
+    return inspect.signature(func)
+
+
+def call_arguments(func, args=(), kwargs=None):
+    """
+    Arguments of func(transactions, *args, **kwargs) after the dataset, by
+    parameter name and with defaults applied, so positional, keyword and
+    defaulted spellings of a call compare equal
+
+    Returns: tuple of (name, value) pairs in signature order
+    Raises TypeError when the arguments do not fit the signature
+    """
+    bound = _signature(func).bind(None, *args, **(kwargs or {}))
+    bound.apply_defaults()
+    return tuple(bound.arguments.items())[1:]
+
+
+def dataset_fingerprint(transactions, source=None):
+    """
+    Content hash of a dataset (hex string)
+
+    Parameters:
+    - transactions: list of transactions or a TransactionTable
+    - source: file name (or list of file names) the transactions were parsed
+      from unchanged; the fingerprint is then taken from the files' content
+      hash (parse_cache.file_fingerprint) instead of the rows
+
+    Cheapest first: source files are hashed as raw bytes, a TransactionTable
+    from its column buffers, and a list of rows field-wise in C-level
+    passes (no per-row Python code for dict / Transaction rows), one
+    bounded batch of rows at a time.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    if source is not None:
+        digest.update(b"files")
+        for filename in ([source] if isinstance(source, str) else source):
+            digest.update(utils.parse_cache.file_fingerprint(filename)["digest"].encode("ascii"))
+        return digest.hexdigest()
+
+    if isinstance(transactions, TransactionTable):
+        digest.update(b"table")
+        ids = transactions.transaction_ids
+        for start in range(0, len(ids), FINGERPRINT_BATCH):
+            digest.update("\n".join(ids[start:start + FINGERPRINT_BATCH]).encode("utf-8"))
+            digest.update(b"\n")
+        # column buffers are hashed in place, without a bytes copy
+        digest.update(transactions.quantity)
+        digest.update(transactions.unit_price)
+        for field in ENCODED_FIELDS:
+            digest.update(repr(transactions.dictionaries[field].values).encode("utf-8"))
+            digest.update(transactions.codes(field))
+        return digest.hexdigest()
+
+    rows = transactions if isinstance(transactions, list) else list(transactions)
+    if rows and not isinstance(rows[0], Mapping):
+        raise TypeError("dataset_fingerprint needs transaction rows or a TransactionTable")
+
+    digest.update(f"rows {len(rows)}".encode("ascii"))
+    _update_rows(digest, rows)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + optional disk) cache of analytics results
+
+    Parameters:
+    - max_entries / max_bytes: memory tier bounds (pickled size)
+    - disk_dir: directory of the disk tier (e.g. RESULT_CACHE_DIR), None to
+      keep results in memory only
+    - max_disk_bytes: disk tier bound; least recently used files go first
+    """
+
+    def __init__(self, max_entries=MAX_MEMORY_ENTRIES, max_bytes=MAX_MEMORY_BYTES,
+                 disk_dir=None, max_disk_bytes=MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()        # key -> pickled result
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # -----------------------------
+    # KEYS
+    # -----------------------------
+    @staticmethod
+    def make_key(func, fingerprint, args=(), kwargs=None):
+        # top_selling_products(5), (n=5) and () share one key
+        name = func.__module__ + "." + func.__qualname__
+        text = repr((name, fingerprint, call_arguments(func, args, kwargs)))
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    # -----------------------------
+    # TIERS
+    # -----------------------------
+    def get(self, key):
+        """
+        Returns (found, result); counts a hit or a miss
+        """
+        payload = self._memory.get(key)
+        if payload is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return True, pickle.loads(payload)
+
+        payload = self._disk_get(key)
+        if payload is not None:
+            self.disk_hits += 1
+            self._memory_put(key, payload)
+            return True, pickle.loads(payload)
+
+        self.misses += 1
+        return False, None
+
+    def put(self, key, result):
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._memory_put(key, payload)
+        self._disk_put(key, payload)
+
+    def _memory_put(self, key, payload):
+        if len(payload) > self.max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = payload
+        self._memory_bytes += len(payload)
+
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_get(self, key):
+        if self.disk_dir is None:
+            return None
+        index = load_index(self.disk_dir)
+        entry = index.get(key)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.disk_dir, entry["file"]), "rb") as f:
+                payload = f.read()
+        except FileNotFoundError:
+            remove_entry(self.disk_dir, index, key)
+            save_index(self.disk_dir, index)
+            return None
+        entry["last_used"] = time.time()
+        save_index(self.disk_dir, index)
+        return payload
+
+    def _disk_put(self, key, payload):
+        if self.disk_dir is None or len(payload) > self.max_disk_bytes:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        index = load_index(self.disk_dir)
+
+        cache_file = key + ".pkl"
+        with open(os.path.join(self.disk_dir, cache_file + ".tmp"), "wb") as f:
+            f.write(payload)
+        os.replace(
+            os.path.join(self.disk_dir, cache_file + ".tmp"),
+            os.path.join(self.disk_dir, cache_file)
+        )
+
+        index[key] = {"file": cache_file, "bytes": len(payload), "last_used": time.time()}
+        before = len(index)
+        evict(self.disk_dir, index, self.max_disk_bytes, keep=key)
+        self.evictions += before - len(index)
+        save_index(self.disk_dir, index)
+
+    def clear(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.disk_dir is not None:
+            index = load_index(self.disk_dir)
+            for key in list(index):
+                remove_entry(self.disk_dir, index, key)
+            save_index(self.disk_dir, index)
+
+    # -----------------------------
+    # MEMOIZED CALLS
+    # -----------------------------
+    def call(self, func, transactions, *args, fingerprint=None, **kwargs):
+        """
+        Returns func(transactions, *args, **kwargs), from the cache when the
+        same call was made over the same dataset before
+        """
+        if fingerprint is None:
+            fingerprint = dataset_fingerprint(transactions)
+        key = self.make_key(func, fingerprint, args, kwargs)
+
+        found, result = self.get(key)
+        if found:
+            return result
+
+        result = func(transactions, *args, **kwargs)
+        self.put(key, result)
+        return result
+
+    def stats(self):
+        """
+        Returns: dictionary of hit / miss counters and tier sizes
+
+        Expected Output Format:
+        {'hits': 58, 'disk_hits': 1, 'misses': 6, 'hit_rate': 0.91,
+         'evictions': 0, 'memory_entries': 6, 'memory_bytes': 18432}
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes
+        }
+
+
+# process-wide cache used by CachedAnalytics unless another one is given
+default_cache = ResultCache()
+
+
+class CachedAnalytics:
+    """
+    The data_processor analytics functions, memoized for one dataset
+
+    The dataset is fingerprinted once when the wrapper is created. On a
+    miss, the functions run against one shared AggregationEngine (or
+    VectorizedEngine), so several misses still cost a single pass.
+
+    Parameters:
+    - transactions: list of transactions or a TransactionTable
+    - cache: ResultCache to use (default_cache if None)
+    - fingerprint: precomputed dataset fingerprint
+    - source: sales file(s) the transactions were parsed from; fingerprints
+      the file content instead of the rows (see dataset_fingerprint)
+    """
+
+    def __init__(self, transactions, cache=None, fingerprint=None, source=None):
+        self.transactions = transactions
+        self.cache = cache if cache is not None else default_cache
+        if fingerprint is None:
+            fingerprint = dataset_fingerprint(transactions, source)
+        self.fingerprint = fingerprint
+        self._engine = None
+
+    def _source(self, func, args, kwargs):
+        # group_by and the HyperLogLog modes need the rows, not the engine
+        arguments = dict(call_arguments(func, args, kwargs))
+        if func.__name__ == "group_by" or arguments.get("distinct") == utils.data_processor.DISTINCT_HLL:
+            return self.transactions
+        if self._engine is None:
+            self._engine = utils.data_processor._engine(self.transactions)
+        return self._engine
+
+    def _resolve(self, func, args, kwargs):
+        # distinct / precision left as None mean exact counting on a dataset;
+        # spell that out so it shares a key with distinct="exact"
+        parameters = _signature(func).parameters
+        bound = _signature(func).bind(None, *args, **kwargs)
+        for name, default in (("distinct", utils.data_processor.DISTINCT_EXACT),
+                              ("precision", utils.data_processor.HLL_PRECISION)):
+            if name in parameters and bound.arguments.get(name) is None:
+                bound.arguments[name] = default
+        return bound.args[1:], bound.kwargs
+
+    def __getattr__(self, name):
+        if name not in CACHEABLE:
+            raise AttributeError(name)
+        func = getattr(utils.data_processor, name)
+
+        def cached(*args, **kwargs):
+            args, kwargs = self._resolve(func, args, kwargs)
+            key = self.cache.make_key(func, self.fingerprint, args, kwargs)
+            found, result = self.cache.get(key)
+            if found:
+                return result
+            result = func(self._source(func, args, kwargs), *args, **kwargs)
+            self.cache.put(key, result)
+            return result
+
+        return cached
@@ -0,0 +1,221 @@
+"""
+    Bounded-memory summaries for streaming / incremental analytics
+
+    SpaceSaving - heavy hitters (top products / customers) with a fixed
+                  number of counters and explicit error bounds
+    HyperLogLog - approximate distinct counting (unique customers) in a
+                  few KB per counter, mergeable across shards and days
+"""
+
+import hashlib
+import heapq
+import math
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters sketch (Metwally et al.), weighted and mergeable
+
+    Keeps at most `capacity` counters. When a new item arrives and all
+    counters are taken, the item with the smallest count is replaced and the
+    newcomer inherits that count as its error.
+
+    Guarantees, with N the total weight added:
+    - every estimate overcounts by at most its error, and error <= N / capacity
+    - any item with true weight > N / capacity is in the sketch
+
+    Expected Usage:
+        sketch = SpaceSaving(capacity=1000)
+        for txn in transactions:
+            sketch.add(txn["CustomerID"], txn["Quantity"] * txn["UnitPrice"])
+        sketch.top(5)   # [(item, estimate, error), ...]
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.counts = {}        # item -> estimated weight
+        self.errors = {}        # item -> maximum overcount
+        self._heap = []         # (count, item) min-heap, may hold stale entries
+
+    def _smallest(self):
+        # Pop stale heap entries until the top matches a live counter
+        while True:
+            count, item = self._heap[0]
+            if self.counts.get(item) == count:
+                return count, item
+            heapq.heappop(self._heap)
+
+    def add(self, item, weight=1):
+        """
+        Adds weight (> 0) for item
+        """
+        self.total += weight
+        count = self.counts.get(item)
+
+        if count is None:
+            if len(self.counts) < self.capacity:
+                count, error = 0, 0
+            else:
+                count, evicted = self._smallest()
+                heapq.heappop(self._heap)
+                del self.counts[evicted]
+                del self.errors[evicted]
+                error = count
+            self.errors[item] = error
+
+        self.counts[item] = count + weight
+        heapq.heappush(self._heap, (count + weight, item))
+
+        # keep stale entries from piling up
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    @property
+    def error_bound(self):
+        """
+        Maximum overcount of any estimate (0 while the sketch is not full)
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        return self._smallest()[0]
+
+    def merge(self, other):
+        """
+        Returns a new sketch summarising both inputs (Agarwal et al. merge)
+
+        Items missing from a full sketch are charged that sketch's minimum
+        count, so the merged estimates and errors keep the same guarantees
+        for the combined stream.
+        """
+        merged = SpaceSaving(max(self.capacity, other.capacity))
+        floor_self = self.error_bound
+        floor_other = other.error_bound
+
+        combined = {}
+        for item in set(self.counts) | set(other.counts):
+            count = self.counts.get(item, floor_self) + other.counts.get(item, floor_other)
+            error = self.errors.get(item, floor_self) + other.errors.get(item, floor_other)
+            combined[item] = (count, error)
+
+        kept = heapq.nlargest(merged.capacity, combined.items(), key=lambda kv: kv[1][0])
+        for item, (count, error) in kept:
+            merged.counts[item] = count
+            merged.errors[item] = error
+        merged._heap = [(c, i) for i, c in merged.counts.items()]
+        heapq.heapify(merged._heap)
+        merged.total = self.total + other.total
+        return merged
+
+    def top(self, n=5):
+        """
+        Returns the n largest items as (item, estimate, error) tuples
+
+        An item is guaranteed to belong to the true top n when
+        estimate - error >= the (n+1)-th estimate (see is_guaranteed).
+        """
+        return [
+            (item, count, self.errors[item])
+            for item, count in heapq.nlargest(n, self.counts.items(), key=lambda kv: kv[1])
+        ]
+
+    def is_guaranteed(self, n=5):
+        """
+        True when the reported top n is provably the exact top n set
+        """
+        ranked = heapq.nlargest(n + 1, self.counts.items(), key=lambda kv: kv[1])
+        if len(ranked) <= n:
+            return len(self.counts) < self.capacity
+        threshold = ranked[n][1]
+        return all(count - self.errors[item] >= threshold for item, count in ranked[:n])
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter (Flajolet et al.)
+
+    Uses 2**precision one-byte registers; the relative standard error of
+    the estimate is about 1.04 / sqrt(2**precision):
+        precision 10 ->  1 KB, ~3.3%
+        precision 12 ->  4 KB, ~1.6%
+        precision 14 -> 16 KB, ~0.8%
+
+    Behaves like a set for counting purposes, so it can stand in for the
+    exact per-date customer sets:
+        customers = HyperLogLog(12)
+        customers.add("C001")
+        len(customers)          # estimated number of distinct values
+        customers.update(other) # union with another sketch (same precision)
+    """
+
+    __slots__ = ("precision", "registers")
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 16
+
+    def __init__(self, precision=12):
+        self.validate_precision(precision)
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @staticmethod
+    def validate_precision(precision):
+        """
+        Raises ValueError unless precision is an int in
+        [MIN_PRECISION, MAX_PRECISION]
+        """
+        if (not isinstance(precision, int) or isinstance(precision, bool)
+                or not HyperLogLog.MIN_PRECISION <= precision <= HyperLogLog.MAX_PRECISION):
+            raise ValueError(
+                f"precision must be an integer between {HyperLogLog.MIN_PRECISION} "
+                f"and {HyperLogLog.MAX_PRECISION}, got {precision!r}"
+            )
+
+    def add(self, value):
+        hashed = int.from_bytes(
+            hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(),
+            "big"
+        )
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, other):
+        """
+        In-place union with another sketch of the same precision
+        """
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def merge(self, other):
+        """
+        Returns the union of both sketches as a new sketch
+        """
+        merged = HyperLogLog(self.precision)
+        merged.registers = bytearray(self.registers)
+        merged.update(other)
+        return merged
+
+    def count(self):
+        """
+        Estimated number of distinct values added
+        """
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # small-range correction: linear counting
+            estimate = m * math.log(m / zeros)
+
+        return estimate
+
+    def __len__(self):
+        return int(round(self.count()))
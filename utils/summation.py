@@ -0,0 +1,72 @@
+"""
+    Exact, mergeable summation of revenue amounts
+
+    Every backend (AggregationEngine, SalesCube, the NumPy engine and the
+    map-reduce partials) sums revenue with ExactSum semantics: the result is
+    the correctly rounded value of the exact total (what math.fsum returns),
+    so it does not depend on row order or on how the rows were partitioned.
+    For whole-unit prices this is the same number a running float sum gives.
+"""
+
+import math
+
+
+class ExactSum:
+    """
+    Exact, mergeable sum of floats
+
+    Integer-valued amounts (Quantity * whole-unit prices) are added as a
+    Python int; any other value goes into Shewchuk's non-overlapping float
+    partials (the algorithm behind math.fsum). value() rounds once.
+    """
+
+    __slots__ = ("integer", "partials")
+
+    def __init__(self, values=()):
+        self.integer = 0
+        self.partials = []
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        if type(value) is int:
+            self.integer += value
+            return
+        if value.is_integer():
+            self.integer += int(value)
+            return
+
+        partials = self.partials
+        i = 0
+        for partial in partials:
+            if abs(value) < abs(partial):
+                value, partial = partial, value
+            high = value + partial
+            low = partial - (high - value)
+            if low:
+                partials[i] = low
+                i += 1
+            value = high
+        partials[i:] = [value]
+
+    def merge(self, other):
+        self.integer += other.integer
+        for partial in other.partials:
+            self.add(partial)
+        return self
+
+    def copy(self):
+        other = ExactSum()
+        other.integer = self.integer
+        other.partials = list(self.partials)
+        return other
+
+    def value(self):
+        if not self.partials:
+            return float(self.integer)
+        high = float(self.integer)
+        low = float(self.integer - int(high))
+        return math.fsum(self.partials + [high, low])
+
+    def __repr__(self):
+        return f"ExactSum({self.value()!r})"
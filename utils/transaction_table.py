@@ -0,0 +1,469 @@
+"""
+    Columnar (struct-of-arrays) store for parsed sales transactions
+
+    Instead of one dictionary per transaction, every field is kept in its own
+    column:
+    - Quantity and UnitPrice as typed arrays ('q' and 'd')
+    - Date, Region, ProductID, ProductName and CustomerID as integer codes
+      into a per-column dictionary of distinct values
+    - TransactionID as a plain list (it is unique per row)
+
+    Iterating a table yields the usual transaction dictionaries one at a time,
+    so existing functions expecting a list of dicts keep working.
+
+    Transaction is the lighter alternative: one compact __slots__ record per
+    row with interned categorical strings, usable wherever a transaction
+    dictionary is expected.
+
+    EnrichedTransaction is a read-only view joining a transaction with the
+    API columns of its product, used instead of copying every row.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+
+from utils.dates import date_ordinal
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional
+    np = None
+
+TRANSACTION_FIELDS = [
+    'TransactionID', 'Date', 'ProductID', 'ProductName',
+    'Quantity', 'UnitPrice', 'CustomerID', 'Region'
+]
+
+ENCODED_FIELDS = ['Date', 'ProductID', 'ProductName', 'CustomerID', 'Region']
+
+_FILE_MAGIC = b"TXNTABLE2\n"
+_BLOCK_ALIGN = 8
+
+# array typecode -> on-disk column format (little-endian, explicit item size)
+_COLUMN_FORMATS = {'q': '<i8', 'd': '<f8', 'I': '<u4'}
+_FORMAT_TYPECODES = {column_format: typecode for typecode, column_format in _COLUMN_FORMATS.items()}
+
+
+class Transaction(Mapping):
+    """
+    Compact, read-only transaction record
+
+    Fields are stored in __slots__ instead of a per-row dict, and the
+    repeated strings (Date, ProductID, ProductName, CustomerID, Region) are
+    interned so all rows share one copy of each distinct value.
+
+    Supports both access styles:
+        txn.Quantity            # attribute
+        txn["Quantity"]         # mapping, like the parse_transactions dicts
+        txn.keys(), txn.get(...), txn.copy()  # copy() returns a plain dict
+    """
+
+    __slots__ = tuple(TRANSACTION_FIELDS)
+
+    def __init__(self, TransactionID, Date, ProductID, ProductName,
+                 Quantity, UnitPrice, CustomerID, Region):
+        self.TransactionID = TransactionID
+        self.Date = sys.intern(Date)
+        self.ProductID = sys.intern(ProductID)
+        self.ProductName = sys.intern(ProductName)
+        self.Quantity = Quantity
+        self.UnitPrice = UnitPrice
+        self.CustomerID = sys.intern(CustomerID)
+        self.Region = sys.intern(Region)
+
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(TRANSACTION_FIELDS)
+
+    def __len__(self):
+        return len(TRANSACTION_FIELDS)
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Transaction({self.copy()!r})"
+
+
+_FIELD_SET = frozenset(TRANSACTION_FIELDS)
+
+ENRICHMENT_FIELDS = ('API_Category', 'API_Brand', 'API_Rating', 'API_Match')
+_ENRICHMENT_SLOT = {field: i for i, field in enumerate(ENRICHMENT_FIELDS)}
+
+
+class EnrichedTransaction(Mapping):
+    """
+    Read-only view: a transaction plus its product's API columns
+
+    The side row (API_Category, API_Brand, API_Rating, API_Match) is one
+    tuple shared by every transaction of the same product, so enriching a
+    row costs two references instead of a dictionary copy. Keys iterate in
+    the same order as tx.copy() followed by update() with the API fields.
+    """
+
+    __slots__ = ("base", "side")
+
+    def __init__(self, base, side):
+        self.base = base
+        self.side = side
+
+    def __getitem__(self, key):
+        slot = _ENRICHMENT_SLOT.get(key)
+        if slot is not None:
+            return self.side[slot]
+        return self.base[key]
+
+    def get(self, key, default=None):
+        slot = _ENRICHMENT_SLOT.get(key)
+        if slot is not None:
+            return self.side[slot]
+        return self.base.get(key, default)
+
+    def __iter__(self):
+        yield from self.base
+        for field in ENRICHMENT_FIELDS:
+            if field not in self.base:
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        # plain dict built from the row itself, not through the Mapping view
+        row = dict(self.base)
+        row.update(zip(ENRICHMENT_FIELDS, self.side))
+        return row
+
+    def __repr__(self):
+        return f"EnrichedTransaction({self.copy()!r})"
+
+
+class CategoryDictionary:
+    """
+    Maps the distinct values of one column to dense integer codes
+    """
+
+    __slots__ = ("values", "index")
+
+    def __init__(self, values=()):
+        self.values = []
+        self.index = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.index[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class TransactionTable:
+    """
+    Columnar container of transactions
+
+    Expected Usage:
+        table = TransactionTable.from_records(parse_transactions(lines))
+        len(table)                      # number of rows
+        table.quantity, table.unit_price  # typed numeric columns
+        table.codes('Region')           # array of region codes
+        table.dictionaries['Region'].values  # ['South', 'East', ...]
+        for txn in table: ...           # dict rows, like parse_transactions
+    """
+
+    def __init__(self):
+        self.transaction_ids = []
+        self.quantity = array('q')
+        self.unit_price = array('d')
+        self.dictionaries = {field: CategoryDictionary() for field in ENCODED_FIELDS}
+        self._codes = {field: array('I') for field in ENCODED_FIELDS}
+        self._date_ordinals = array('l')    # per Date dictionary entry
+        self._mapped = False                # columns are views of a loaded file
+
+    # -----------------------------
+    # BUILDING
+    # -----------------------------
+    def append(self, value):
+        """
+        Appends one parsed row given as a list in TRANSACTION_FIELDS order
+        """
+        if self._mapped:
+            self._copy_mapped_columns()
+        self.transaction_ids.append(value[0])
+        self.quantity.append(value[4])
+        self.unit_price.append(value[5])
+        self._codes['Date'].append(self.dictionaries['Date'].encode(value[1]))
+        self._codes['ProductID'].append(self.dictionaries['ProductID'].encode(value[2]))
+        self._codes['ProductName'].append(self.dictionaries['ProductName'].encode(value[3]))
+        self._codes['CustomerID'].append(self.dictionaries['CustomerID'].encode(value[6]))
+        self._codes['Region'].append(self.dictionaries['Region'].encode(value[7]))
+
+    def append_record(self, txn):
+        """
+        Appends one transaction dictionary
+        """
+        self.append([txn[field] for field in TRANSACTION_FIELDS])
+
+    @classmethod
+    def from_values(cls, values):
+        table = cls()
+        for value in values:
+            table.append(value)
+        return table
+
+    @classmethod
+    def from_records(cls, transactions):
+        table = cls()
+        for txn in transactions:
+            table.append_record(txn)
+        return table
+
+    # -----------------------------
+    # COLUMN ACCESS
+    # -----------------------------
+    def codes(self, field):
+        """
+        Returns the integer code column of a dictionary-encoded field
+        """
+        return self._codes[field]
+
+    def column(self, field):
+        """
+        Returns the decoded values of one column as a list
+        """
+        if field == 'TransactionID':
+            return list(self.transaction_ids)
+        if field == 'Quantity':
+            return self.quantity.tolist()
+        if field == 'UnitPrice':
+            return self.unit_price.tolist()
+        values = self.dictionaries[field].values
+        return [values[code] for code in self._codes[field]]
+
+    def date_ordinals(self, per_row=True):
+        """
+        Returns the Date column as integer day ordinals
+
+        Each distinct date is parsed once (the Date dictionary is parsed,
+        not the rows); per_row=False returns the ordinal of every dictionary
+        entry instead, indexed by date code.
+        """
+        values = self.dictionaries['Date'].values
+        for txn_date in values[len(self._date_ordinals):]:
+            self._date_ordinals.append(date_ordinal(txn_date))
+        if not per_row:
+            return self._date_ordinals
+        lookup = self._date_ordinals
+        return array('l', [lookup[code] for code in self._codes['Date']])
+
+    def to_numpy(self):
+        """
+        Returns the numeric and code columns as NumPy arrays
+
+        The arrays share memory with the table (no copy). Requires NumPy.
+        """
+        if np is None:
+            raise ImportError("NumPy is required for TransactionTable.to_numpy()")
+
+        columns = {
+            'Quantity': np.frombuffer(self.quantity, dtype=np.int64) if self.quantity else np.zeros(0, np.int64),
+            'UnitPrice': np.frombuffer(self.unit_price, dtype=np.float64) if self.unit_price else np.zeros(0, np.float64),
+        }
+        for field in ENCODED_FIELDS:
+            codes = self._codes[field]
+            columns[field] = np.frombuffer(codes, dtype=np.uint32) if codes else np.zeros(0, np.uint32)
+        return columns
+
+    # -----------------------------
+    # BINARY FILE FORMAT
+    # -----------------------------
+    def save(self, filename):
+        """
+        Writes the table to a compact binary columnar file
+
+        Layout: magic | header length | JSON header | column blocks.
+        The header holds the row count, the byte order, the category
+        dictionaries and the (format, offset, size) of every column block.
+        Numeric and code columns are stored as little-endian arrays with
+        explicit item sizes ('<i8', '<f8', '<u4'), each block 8-byte aligned
+        so load() can map it without copying; TransactionIDs are one
+        newline-joined UTF-8 block.
+
+        The file is written under a temporary name and renamed into place,
+        so tables still mapped from an older version stay valid.
+        """
+        blocks = [('TransactionID', 'utf-8', "\n".join(self.transaction_ids).encode("utf-8"))]
+        for name, column in [('Quantity', self.quantity), ('UnitPrice', self.unit_price),
+                             *((field, self._codes[field]) for field in ENCODED_FIELDS)]:
+            typecode = _typecode(column)
+            blocks.append((name, _COLUMN_FORMATS[typecode], _little_endian_bytes(column, typecode)))
+
+        sections = []
+        offset = 0
+        for name, column_format, payload in blocks:
+            offset += -offset % _BLOCK_ALIGN
+            sections.append([name, column_format, offset, len(payload)])
+            offset += len(payload)
+
+        header = json.dumps({
+            "rows": len(self),
+            "byte_order": "little",
+            "dictionaries": {field: self.dictionaries[field].values for field in ENCODED_FIELDS},
+            "sections": sections
+        }).encode("utf-8")
+        # pad the header with blanks so the first block starts aligned
+        header += b" " * (-(len(_FILE_MAGIC) + 8 + len(header)) % _BLOCK_ALIGN)
+
+        with open(filename + ".tmp", "wb") as f:
+            f.write(_FILE_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            written = 0
+            for (_, _, payload), (_, _, offset, _) in zip(blocks, sections):
+                f.write(b"\0" * (offset - written))
+                f.write(payload)
+                written = offset + len(payload)
+        os.replace(filename + ".tmp", filename)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Reads a table written by save()
+
+        The file is memory-mapped and the numeric and code columns are
+        memoryviews cast straight onto their blocks: nothing is copied or
+        parsed per row, pages are read in by the OS as columns are used.
+        Only the TransactionIDs and dictionaries become Python strings.
+        Columns of a loaded table are read-only until the first append(),
+        which copies them into arrays.
+
+        On a big-endian machine the columns are copied and byte-swapped.
+        """
+        with open(filename, "rb") as f:
+            try:
+                buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:      # empty file
+                raise ValueError(f"'{filename}' is not a transaction table file") from None
+
+        if bytes(buffer[:len(_FILE_MAGIC)]) != _FILE_MAGIC:
+            raise ValueError(f"'{filename}' is not a transaction table file")
+
+        pos = len(_FILE_MAGIC)
+        (header_len,) = struct.unpack_from("<Q", buffer, pos)
+        pos += 8
+        header = json.loads(bytes(buffer[pos:pos + header_len]))
+        base = pos + header_len
+        if header.get("byte_order") != "little":
+            raise ValueError(f"'{filename}': unsupported byte order {header.get('byte_order')!r}")
+
+        table = cls()
+        for field in ENCODED_FIELDS:
+            table.dictionaries[field] = CategoryDictionary(header["dictionaries"][field])
+
+        for name, column_format, offset, size in header["sections"]:
+            payload = buffer[base + offset:base + offset + size]
+            if name == 'TransactionID':
+                ids = str(payload, "utf-8")
+                table.transaction_ids = ids.split("\n") if header["rows"] else []
+                continue
+
+            column = _column_view(payload, column_format)
+            if name == 'Quantity':
+                table.quantity = column
+            elif name == 'UnitPrice':
+                table.unit_price = column
+            else:
+                table._codes[name] = column
+
+        table._mapped = True
+        return table
+
+    def _copy_mapped_columns(self):
+        # Loaded columns are read-only views of the file; appends need arrays
+        self.quantity = _to_array(self.quantity)
+        self.unit_price = _to_array(self.unit_price)
+        for field in ENCODED_FIELDS:
+            self._codes[field] = _to_array(self._codes[field])
+        self._mapped = False
+
+    # -----------------------------
+    # ROW VIEWS
+    # -----------------------------
+    def row(self, i):
+        """
+        Builds the transaction dictionary for row i
+        """
+        dicts = self.dictionaries
+        codes = self._codes
+        return {
+            'TransactionID': self.transaction_ids[i],
+            'Date': dicts['Date'].values[codes['Date'][i]],
+            'ProductID': dicts['ProductID'].values[codes['ProductID'][i]],
+            'ProductName': dicts['ProductName'].values[codes['ProductName'][i]],
+            'Quantity': self.quantity[i],
+            'UnitPrice': self.unit_price[i],
+            'CustomerID': dicts['CustomerID'].values[codes['CustomerID'][i]],
+            'Region': dicts['Region'].values[codes['Region'][i]]
+        }
+
+    def __len__(self):
+        return len(self.transaction_ids)
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+    def __iter__(self):
+        for i in range(len(self.transaction_ids)):
+            yield self.row(i)
+
+
+def _typecode(column):
+    # array typecode of an array or a loaded (memoryview) column
+    return column.typecode if isinstance(column, array) else column.format
+
+
+def _little_endian_bytes(column, typecode):
+    if sys.byteorder == "little":
+        return column.tobytes()
+    swapped = array(typecode, column)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _column_view(payload, column_format):
+    # Typed column over a block of the mapped file, without copying when the
+    # file layout matches the machine (little-endian, same item size)
+    typecode = _FORMAT_TYPECODES.get(column_format)
+    if typecode is None or array(typecode).itemsize != int(column_format[2:]):
+        raise ValueError(f"Unsupported column format: {column_format}")
+    if sys.byteorder == "little":
+        return payload.cast(typecode)
+    column = array(typecode)
+    column.frombytes(payload)
+    column.byteswap()
+    return column
+
+
+def _to_array(column):
+    if isinstance(column, array):
+        return column
+    copy = array(column.format)
+    copy.frombytes(column.cast('B'))
+    return copy
@@ -0,0 +1,267 @@
+"""
+    Optional NumPy backend for the data_processor analytics functions
+
+    Works on the dictionary-encoded columns of a TransactionTable: validation
+    becomes boolean masks and every per-group total is a grouped reduction
+    (np.bincount over the integer codes, np.unique for distinct pairs)
+    instead of a per-row Python loop.
+
+    VectorizedEngine exposes the same view methods as
+    data_processor.AggregationEngine and returns identical results. The
+    data_processor functions pick it automatically for TransactionTable input
+    when NumPy is installed.
+"""
+
+import heapq
+import itertools
+import math
+
+import utils.data_processor
+import utils.dates
+from utils.transaction_table import TransactionTable
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional
+    np = None
+
+DENSE_PAIR_LIMIT = 1 << 24   # largest key space handled with a bitmap
+EXACT_INTEGER_LIMIT = 2.0 ** 53     # float sums of whole numbers are exact below this
+
+
+def supports(transactions):
+    """
+    True when transactions can be aggregated by the vectorized backend
+    """
+    return np is not None and isinstance(transactions, TransactionTable)
+
+
+def _grouped_sum(codes, weights, size):
+    # Per-group correctly rounded sums, like the engines' ExactSum. bincount
+    # is exact for whole-number weights (the sales data format); otherwise
+    # each group is summed with math.fsum
+    sums = np.bincount(codes, weights=weights, minlength=size)
+    if not len(weights) or (
+        np.array_equal(weights, np.floor(weights))
+        and np.abs(weights).sum() < EXACT_INTEGER_LIMIT
+    ):
+        return sums
+
+    values = weights[np.argsort(codes, kind="stable")].tolist()
+    start = 0
+    for code, end in enumerate(np.cumsum(np.bincount(codes, minlength=size)).tolist()):
+        sums[code] = math.fsum(values[start:end])
+        start = end
+    return sums
+
+
+def _first_seen_order(codes, size):
+    # Group codes ordered by first occurrence (the Python dicts' insertion order)
+    first_index = np.full(size, len(codes), dtype=np.intp)
+    np.minimum.at(first_index, codes, np.arange(len(codes), dtype=np.intp))
+    present = np.flatnonzero(first_index < len(codes))
+    return present[np.argsort(first_index[present], kind="stable")]
+
+
+def _distinct_pairs(major, minor, minor_size, major_size):
+    # Sorted distinct keys major * minor_size + minor; a presence bitmap when
+    # the key space is small, a sort-based np.unique otherwise
+    keys = major * minor_size + minor
+    key_space = major_size * minor_size
+    if key_space <= max(DENSE_PAIR_LIMIT, 4 * len(keys)):
+        present = np.zeros(key_space, dtype=bool)
+        present[keys] = True
+        return np.flatnonzero(present)
+    return np.unique(keys)
+
+
+def _prefix_mask(dictionary, codes, prefix):
+    # Evaluate startswith once per distinct value, then gather per row
+    flags = np.fromiter(
+        (value.startswith(prefix) for value in dictionary.values),
+        dtype=bool,
+        count=len(dictionary)
+    )
+    return flags[codes]
+
+
+class VectorizedEngine:
+    """
+    NumPy counterpart of AggregationEngine for a TransactionTable
+    """
+
+    def __init__(self, table):
+        columns = table.to_numpy()
+        self.table = table
+
+        # -----------------------------
+        # VALIDATION MASK
+        # -----------------------------
+        transaction_ok = np.fromiter(
+            map(str.startswith, table.transaction_ids, itertools.repeat("T")),
+            dtype=bool,
+            count=len(table)
+        )
+        mask = (
+            (columns['Quantity'] > 0)
+            & (columns['UnitPrice'] > 0)
+            & transaction_ok
+            & _prefix_mask(table.dictionaries['ProductID'], columns['ProductID'], "P")
+            & _prefix_mask(table.dictionaries['CustomerID'], columns['CustomerID'], "C")
+        )
+
+        self.valid_count = int(mask.sum())
+        self.invalid_count = len(table) - self.valid_count
+
+        self.quantity = columns['Quantity'][mask]
+        self.revenue = self.quantity * columns['UnitPrice'][mask]
+        self.codes = {
+            field: columns[field][mask].astype(np.intp)
+            for field in ('Region', 'ProductName', 'CustomerID', 'Date')
+        }
+        self.total_revenue = float(
+            _grouped_sum(np.zeros(self.valid_count, np.intp), self.revenue, 1)[0]
+        )
+
+    def _values(self, field):
+        return self.table.dictionaries[field].values
+
+    def _product_totals(self):
+        codes = self.codes['ProductName']
+        size = len(self._values('ProductName'))
+        quantity = _grouped_sum(codes, self.quantity, size).astype(np.int64)
+        revenue = _grouped_sum(codes, self.revenue, size)
+        names = self._values('ProductName')
+        return [
+            (names[code], int(quantity[code]), float(revenue[code]))
+            for code in _first_seen_order(codes, size)
+        ]
+
+    # -----------------------------
+    # VIEWS (same shapes as AggregationEngine)
+    # -----------------------------
+    def region_wise_sales(self):
+        codes = self.codes['Region']
+        names = self._values('Region')
+        sales = _grouped_sum(codes, self.revenue, len(names))
+        counts = np.bincount(codes, minlength=len(names))
+        return utils.data_processor._region_summary(
+            ((names[code], sales[code], counts[code]) for code in _first_seen_order(codes, len(names))),
+            self.total_revenue
+        )
+
+    def top_selling_products(self, n=5):
+        products = heapq.nlargest(n, self._product_totals(), key=lambda item: item[1])
+        return [
+            (product, quantity, round(revenue, 2))
+            for product, quantity, revenue in products
+        ]
+
+    def customer_analysis(self):
+        customers = self.codes['CustomerID']
+        products = self.codes['ProductName']
+        customer_ids = self._values('CustomerID')
+        product_names = self._values('ProductName')
+        size = len(customer_ids)
+
+        spent = _grouped_sum(customers, self.revenue, size)
+        counts = np.bincount(customers, minlength=size)
+
+        # distinct (customer, product) pairs
+        pairs = _distinct_pairs(customers, products, len(product_names), size)
+        bought = {}
+        for customer, product in zip(pairs // len(product_names), pairs % len(product_names)):
+            bought.setdefault(int(customer), []).append(product_names[product])
+
+        customer_summary = {}
+        for code in _first_seen_order(customers, size):
+            total_spent = float(spent[code])
+            purchase_count = int(counts[code])
+            customer_summary[customer_ids[code]] = {
+                "total_spent": total_spent,
+                "purchase_count": purchase_count,
+                "products_bought": sorted(bought[int(code)]),
+                "avg_order_value": round(total_spent / purchase_count, 2)
+            }
+
+        return dict(
+            sorted(
+                customer_summary.items(),
+                key=lambda item: item[1]["total_spent"],
+                reverse=True
+            )
+        )
+
+    def _date_totals(self):
+        dates = self.codes['Date']
+        size = len(self._values('Date'))
+        revenue = _grouped_sum(dates, self.revenue, size)
+        counts = np.bincount(dates, minlength=size)
+        return dates, revenue, counts
+
+    def daily_sales_trend(self):
+        dates, revenue, counts = self._date_totals()
+        customers = self.codes['CustomerID']
+        pairs = _distinct_pairs(dates, customers, len(self._values('CustomerID')), len(revenue))
+        unique_customers = np.bincount(
+            pairs // len(self._values('CustomerID')),
+            minlength=len(revenue)
+        )
+
+        names = self._values('Date')
+        return {
+            names[code]: {
+                "revenue": float(revenue[code]),
+                "transaction_count": int(counts[code]),
+                "unique_customers": int(unique_customers[code])
+            }
+            for code in sorted(np.unique(dates), key=lambda code: names[code])
+        }
+
+    def unique_customers_rollup(self, period="week"):
+        # Distinct (date, customer) pairs are relabelled with their period's
+        # code and deduplicated again, so customers are counted once per period
+        dates = self.codes['Date']
+        names = self._values('Date')
+        customer_count = len(self._values('CustomerID'))
+
+        labels = {}         # period key -> code, in chronological order
+        period_codes = np.zeros(len(names), dtype=np.intp)
+        for code in sorted(np.unique(dates), key=lambda code: names[code]):
+            key = utils.data_processor._period_key(names[code], period)
+            period_codes[code] = labels.setdefault(key, len(labels))
+
+        pairs = _distinct_pairs(dates, self.codes['CustomerID'], customer_count, len(names))
+        period_pairs = _distinct_pairs(
+            period_codes[pairs // customer_count],
+            pairs % customer_count,
+            customer_count,
+            len(labels)
+        )
+        counts = np.bincount(period_pairs // customer_count, minlength=len(labels))
+        return {key: int(counts[code]) for key, code in labels.items()}
+
+    def sales_rollup(self, period="day"):
+        # Rows are grouped per date code with bincount; only the distinct
+        # dates are then bucketed into weeks / months
+        dates, revenue, counts = self._date_totals()
+        names = self._values('Date')
+        return utils.dates.rollup_daily(
+            ((names[code], float(revenue[code]), int(counts[code])) for code in np.unique(dates)),
+            period
+        )
+
+    def find_peak_sales_day(self):
+        dates, revenue, counts = self._date_totals()
+        order = _first_seen_order(dates, len(revenue))
+        peak = max(order, key=lambda code: revenue[code])
+        return (self._values('Date')[peak], round(float(revenue[peak]), 2), int(counts[peak]))
+
+    def low_performing_products(self, threshold=10):
+        low_products = [
+            (product, quantity, round(revenue, 2))
+            for product, quantity, revenue in self._product_totals()
+            if quantity < threshold
+        ]
+        low_products.sort(key=lambda item: item[1])
+        return low_products
@@ -0,0 +1,182 @@
+"""
+    Streaming, read-only reader for Excel sales workbooks (data/data.xlsx)
+
+    An .xlsx file is a zip archive of XML parts. The worksheet part is parsed
+    incrementally with iterparse and every finished row is discarded right
+    away, so the worksheet itself is never held in memory. Only the
+    workbook's shared-string table is kept (Excel stores each distinct text
+    value there once).
+
+    Rows are turned back into the pipe-delimited raw line format of
+    read_sales_data, so the exact same cleaning and typing rules
+    (parse_transactions / parse_and_validate) apply to workbooks and text
+    extracts alike.
+"""
+
+import posixpath
+import zipfile
+from datetime import date, timedelta
+from xml.etree.ElementTree import iterparse
+
+from utils.transaction_table import TRANSACTION_FIELDS
+
+CHUNK_LINES = 10000
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_EXCEL_EPOCH = date(1899, 12, 30)
+_EXCEL_EPOCH_1904 = date(1904, 1, 1)
+
+
+def _column_index(cell_ref):
+    # 'C12' -> 2
+    index = 0
+    for ch in cell_ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
+
+
+def _first_sheet_path(archive):
+    # Resolve the first worksheet through workbook.xml and its relationships
+    rel_id = None
+    date1904 = False
+    with archive.open("xl/workbook.xml") as part:
+        for _, elem in iterparse(part):
+            if elem.tag == _MAIN_NS + "workbookPr":
+                date1904 = elem.get("date1904") in ("1", "true")
+            elif elem.tag == _MAIN_NS + "sheet" and rel_id is None:
+                rel_id = elem.get(_REL_NS + "id")
+
+    with archive.open("xl/_rels/workbook.xml.rels") as part:
+        for _, elem in iterparse(part):
+            if elem.tag == _PKG_REL_NS + "Relationship" and elem.get("Id") == rel_id:
+                target = elem.get("Target")
+                if target.startswith("/"):
+                    return target.lstrip("/"), date1904
+                return posixpath.normpath(posixpath.join("xl", target)), date1904
+
+    return "xl/worksheets/sheet1.xml", date1904
+
+
+def _load_shared_strings(archive):
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as part:
+        for _, elem in iterparse(part):
+            if elem.tag == _MAIN_NS + "si":
+                # rich text is split in several <r><t> runs
+                strings.append("".join(t.text or "" for t in elem.iter(_MAIN_NS + "t")))
+                elem.clear()
+    return strings
+
+
+def _cell_text(cell, shared_strings):
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(_MAIN_NS + "t"))
+
+    value = cell.find(_MAIN_NS + "v")
+    if value is None or value.text is None:
+        return ""
+    if cell_type == "s":
+        return shared_strings[int(value.text)]
+    return value.text
+
+
+def _excel_date(text, date1904):
+    # Dates are stored as day serials; text dates are passed through as-is
+    try:
+        serial = float(text)
+    except ValueError:
+        return text
+    epoch = _EXCEL_EPOCH_1904 if date1904 else _EXCEL_EPOCH
+    return (epoch + timedelta(days=int(serial))).isoformat()
+
+
+def iter_xlsx_sales_data(filename, chunk_size=CHUNK_LINES):
+    """
+    Streams sales rows from the first worksheet of an .xlsx workbook
+
+    Yields: lists of at most chunk_size raw lines, in the same format as
+    iter_sales_data
+    ['T018|2024-12-29|P107|USB Cable|8|173|C009|South', ...]
+
+    Requirements:
+    - First row is the header; columns are matched by name, so extra
+      columns (e.g. a Revenue formula) and column order do not matter
+    - Excel date serials in the Date column become 'YYYY-MM-DD'
+    - Empty rows are skipped
+    - Handle FileNotFoundError with appropriate error message
+    """
+    try:
+        archive = zipfile.ZipFile(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return
+
+    with archive:
+        sheet_path, date1904 = _first_sheet_path(archive)
+        shared_strings = _load_shared_strings(archive)
+
+        positions = None        # worksheet column -> TRANSACTION_FIELDS slot
+        date_slot = TRANSACTION_FIELDS.index("Date")
+        chunk = []
+
+        with archive.open(sheet_path) as part:
+            sheet_data = None
+            for event, elem in iterparse(part, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == _MAIN_NS + "sheetData":
+                        sheet_data = elem
+                    continue
+                if elem.tag != _MAIN_NS + "row":
+                    continue
+
+                cells = {}
+                for cell in elem.iter(_MAIN_NS + "c"):
+                    cells[_column_index(cell.get("r", "A"))] = _cell_text(cell, shared_strings)
+                if sheet_data is not None:
+                    sheet_data.clear()  # drop finished rows
+
+                if positions is None:   # header row
+                    positions = {
+                        column: TRANSACTION_FIELDS.index(name.strip())
+                        for column, name in cells.items()
+                        if name.strip() in TRANSACTION_FIELDS
+                    }
+                    continue
+
+                fields = [""] * len(TRANSACTION_FIELDS)
+                for column, slot in positions.items():
+                    fields[slot] = cells.get(column, "").strip()
+                if not any(fields):     # remove empty rows
+                    continue
+                if fields[date_slot]:
+                    fields[date_slot] = _excel_date(fields[date_slot], date1904)
+
+                chunk.append("|".join(fields))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def read_xlsx_sales_data(filename):
+    """
+    Reads all sales rows of a workbook as raw lines (see iter_xlsx_sales_data)
+
+    Returns: list of raw lines (strings), ready for parse_transactions
+    """
+    return [
+        line
+        for chunk in iter_xlsx_sales_data(filename)
+        for line in chunk
+    ]